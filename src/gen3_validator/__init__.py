@@ -1,6 +1,12 @@
 import logging
 from .resolve_schema import *
+from .key_index import *
+from .bloom import BloomFilter, load_bloom_filters, build_bloom_filters
 from .linkage import *
 from .parsers import *
 from .logging_config import *
-from .validate import *
\ No newline at end of file
+from .validate import *
+from .prescreen import *
+from .unique_keys import *
+from .record_graph import *
+from .pipeline import *
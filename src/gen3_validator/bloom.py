@@ -0,0 +1,263 @@
+from typing import Any, Dict, Iterable, Iterator, List
+import argparse
+import hashlib
+import math
+import os
+import struct
+import logging
+from .parsers.json_stream import iter_json_records
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"G3BF"
+_HEADER = struct.Struct("<4sQQQQd")
+_BLOOM_EXT = ".bloom"
+_DATA_EXTS = (".ndjson", ".jsonl", ".json")
+
+
+class BloomFilter:
+    """
+    A Bloom filter of key values, used to cheaply check whether a foreign key may refer
+    to a record submitted in an earlier batch.
+
+    A Bloom filter has no false negatives: if a key is not in the filter it was never
+    added. A key that is in the filter was added with a probability of at least
+    1 - error_rate, as long as no more than `capacity` keys have been added.
+
+    Attributes:
+        capacity (int): The number of keys the filter is sized for.
+        error_rate (float): The target false positive rate at capacity. Defaults to 0.01.
+        n_bits (int): The number of bits in the filter.
+        n_hashes (int): The number of hash functions.
+        n_items (int): The estimated number of distinct keys added so far. Keys already
+            in the filter are not counted again.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0.")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.n_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self.n_items = 0
+        self.bits = bytearray(math.ceil(self.n_bits / 8))
+
+    def _positions(self, key: Any) -> Iterator[int]:
+        # Keys are typed, so 1 and '1' hash differently, matching set semantics; keys that
+        # compare equal in a set (True, 1 and 1.0) are normalized to hash the same
+        if isinstance(key, bool):
+            key = int(key)
+        elif isinstance(key, float) and key.is_integer():
+            key = int(key)
+        encoded = f"{type(key).__name__}:{key}".encode("utf-8")
+        digest = hashlib.blake2b(encoded, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.n_hashes):
+            yield (h1 + i * h2) % self.n_bits
+
+    def add(self, key: Any) -> None:
+        """
+        Adds a key to the filter. n_items is only incremented if the key sets at least
+        one new bit, so keys added again (e.g. on a refresh) are not counted twice.
+
+        Args:
+            key (Any): The key value, e.g. a submitter_id.
+        """
+        is_new = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                is_new = True
+        if is_new:
+            self.n_items += 1
+
+    def update(self, keys: Iterable[Any]) -> None:
+        """
+        Adds every key of an iterable to the filter.
+
+        Args:
+            keys (Iterable[Any]): The key values.
+        """
+        for key in keys:
+            self.add(key)
+        if self.n_items > self.capacity:
+            logger.warning(
+                f"Bloom filter holds {self.n_items} keys, above its capacity of {self.capacity}. "
+                f"The false positive rate is higher than {self.error_rate}."
+            )
+
+    def __contains__(self, key: Any) -> bool:
+        if isinstance(key, (list, dict)):
+            return False
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.n_items
+
+    def save(self, path: str) -> None:
+        """
+        Serializes the filter to a file.
+
+        Args:
+            path (str): The path of the file to write.
+        """
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(
+                _MAGIC, self.capacity, self.n_bits, self.n_hashes, self.n_items, self.error_rate
+            ))
+            f.write(self.bits)
+        logger.info(f"Saved bloom filter with {self.n_items} keys to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """
+        Loads a filter serialized with save.
+
+        Args:
+            path (str): The path of the file to read.
+
+        Returns:
+            BloomFilter: The loaded filter.
+
+        Raises:
+            ValueError: If the file is not a serialized bloom filter.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            bits = f.read()
+        if len(header) != _HEADER.size or header[:4] != _MAGIC:
+            raise ValueError(f"{path} is not a serialized bloom filter.")
+        _, capacity, n_bits, n_hashes, n_items, error_rate = _HEADER.unpack(header)
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.error_rate = error_rate
+        bloom.n_bits = n_bits
+        bloom.n_hashes = n_hashes
+        bloom.n_items = n_items
+        bloom.bits = bytearray(bits)
+        if len(bloom.bits) != math.ceil(n_bits / 8):
+            raise ValueError(f"{path} is truncated.")
+        logger.info(f"Loaded bloom filter with {n_items} keys from {path}")
+        return bloom
+
+
+def load_bloom_filters(directory: str) -> Dict[str, BloomFilter]:
+    """
+    Loads every '<node>.bloom' file in a directory.
+
+    Args:
+        directory (str): The directory containing the serialized filters.
+
+    Returns:
+        Dict[str, BloomFilter]: A dictionary mapping each node name to its filter.
+    """
+    filters = {}
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(_BLOOM_EXT):
+            node = file_name[:-len(_BLOOM_EXT)]
+            filters[node] = BloomFilter.load(os.path.join(directory, file_name))
+    return filters
+
+
+def _node_name(path: str) -> str:
+    file_name = os.path.basename(path)
+    for ext in _DATA_EXTS:
+        if file_name.endswith(ext):
+            return file_name[:-len(ext)]
+    return file_name
+
+
+def iter_export_keys(path: str, key_field: str = "submitter_id") -> Iterator[Any]:
+    """
+    Yields the key values of the records in a JSON (list of records) or NDJSON export.
+    The file is read one record at a time (see iter_json_records), so large exports are
+    never loaded whole.
+
+    Args:
+        path (str): The path to a '.json', '.jsonl' or '.ndjson' file.
+        key_field (str, optional): The record field to read. Defaults to 'submitter_id'.
+
+    Yields:
+        Any: The key value of each record that has the field.
+    """
+    for record in iter_json_records(path):
+        if record.get(key_field) is not None:
+            yield record[key_field]
+
+
+def build_bloom_filters(
+    paths: List[str], output_dir: str, error_rate: float = 0.01,
+    capacity: int = None, key_field: str = "submitter_id", refresh: bool = False
+) -> Dict[str, BloomFilter]:
+    """
+    Builds (or refreshes) one bloom filter per node from JSON/NDJSON exports, and writes
+    each filter to '<output_dir>/<node>.bloom'. The node name is taken from the file name,
+    and several files for the same node are merged into one filter.
+
+    Args:
+        paths (List[str]): The export files to read.
+        output_dir (str): The directory to write the filters to.
+        error_rate (float, optional): The target false positive rate. Defaults to 0.01.
+        capacity (int, optional): The number of keys each new filter is sized for. Defaults
+            to twice the number of keys read for the node, to leave room for refreshes.
+        key_field (str, optional): The record field holding the key. Defaults to 'submitter_id'.
+        refresh (bool, optional): If True, keys are added to the existing filter of a node
+            in output_dir, if there is one. Defaults to False.
+
+    Returns:
+        Dict[str, BloomFilter]: A dictionary mapping each node name to its filter.
+    """
+    node_paths = {}
+    for path in paths:
+        node_paths.setdefault(_node_name(path), []).append(path)
+
+    os.makedirs(output_dir, exist_ok=True)
+    filters = {}
+    for node, files in node_paths.items():
+        bloom_path = os.path.join(output_dir, f"{node}{_BLOOM_EXT}")
+        if refresh and os.path.exists(bloom_path):
+            bloom = BloomFilter.load(bloom_path)
+            for path in files:
+                bloom.update(iter_export_keys(path, key_field=key_field))
+        else:
+            keys = [key for path in files for key in iter_export_keys(path, key_field=key_field)]
+            bloom = BloomFilter(capacity or max(1, 2 * len(keys)), error_rate=error_rate)
+            bloom.update(keys)
+        bloom.save(bloom_path)
+        filters[node] = bloom
+    return filters
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Command line helper to build or refresh bloom filters of known keys.
+
+    Example:
+        python -m gen3_validator.bloom --output-dir filters/ exports/sample.json exports/subject.ndjson
+    """
+    parser = argparse.ArgumentParser(
+        description="Build or refresh per-node bloom filters of known keys from JSON/NDJSON exports."
+    )
+    parser.add_argument("paths", nargs="+", help="JSON or NDJSON export files, named '<node>.json'.")
+    parser.add_argument("--output-dir", required=True, help="Directory to write '<node>.bloom' files to.")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="Target false positive rate.")
+    parser.add_argument("--capacity", type=int, default=None, help="Number of keys each new filter is sized for.")
+    parser.add_argument("--key-field", default="submitter_id", help="Record field holding the key.")
+    parser.add_argument("--refresh", action="store_true", help="Add keys to existing filters.")
+    args = parser.parse_args(argv)
+
+    filters = build_bloom_filters(
+        args.paths, args.output_dir, error_rate=args.error_rate, capacity=args.capacity,
+        key_field=args.key_field, refresh=args.refresh
+    )
+    for node, bloom in filters.items():
+        print(f"{node}: {bloom.n_items} keys")
+
+
+if __name__ == "__main__":
+    main()
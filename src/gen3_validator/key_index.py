@@ -0,0 +1,381 @@
+from typing import Any, Iterable, Iterator, List, Set
+from itertools import islice
+import numbers
+import os
+import pickle
+import sqlite3
+import tempfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _batches(rows: Iterable, batch_size: int) -> Iterator[List]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _sql_key(key: Any) -> Any:
+    """
+    Normalizes a key to a value SQLite can bind, so that two keys match in the index
+    exactly when they are equal in a Python set, as in the in-memory link validation.
+
+    Strings, bytes, 64-bit integers and floats are stored as is; booleans, whole floats
+    and numpy numbers are converted to int or float first (True == 1 == 1.0). Any
+    other hashable key (tuples, datetimes, None, integers beyond 64 bits) is stored as a
+    tagged text of its type and repr. Unhashable keys (e.g. lists) return None, which
+    matches nothing.
+    """
+    if isinstance(key, (str, bytes)):
+        return key
+    if isinstance(key, numbers.Integral):
+        key = int(key)
+    elif isinstance(key, numbers.Real):
+        key = float(key)
+        if key.is_integer():
+            key = int(key)
+    if isinstance(key, int) and _INT64_MIN <= key <= _INT64_MAX or isinstance(key, float):
+        return key
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    if isinstance(key, tuple):
+        key = tuple(_sql_key(item) for item in key)
+    # The leading NUL keeps tagged keys from matching a plain string key
+    return f"\x00{type(key).__name__}:{key!r}"
+
+
+class KeyIndex:
+    """
+    An on-disk index of primary and foreign key values, backed by SQLite.
+
+    Keys are streamed into the index in batches, so memory use is bounded by the batch
+    size rather than by the number of keys. Foreign keys are anti-joined against the
+    primary keys inside SQLite, which lets link validation run over programs that are
+    too large to hold every key in Python lists.
+
+    Attributes:
+        db_path (str): The path to the SQLite database file. If no path is given, a
+            temporary file is created and removed when the index is closed. The index
+            tables of an existing file are cleared when the index is opened, so keys of
+            an earlier run never leak into the results.
+        batch_size (int): The number of keys inserted per batch. Defaults to 10000.
+    """
+
+    def __init__(self, db_path: str = None, batch_size: int = 10000):
+        self._temporary = db_path is None
+        if self._temporary:
+            fd, db_path = tempfile.mkstemp(prefix="gen3_key_index_", suffix=".sqlite")
+            os.close(fd)
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(self.db_path)
+        self._create_tables()
+        logger.info(f"Initialised key index at {self.db_path}")
+
+    def _create_tables(self) -> None:
+        # Columns are untyped so values keep their python type (e.g. 1 != '1'). A foreign
+        # key whose stored key differs from the original value keeps it pickled in `value`.
+        self.conn.executescript(
+            """
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            DROP TABLE IF EXISTS primary_keys;
+            DROP TABLE IF EXISTS foreign_keys;
+            CREATE TABLE primary_keys (
+                key NOT NULL, entity TEXT NOT NULL,
+                PRIMARY KEY (key, entity)
+            ) WITHOUT ROWID;
+            CREATE TABLE foreign_keys (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                entity TEXT NOT NULL,
+                key,
+                value BLOB
+            );
+            CREATE INDEX idx_foreign_keys_entity ON foreign_keys (entity, seq);
+            """
+        )
+
+    def add_primary_keys(self, entity: str, keys: Iterable[Any]) -> int:
+        """
+        Streams primary key values of an entity into the index.
+
+        Args:
+            entity (str): The name of the entity.
+            keys (Iterable[Any]): The primary key values. Unhashable values are ignored,
+                as they can never be matched by a foreign key.
+
+        Returns:
+            int: The number of key values read.
+        """
+        n_keys = 0
+        for batch in _batches(keys, self.batch_size):
+            n_keys += len(batch)
+            rows = [(key, entity) for key in map(_sql_key, batch) if key is not None]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO primary_keys (key, entity) VALUES (?, ?)", rows
+            )
+        self.conn.commit()
+        logger.info(f"Indexed {n_keys} primary keys for entity '{entity}'.")
+        return n_keys
+
+    def add_foreign_keys(self, entity: str, keys: Iterable[Any]) -> int:
+        """
+        Streams foreign key values of an entity into the index, keeping their order.
+
+        Args:
+            entity (str): The name of the entity.
+            keys (Iterable[Any]): The foreign key values. Unhashable values are always
+                reported as invalid.
+
+        Returns:
+            int: The number of key values read.
+        """
+        n_keys = 0
+        for batch in _batches(keys, self.batch_size):
+            n_keys += len(batch)
+            rows = []
+            for key in batch:
+                sql_key = _sql_key(key)
+                value = None if sql_key is key else pickle.dumps(key)
+                rows.append((entity, sql_key, value))
+            self.conn.executemany(
+                "INSERT INTO foreign_keys (entity, key, value) VALUES (?, ?, ?)", rows
+            )
+        self.conn.commit()
+        logger.info(f"Indexed {n_keys} foreign keys for entity '{entity}'.")
+        return n_keys
+
+    def contains(self, key: Any, entity: str = None) -> bool:
+        """
+        Checks if a key is a primary key in the index.
+
+        Args:
+            key (Any): The key value to look up.
+            entity (str, optional): Only look for the key among the primary keys of this
+                entity. Defaults to any entity.
+
+        Returns:
+            bool: True if the key is present.
+        """
+        key = _sql_key(key)
+        if key is None:
+            return False
+        if entity is None:
+            row = self.conn.execute(
+                "SELECT 1 FROM primary_keys WHERE key = ? LIMIT 1", (key,)
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT 1 FROM primary_keys WHERE key = ? AND entity = ? LIMIT 1", (key, entity)
+            ).fetchone()
+        return row is not None
+
+    def iter_invalid_foreign_keys(self, entity: str) -> Iterator[Any]:
+        """
+        Anti-joins the foreign keys of an entity against all primary keys in the index.
+
+        Args:
+            entity (str): The name of the entity.
+
+        Yields:
+            Any: Each foreign key value that matches no primary key, in insertion order
+            and including duplicates.
+        """
+        cursor = self.conn.execute(
+            """
+            SELECT f.key, f.value FROM foreign_keys AS f
+            WHERE f.entity = ?
+              AND (f.key IS NULL OR NOT EXISTS (
+                  SELECT 1 FROM primary_keys AS p WHERE p.key = f.key
+              ))
+            ORDER BY f.seq
+            """,
+            (entity,),
+        )
+        for key, value in cursor:
+            yield pickle.loads(value) if value is not None else key
+
+    def close(self) -> None:
+        """
+        Closes the database connection, and removes the database file if it is temporary.
+        """
+        self.conn.close()
+        if self._temporary and os.path.exists(self.db_path):
+            os.remove(self.db_path)
+        logger.debug(f"Closed key index at {self.db_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class KeyRegistry:
+    """
+    A persistent registry of the keys accepted in earlier submissions of a project,
+    backed by a SQLite file.
+
+    Submissions that arrive in stages (e.g. subjects first, then samples, then assays)
+    can be validated against every key accepted so far: Linkage reads from the registry
+    when a foreign key is not in the current data map, and appends the current primary
+    keys after a successful validation. Lookups use the registry's primary key index,
+    and batches of keys are resolved with a single query per batch.
+
+    Attributes:
+        db_path (str): The path to the SQLite registry file. Created if it does not exist.
+        project_id (str, optional): The project the registry belongs to. If given, it is
+            stored in a new registry and checked against an existing one.
+        batch_size (int): The number of keys per insert or lookup query. Defaults to 500.
+    """
+
+    def __init__(self, db_path: str, project_id: str = None, batch_size: int = 500):
+        self.db_path = db_path
+        self.project_id = project_id
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(self.db_path)
+        self._create_tables()
+        self._check_project_id()
+        logger.info(f"Opened key registry at {self.db_path}")
+
+    def _create_tables(self) -> None:
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS registry_meta (
+                name TEXT PRIMARY KEY, value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS registered_keys (
+                key, node TEXT NOT NULL,
+                PRIMARY KEY (key, node)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_registered_keys_node ON registered_keys (node);
+            """
+        )
+
+    def _check_project_id(self) -> None:
+        row = self.conn.execute(
+            "SELECT value FROM registry_meta WHERE name = 'project_id'"
+        ).fetchone()
+        if row is None:
+            if self.project_id is not None:
+                self.conn.execute(
+                    "INSERT INTO registry_meta (name, value) VALUES ('project_id', ?)",
+                    (self.project_id,),
+                )
+                self.conn.commit()
+        elif self.project_id is None:
+            self.project_id = row[0]
+        elif row[0] != self.project_id:
+            self.conn.close()
+            raise ValueError(
+                f"Registry {self.db_path} belongs to project '{row[0]}', not '{self.project_id}'."
+            )
+
+    def add_keys(self, node: str, keys: Iterable[Any]) -> int:
+        """
+        Appends keys of a node to the registry. Keys that are already registered are ignored.
+
+        Args:
+            node (str): The name of the node.
+            keys (Iterable[Any]): The key values, e.g. submitter_ids.
+
+        Returns:
+            int: The number of new keys registered.
+        """
+        n_before = self.conn.total_changes
+        for batch in _batches(keys, self.batch_size):
+            rows = [(key, node) for key in batch if not isinstance(key, (list, dict))]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO registered_keys (key, node) VALUES (?, ?)", rows
+            )
+        self.conn.commit()
+        n_added = self.conn.total_changes - n_before
+        logger.info(f"Registered {n_added} new keys for node '{node}'.")
+        return n_added
+
+    def contains(self, key: Any, node: str = None) -> bool:
+        """
+        Checks if a key is registered.
+
+        Args:
+            key (Any): The key value to look up.
+            node (str, optional): Only look for the key in this node. Defaults to any node.
+
+        Returns:
+            bool: True if the key is registered.
+        """
+        return bool(self.find_existing([key], node=node))
+
+    def find_existing(self, keys: Iterable[Any], node: str = None) -> Set[Any]:
+        """
+        Returns the subset of keys that are registered, with one query per batch of keys.
+
+        Args:
+            keys (Iterable[Any]): The key values to look up.
+            node (str, optional): Only look for the keys in this node. Defaults to any node.
+
+        Returns:
+            set: The registered keys.
+        """
+        found = set()
+        keys = (key for key in keys if not isinstance(key, (list, dict)))
+        for batch in _batches(keys, self.batch_size):
+            placeholders = ", ".join("?" * len(batch))
+            query = f"SELECT DISTINCT key FROM registered_keys WHERE key IN ({placeholders})"
+            params = list(batch)
+            if node is not None:
+                query += " AND node = ?"
+                params.append(node)
+            found.update(row[0] for row in self.conn.execute(query, params))
+        return found
+
+    def count(self, node: str = None) -> int:
+        """
+        Counts the registered keys.
+
+        Args:
+            node (str, optional): Only count the keys of this node. Defaults to all nodes.
+
+        Returns:
+            int: The number of registered keys.
+        """
+        if node is None:
+            return self.conn.execute("SELECT COUNT(*) FROM registered_keys").fetchone()[0]
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM registered_keys WHERE node = ?", (node,)
+        ).fetchone()[0]
+
+    def nodes(self) -> List[str]:
+        """
+        Lists the nodes with registered keys.
+
+        Returns:
+            list: The sorted node names.
+        """
+        return [
+            row[0] for row in self.conn.execute(
+                "SELECT DISTINCT node FROM registered_keys ORDER BY node"
+            )
+        ]
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self.conn.close()
+        logger.debug(f"Closed key registry at {self.db_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
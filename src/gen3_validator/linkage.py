@@ -1,14 +1,43 @@
 from typing import Dict, Any, List
-from pydantic import create_model
+from collections import Counter
+from itertools import islice
+from bisect import bisect_right
+import json
+from pydantic import BaseModel, create_model
 import logging
+from .key_index import KeyIndex, KeyRegistry
 
 # Set up module-level logger
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+# Marks a record without the key field, as distinct from a None value
+_MISSING = object()
+
+
+class ConfigValidationResult(BaseModel):
+    """
+    Structured result of validating a linkage config map.
+
+    Attributes:
+        valid (bool): True if no broken links were found.
+        root_node (List[str]): The root node names used for the validation.
+        broken_links (Dict[str, Any]): Entities whose foreign key matches no primary key,
+            mapped to that foreign key.
+        ignored_links (Dict[str, Any]): Root node entities whose unmatched foreign key
+            was ignored, mapped to that foreign key.
+        resolved_links (Dict[str, List[str]]): Entities mapped to the parent entities
+            whose primary key matches their foreign key.
+    """
+    valid: bool
+    root_node: List[str]
+    broken_links: Dict[str, Any] = {}
+    ignored_links: Dict[str, Any] = {}
+    resolved_links: Dict[str, List[str]] = {}
+
 
 class Linkage:
-    def __init__(self, root_node: List[str] = None):
+    def __init__(self, root_node: List[str] = None, link_suffix: str = 's'):
         """
         Initializes the Linkage class with injected dependencies.
 
@@ -16,12 +45,21 @@ class Linkage:
             root_node (list[str], optional): List of root node names. These are
                 entities that are allowed to have unmatched foreign keys.
                 Defaults to ['subject'].
+            link_suffix (str, optional): The default suffix of the '<entity><link_suffix>'
+                link alias that generate_config uses as primary key. Records without their
+                primary key field resolve it to their submitter_id, whatever the suffix, so
+                the alias does not need to be written into the records. Defaults to 's'.
         """
         if root_node is None:
             root_node = ['subject']
         self.root_node = root_node
+        self.link_suffix = link_suffix
         logger.debug(f"Initialized Linkage with root_node: {self.root_node}")
         self.link_validation_results = None
+        self.schema_link_validation_results = None
+        self.fk_coverage = None
+        self.link_cardinality_results = None
+        self.link_provenance_results = None
 
     def _find_fk(self, data: dict) -> str:
         """
@@ -44,7 +82,59 @@ class Linkage:
         logger.debug(f"No foreign key found in data: {data}")
         return None
 
-    def generate_config(self, data_map, link_suffix: str = 's') -> dict:
+    def _is_link_value(self, value: Any) -> bool:
+        """
+        Checks if a field value is a link, i.e. a dictionary containing a 'submitter_id'
+        key, or a non-empty list of such dictionaries.
+        """
+        if isinstance(value, dict):
+            return 'submitter_id' in value
+        if isinstance(value, list) and value:
+            return all(isinstance(v, dict) and 'submitter_id' in v for v in value)
+        return False
+
+    def discover_foreign_keys(
+        self, data_map: Dict[str, List[Dict[str, Any]]], sample_size: int = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Discovers every link field of each entity by scanning all records (or the first
+        `sample_size` records) in a single pass, and reports the coverage of each field.
+
+        Args:
+            data_map (dict): A dictionary where each key is an entity name and the value
+                is a list of data records for that entity.
+            sample_size (int, optional): The maximum number of records to scan per entity.
+                Defaults to None, which scans all records.
+
+        Returns:
+            dict: A dictionary mapping each entity name to a dictionary with the keys
+            'n_scanned' (number of records scanned) and 'foreign_keys', which maps each
+            link field to its 'count' (records where the field is a link) and 'coverage'
+            (count / n_scanned). Link fields are ordered by descending coverage.
+        """
+        discovered = {}
+        for node, data in data_map.items():
+            counts = Counter()
+            n_scanned = 0
+            for record in islice(data, sample_size):
+                n_scanned += 1
+                counts.update(
+                    key for key, value in record.items() if self._is_link_value(value)
+                )
+            discovered[node] = {
+                "n_scanned": n_scanned,
+                "foreign_keys": {
+                    key: {"count": count, "coverage": count / n_scanned}
+                    for key, count in counts.most_common()
+                },
+            }
+            logger.debug(f"Discovered link fields for node '{node}': {discovered[node]}")
+        return discovered
+
+    def generate_config(
+        self, data_map, link_suffix: str = None, multi_fk: bool = False,
+        sample_size: int = None, min_coverage: float = 0.0
+    ) -> dict:
         """
         Generates a configuration dictionary for entities based on the data map.
 
@@ -54,16 +144,46 @@ class Linkage:
         suffix. The foreign key is determined by searching for a key in the data that
         contains a 'submitter_id'.
 
+        By default only the first record of each entity is searched, and the first link
+        field found is used. With multi_fk=True, all records (or the first `sample_size`)
+        are scanned with discover_foreign_keys, and 'foreign_key' is the list of every link
+        field found, so that entities with multiple parents or a sparse first record get
+        a complete config. The field coverage is stored in self.fk_coverage.
+
         Args:
             data_map (dict): A dictionary where each key is an entity name and the value
                 is a list of data records for that entity.
-            link_suffix (str, optional): A suffix to append to the primary key. Defaults to 's'.
+            link_suffix (str, optional): A suffix to append to the primary key. Defaults to
+                self.link_suffix.
+            multi_fk (bool, optional): If True, discover all link fields of each entity.
+                Defaults to False.
+            sample_size (int, optional): The maximum number of records to scan per entity
+                when multi_fk is True. Defaults to None, which scans all records.
+            min_coverage (float, optional): The minimum coverage (0-1) for a discovered
+                link field to be included when multi_fk is True. Defaults to 0.0.
 
         Returns:
             dict: A configuration dictionary with primary and foreign keys for each entity.
         """
         config = {}
+        if link_suffix is None:
+            link_suffix = self.link_suffix
         logger.info("Generating config for data_map entities.")
+        if multi_fk:
+            self.fk_coverage = self.discover_foreign_keys(data_map, sample_size=sample_size)
+            for node, discovered in self.fk_coverage.items():
+                fks = [
+                    key for key, stats in discovered["foreign_keys"].items()
+                    if stats["coverage"] >= min_coverage
+                ]
+                config[node] = {
+                    "primary_key": f"{node}{link_suffix}",
+                    "foreign_key": fks if fks else None
+                }
+                logger.debug(f"Config for node '{node}': primary_key='{node}{link_suffix}', foreign_key={fks}")
+            logger.info(f"Generated config: {config}")
+            return config
+
         for node, data in data_map.items():
             fk = self._find_fk(data[0])
             if fk:
@@ -81,14 +201,58 @@ class Linkage:
         logger.info(f"Generated config: {config}")
         return config
 
-    def test_config_links(self, config_map: Dict[str, Any], root_node: List[str] = None) -> dict:
+    def _build_config_pk_index(self, config_map: Dict[str, Any]) -> Dict[Any, List[str]]:
         """
-        Validates the configuration map by checking the foreign key links between entities.
+        Checks the structure of the config map and builds an index from each primary
+        key to the entities that declare it.
 
-        This method checks if the foreign key of each entity in the config map matches
-        the primary key of any other entity. If a match is not found and the entity is
-        not a root node, it records the broken link. Root nodes are allowed to have
-        unmatched foreign keys.
+        Args:
+            config_map (Dict[str, Any]): A dictionary containing the configuration of entities.
+
+        Returns:
+            Dict[Any, List[str]]: A dictionary mapping each primary key to the list of
+            entity names that use it as their primary key.
+
+        Raises:
+            KeyError: If a required key ('primary_key' or 'foreign_key') is missing in the config for any entity.
+            TypeError: If config_map is not a dictionary or its values are not dictionaries.
+        """
+        if not isinstance(config_map, dict):
+            raise TypeError(
+                f"config_map must be a dictionary, got {type(config_map).__name__}."
+            )
+        pk_index = {}
+        for key, value in config_map.items():
+            if not isinstance(value, dict):
+                raise TypeError(
+                    f"Config for entity '{key}' must be a dictionary, got {type(value).__name__}."
+                )
+            if 'foreign_key' not in value:
+                raise KeyError(
+                    f"Missing 'foreign_key' in config for entity '{key}'. "
+                    f"Check your configuration dictionary."
+                )
+            if 'primary_key' not in value:
+                raise KeyError(
+                    f"Missing 'primary_key' in config for entity '{key}'. "
+                    f"Check your configuration dictionary."
+                )
+            # an unhashable primary key (e.g. a list) can never match a foreign key
+            if self._is_hashable(value['primary_key']):
+                pk_index.setdefault(value['primary_key'], []).append(key)
+        return pk_index
+
+    def check_config_links(
+        self, config_map: Dict[str, Any], root_node: List[str] = None, verbose: bool = False
+    ) -> ConfigValidationResult:
+        """
+        Validates the configuration map by checking the foreign key links between entities,
+        and returns a structured result.
+
+        A primary key -> entities index is built once, so each foreign key is resolved
+        with a single lookup. A foreign key matches if it is the primary key of any
+        entity other than the entity itself. Unmatched foreign keys of root nodes are
+        ignored.
 
         Args:
             config_map (Dict[str, Any]): A dictionary containing the configuration of entities,
@@ -96,10 +260,12 @@ class Linkage:
                 and 'foreign_key'.
             root_node (List[str], optional): A list of root node names that are allowed to have
                 unmatched foreign keys. Defaults to ['subject'].
+            verbose (bool, optional): If True, the validation progress and result are also
+                printed to stdout. Defaults to False.
 
         Returns:
-            dict: A dictionary of entities with broken links and their foreign keys if any are found.
-                  Returns "valid" if no broken links are detected.
+            ConfigValidationResult: The validation result, with the broken links, the ignored
+            root node links, and the parent entities each foreign key resolved to.
 
         Raises:
             KeyError: If a required key ('primary_key' or 'foreign_key') is missing in the config for any entity.
@@ -108,84 +274,229 @@ class Linkage:
         if root_node is None:
             root_node = ['subject']
         broken_links = {}
+        ignored_links = {}
+        resolved_links = {}
 
-        print("=== Validating Config Map ===")
-        print(f"Root Node = {root_node}")
+        if verbose:
+            print("=== Validating Config Map ===")
+            print(f"Root Node = {root_node}")
         logger.info("=== Validating Config Map ===")
         logger.info(f"Root Node = {root_node}")
 
         try:
-            if not isinstance(config_map, dict):
-                raise TypeError(
-                    f"config_map must be a dictionary, got {type(config_map).__name__}."
-                )
+            pk_index = self._build_config_pk_index(config_map)
             for key, value in config_map.items():
-                if not isinstance(value, dict):
-                    raise TypeError(
-                        f"Config for entity '{key}' must be a dictionary, got {type(value).__name__}."
-                    )
-                if 'foreign_key' not in value:
-                    raise KeyError(
-                        f"Missing 'foreign_key' in config for entity '{key}'. "
-                        f"Check your configuration dictionary."
-                    )
-                if 'primary_key' not in value:
-                    raise KeyError(
-                        f"Missing 'primary_key' in config for entity '{key}'. "
-                        f"Check your configuration dictionary."
-                    )
-
                 fk = value['foreign_key']
+                if fk is None:
+                    continue
 
-                # Check if fk of the current key matches with the primary key of any
-                # of the other entities
-                match_found = any(
-                    fk == v['primary_key']
-                    for k, v in config_map.items() if k != key
-                )
+                # Entities (other than the current one) whose primary key is the fk.
+                # An entity with several foreign keys must resolve every one of them.
+                fks = fk if isinstance(fk, list) else [fk]
+                parents = []
+                unmatched = []
+                for fk_item in fks:
+                    fk_parents = [
+                        entity for entity in pk_index.get(fk_item, []) if entity != key
+                    ] if self._is_hashable(fk_item) else []
+                    if fk_parents:
+                        parents.extend(fk_parents)
+                    else:
+                        unmatched.append(fk_item)
+                if unmatched and isinstance(fk, list):
+                    fk = unmatched
 
-                if not match_found and fk is not None:
+                if not unmatched:
+                    resolved_links[key] = parents
+                elif key not in root_node:
+                    broken_links[key] = fk
+                    logger.warning(
+                        f"Broken link found: entity '{key}' with foreign key '{fk}' does not match any primary key."
+                    )
+                else:
                     # If the key is a root node, ignore the broken link
-                    if key not in root_node:
-                        broken_links[key] = fk
-                        logger.warning(
-                            f"Broken link found: entity '{key}' with foreign key '{fk}' does not match any primary key."
-                        )
-                    else:
+                    ignored_links[key] = fk
+                    if verbose:
                         print(
                             f"WARNING: Ignoring broken link for root node '{key}' "
                             f"with foreign key '{fk}'"
                         )
-                        logger.info(
-                            f"Ignoring broken link for root node '{key}' with foreign key '{fk}'"
-                        )
+                    logger.info(
+                        f"Ignoring broken link for root node '{key}' with foreign key '{fk}'"
+                    )
 
         except KeyError as e:
             logger.error(f"Configuration error: {e}")
-            print(f"Configuration error: {e}")
+            if verbose:
+                print(f"Configuration error: {e}")
             raise
         except TypeError as e:
             logger.error(f"Type error in configuration: {e}")
-            print(f"Type error in configuration: {e}")
+            if verbose:
+                print(f"Type error in configuration: {e}")
             raise
         except Exception as e:
             logger.error(f"Unexpected error during config validation: {e}")
-            print(f"Unexpected error during config validation: {e}")
+            if verbose:
+                print(f"Unexpected error during config validation: {e}")
             raise
 
-        if len(broken_links) == 0:
-            print("Config Map Validated")
+        result = ConfigValidationResult(
+            valid=len(broken_links) == 0,
+            root_node=root_node,
+            broken_links=broken_links,
+            ignored_links=ignored_links,
+            resolved_links=resolved_links,
+        )
+        if result.valid:
+            if verbose:
+                print("Config Map Validated")
             logger.info("Config Map Validated")
-            return "valid"
         else:
-            print("Config Map Invalid ('entity': 'foreign_key')")
-            print("Broken links:", broken_links)
+            if verbose:
+                print("Config Map Invalid ('entity': 'foreign_key')")
+                print("Broken links:", broken_links)
             logger.error("Config Map Invalid ('entity': 'foreign_key')")
             logger.error(f"Broken links: {broken_links}")
-            return broken_links
+        return result
+
+    def test_config_links(
+        self, config_map: Dict[str, Any], root_node: List[str] = None, verbose: bool = True
+    ) -> dict:
+        """
+        Validates the configuration map by checking the foreign key links between entities.
+
+        This method checks if the foreign key of each entity in the config map matches
+        the primary key of any other entity. If a match is not found and the entity is
+        not a root node, it records the broken link. Root nodes are allowed to have
+        unmatched foreign keys. See check_config_links for the structured result.
+
+        Args:
+            config_map (Dict[str, Any]): A dictionary containing the configuration of entities,
+                where each key is an entity name and the value is a dictionary with 'primary_key'
+                and 'foreign_key'.
+            root_node (List[str], optional): A list of root node names that are allowed to have
+                unmatched foreign keys. Defaults to ['subject'].
+            verbose (bool, optional): If True, the validation progress and result are also
+                printed to stdout. Defaults to True.
+
+        Returns:
+            dict: A dictionary of entities with broken links and their foreign keys if any are found.
+                  Returns "valid" if no broken links are detected.
+
+        Raises:
+            KeyError: If a required key ('primary_key' or 'foreign_key') is missing in the config for any entity.
+            TypeError: If config_map is not a dictionary or its values are not dictionaries.
+        """
+        result = self.check_config_links(config_map, root_node=root_node, verbose=verbose)
+        if result.valid:
+            return "valid"
+        return result.broken_links
+
+    @staticmethod
+    def _pk_fallback(field: str) -> str:
+        # The '<entity><link_suffix>' alias is virtual, whichever suffix the config was
+        # generated with: a record without its primary key field resolves it to the submitter_id
+        return 'submitter_id' if field != 'submitter_id' else None
+
+    def _iter_key_values(
+        self, entity: str, records, field: str, key_type: str, fallback_field: str = None,
+        with_rows: bool = False
+    ):
+        """
+        Yields the key values of a field from each record of an entity.
+
+        Records missing the field are skipped and counted in a single warning, and empty
+        values are skipped. A {"submitter_id": ...} dictionary yields its submitter_id, a
+        list of such dictionaries yields each submitter_id, and any other value is yielded
+        as is. Record views with a `column_values` method (ParquetRecords) supply the
+        field as a column, without building the records.
+
+        Args:
+            entity (str): The name of the entity, used for logging.
+            records (Iterable[dict]): The records of the entity. May be a stream.
+            field (str): The name of the key field.
+            key_type (str): Either "primary" or "foreign", used for logging.
+            fallback_field (str, optional): A field read instead when a record does not
+                have `field`, e.g. 'submitter_id' for the link alias. Defaults to None.
+            with_rows (bool, optional): If True, yields (record index, key value) pairs.
+                Defaults to False.
+
+        Yields:
+            Any: The extracted key values, in record order.
+        """
+        column_values = getattr(records, 'column_values', None)
+        if column_values is not None:
+            # Columnar record views read the one field instead of building whole records
+            values = column_values(field, fallback_field=fallback_field, missing=_MISSING)
+            records = ({} if value is _MISSING else {field: value} for value in values)
+            fallback_field = None
+        n_missing = 0
+        for row, record in enumerate(records):
+            if field in record:
+                value = record[field]
+            elif fallback_field is not None and fallback_field in record:
+                value = record[fallback_field]
+            else:
+                n_missing += 1
+                continue
+            if not value:
+                continue
+            if isinstance(value, dict) and 'submitter_id' in value:
+                yield (row, value['submitter_id']) if with_rows else value['submitter_id']
+            elif self._is_link_value(value):
+                # to-many link: a list of {"submitter_id": ...} dicts
+                for item in value:
+                    yield (row, item['submitter_id']) if with_rows else item['submitter_id']
+            else:
+                yield (row, value) if with_rows else value
+        self._log_missing_keys(entity, field, key_type, n_missing)
+
+    @staticmethod
+    def _log_missing_keys(entity: str, field: str, key_type: str, n_missing: int) -> None:
+        if n_missing:
+            logger.warning(
+                f"{n_missing} records in entity '{entity}' are missing the {key_type} key field '{field}'."
+            )
+
+    def _extract_keys(
+        self, entity: str, records, field: str, key_type: str, with_rows: bool = False,
+        fallback_field: str = None
+    ) -> List[Any]:
+        """
+        Extracts the key values of a field from the records of an entity into a list,
+        with _iter_key_values.
+
+        Args:
+            entity (str): The name of the entity, used for logging.
+            records (Iterable[dict]): The records of the entity.
+            field (str): The name of the key field.
+            key_type (str): Either "primary" or "foreign", used for logging.
+            with_rows (bool, optional): If True, also returns the index of the record each
+                key was read from. Defaults to False.
+            fallback_field (str, optional): A field read instead when a record does not
+                have `field`, e.g. 'submitter_id' for the link alias. Defaults to None.
+
+        Returns:
+            List[Any]: The extracted key values, or a tuple of the key values and their
+            record indices if with_rows is True.
+        """
+        if not with_rows:
+            return list(self._iter_key_values(
+                entity, records, field, key_type, fallback_field=fallback_field
+            ))
+        keys = []
+        rows = []
+        for row, key in self._iter_key_values(
+            entity, records, field, key_type, fallback_field=fallback_field, with_rows=True
+        ):
+            rows.append(row)
+            keys.append(key)
+        return keys, rows
 
     def get_foreign_keys(
-        self, data_map: Dict[str, List[Dict[str, Any]]], config: Dict[str, Any]
+        self, data_map: Dict[str, List[Dict[str, Any]]], config: Dict[str, Any],
+        with_rows: bool = False
     ) -> dict:
         """
         Extracts all foreign key values for each entity from the provided data map,
@@ -199,12 +510,16 @@ class Linkage:
             config (Dict[str, Any]):
                 A dictionary where each key is an entity name, and each value is a dictionary
                 containing at least the key 'foreign_key', which specifies the field name
-                in the records to use as the foreign key.
+                (or list of field names) in the records to use as the foreign key.
+            with_rows (bool, optional): If True, also returns, for each entity, the index of
+                the record each foreign key value was read from. Defaults to False.
 
         Returns:
             Dict[str, List[Any]]:
                 A dictionary mapping each entity name to a list of extracted foreign key values.
                 If an entity has no foreign key specified in the config, its value will be an empty list.
+                If with_rows is True, a tuple of this dictionary and a dictionary mapping each
+                entity name to the record indices aligned with its foreign key values.
 
         Raises:
             KeyError:
@@ -213,10 +528,13 @@ class Linkage:
                 If an unexpected error occurs during extraction for any entity.
 
         Notes:
-            - If a record's foreign key field is missing, that record is skipped with a warning.
+            - Records missing the foreign key field are skipped and counted in one warning.
             - If the foreign key value is a dictionary containing a 'submitter_id', that value is used.
+            - If the foreign key value is a list of such dictionaries, each 'submitter_id' is used.
             - Otherwise, the value of the foreign key field is used directly.
             - If the foreign key field is None in the config, extraction is skipped for that entity.
+            - If the foreign key field is a list, the values of each field are concatenated
+              in field order.
 
         Example:
             data_map = {
@@ -233,29 +551,10 @@ class Linkage:
         logger.info("Extracting foreign keys from data_map using config.")
 
         def extract_fk_values(entity, records, fk_field):
-            fk_values = []
-            for idx, record in enumerate(records):
-                if fk_field not in record:
-                    logger.warning(
-                        f"Record {idx} in entity '{entity}' is missing the foreign key field '{fk_field}'."
-                    )
-                    continue
-                fk = record.get(fk_field)
-                if not fk:
-                    continue
-                if isinstance(fk, dict) and 'submitter_id' in fk:
-                    fk_values.append(fk['submitter_id'])
-                    logger.debug(
-                        f"Entity '{entity}': extracted foreign key '{fk['submitter_id']}' from dict."
-                    )
-                else:
-                    fk_values.append(fk)
-                    logger.debug(
-                        f"Entity '{entity}': extracted foreign key '{fk}'."
-                    )
-            return fk_values
+            return self._extract_keys(entity, records, fk_field, "foreign", with_rows=True)
 
         fk_entities = {}
+        fk_rows = {}
         for entity, keys in config.items():
             if entity not in data_map:
                 msg = (
@@ -269,19 +568,30 @@ class Linkage:
             if fk_field is None:
                 logger.info(f"No foreign key specified for entity '{entity}'. Skipping extraction.")
                 fk_entities[entity] = []
+                fk_rows[entity] = []
                 continue
 
             records = data_map[entity]
             try:
-                fk_values = extract_fk_values(entity, records, fk_field)
+                fk_values = []
+                rows = []
+                for field in (fk_field if isinstance(fk_field, list) else [fk_field]):
+                    field_values, field_rows = extract_fk_values(entity, records, field)
+                    fk_values.extend(field_values)
+                    rows.extend(field_rows)
                 fk_entities[entity] = fk_values
-                logger.info(f"Foreign keys for entity '{entity}': {fk_values}")
+                fk_rows[entity] = rows
+                logger.info(f"Extracted {len(fk_values)} foreign keys for entity '{entity}'.")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Foreign keys for entity '{entity}': {fk_values}")
             except Exception as e:
                 logger.error(f"Unexpected error while extracting foreign keys for entity '{entity}': {e}")
                 raise Exception(
                     f"An unexpected error occurred while extracting foreign keys for entity '{entity}': {e}"
                 ) from e
 
+        if with_rows:
+            return fk_entities, fk_rows
         return fk_entities
 
     def get_primary_keys(
@@ -313,7 +623,9 @@ class Linkage:
                 If an unexpected error occurs during extraction for any entity.
 
         Notes:
-            - If a record's primary key field is missing, that record is skipped with a warning.
+            - If a record does not have the primary key field (e.g. the
+              '<entity><link_suffix>' alias), the record's submitter_id is used.
+            - Records missing the primary key field are skipped and counted in one warning.
             - If the primary key value is a dictionary containing a 'submitter_id', that value is used.
             - Otherwise, the value of the primary key field is used directly.
             - If the primary key field is None in the config, extraction is skipped for that entity.
@@ -333,27 +645,10 @@ class Linkage:
         logger.info("Extracting primary keys from data_map using config.")
 
         def extract_pk_values(entity, records, pk_field):
-            pk_values = []
-            for idx, record in enumerate(records):
-                if pk_field not in record:
-                    logger.warning(
-                        f"Record {idx} in entity '{entity}' is missing the primary key field '{pk_field}'."
-                    )
-                    continue
-                pk = record.get(pk_field)
-                if not pk:
-                    continue
-                if isinstance(pk, dict) and 'submitter_id' in pk:
-                    pk_values.append(pk['submitter_id'])
-                    logger.debug(
-                        f"Entity '{entity}': extracted primary key '{pk['submitter_id']}' from dict."
-                    )
-                else:
-                    pk_values.append(pk)
-                    logger.debug(
-                        f"Entity '{entity}': extracted primary key '{pk}'."
-                    )
-            return pk_values
+            return self._extract_keys(
+                entity, records, pk_field, "primary",
+                fallback_field=self._pk_fallback(pk_field)
+            )
 
         pk_entities = {}
         for entity, keys in config.items():
@@ -375,7 +670,9 @@ class Linkage:
             try:
                 pk_values = extract_pk_values(entity, records, pk_field)
                 pk_entities[entity] = pk_values
-                logger.info(f"Primary keys for entity '{entity}': {pk_values}")
+                logger.info(f"Extracted {len(pk_values)} primary keys for entity '{entity}'.")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Primary keys for entity '{entity}': {pk_values}")
             except Exception as e:
                 logger.error(f"Unexpected error while extracting primary keys for entity '{entity}': {e}")
                 raise Exception(
@@ -384,9 +681,83 @@ class Linkage:
 
         return pk_entities
 
+    def _build_pk_index(self, pk_entities: Dict[str, List[Any]]) -> set:
+        """
+        Builds a hash set of the primary key values of every entity, so that foreign
+        keys can be resolved with constant time lookups.
+
+        Args:
+            pk_entities (Dict[str, List[Any]]): A dictionary mapping each entity
+                name to its list of primary key values, as returned by get_primary_keys.
+
+        Returns:
+            set: The set of all (hashable) primary key values.
+        """
+        all_pks = set()
+        for pk_values in pk_entities.values():
+            all_pks.update(pk for pk in pk_values if self._is_hashable(pk))
+        logger.info(
+            f"Built primary key index with {len(all_pks)} unique keys "
+            f"across {len(pk_entities)} entities."
+        )
+        return all_pks
+
+    @staticmethod
+    def _is_hashable(value: Any) -> bool:
+        try:
+            hash(value)
+        except TypeError:
+            return False
+        return True
+
+    def _key_in_index(self, key: Any, index: set) -> bool:
+        """
+        Checks if a key is in a primary key index. Unhashable keys (e.g. lists)
+        can never match a primary key and are reported as missing.
+        """
+        try:
+            return key in index
+        except TypeError:
+            return False
+
+    def _in_known_keys(self, key: Any, known_keys: Dict[str, Any], exact_index: Any = None,
+                       nodes: List[str] = None) -> bool:
+        """
+        Checks if a key was accepted in an earlier submission, using per-node bloom
+        filters of known keys.
+
+        A key missing from every filter is definitely unknown. A key found in a filter
+        may be a false positive, so if an exact index is given (any object with a
+        contains(key, node) method, e.g. a KeyIndex or KeyRegistry), the key is confirmed
+        against it for the nodes whose filter it was found in.
+
+        Args:
+            key (Any): The foreign key value.
+            known_keys (Dict[str, Any]): A dictionary mapping node names to bloom filters.
+            exact_index (Any, optional): An exact index used to confirm filter hits.
+            nodes (List[str], optional): The nodes whose filters are checked. Defaults to all.
+
+        Returns:
+            bool: True if the key is (probably, or with an exact index, certainly) a known
+            key of one of the nodes.
+        """
+        if not known_keys:
+            return False
+        if nodes is None:
+            nodes = list(known_keys)
+        hits = [node for node in nodes if node in known_keys and key in known_keys[node]]
+        if not hits:
+            return False
+        if exact_index is None:
+            return True
+        return any(exact_index.contains(key, node) for node in hits)
+
     def validate_links(
         self, data_map: Dict[str, List[Dict[str, Any]]], config: Dict[str, Any],
-        root_node: List[str] = None
+        root_node: List[str] = None, known_keys: Dict[str, Any] = None,
+        exact_index: Any = None, registry: KeyRegistry = None,
+        update_registry: bool = False, source_files: Dict[str, List[tuple]] = None,
+        return_provenance: bool = False
     ) -> Dict[str, List[str]]:
         """
         Verifies Config file, then extracts primary and foreign key values
@@ -404,10 +775,34 @@ class Linkage:
             config (Dict[str, Any]): The entity linkage configx
             root_node (List[str], optional): List of root node names that are allowed to have
                 unmatched foreign keys. Defaults to ['subject'].
+            known_keys (Dict[str, BloomFilter], optional): Bloom filters of keys accepted in
+                earlier submissions, keyed by node (see load_bloom_filters). Foreign keys not
+                found in the data map are checked against these filters. Defaults to None.
+            exact_index (optional): An exact index with a contains(key, node) method (e.g.
+                a KeyIndex) used to confirm bloom filter hits for the node they were found in. Defaults to None, which accepts
+                filter hits at the filter's false positive rate.
+            registry (KeyRegistry, optional): A persistent registry of keys accepted in
+                earlier batches of the project. Foreign keys not found in the data map are
+                looked up in the registry. Defaults to None.
+            update_registry (bool, optional): If True and no invalid foreign keys are found,
+                the primary keys of this data map are appended to the registry, so later
+                batches can link to them. Defaults to False.
+            source_files (Dict[str, List[tuple]], optional): The (first row, file path)
+                spans of the files each entity was read from (e.g. ParseData.source_files),
+                used to report the file of each broken link's rows. Defaults to None.
+            return_provenance (bool, optional): If True, returns the rows of each broken
+                foreign key (see link_provenance_results) instead of the invalid key lists.
+                Defaults to False.
 
         Returns:
             Dict[str, List[str]]: Dictionary of entities and their validation
                 results. If the config is invalid, returns the config validation result.
+
+        Notes:
+            The record indices of every broken foreign key are collected from the
+            extracted key columns in the same pass, and stored in link_provenance_results
+            as {entity: [{"key": ..., "rows": [...], "source_file": ...}]}, in order of
+            first appearance.
         """
         if root_node is None:
             root_node = ['subject']
@@ -422,31 +817,489 @@ class Linkage:
             logger.error(f"Config: {config}")
             return valid_config
 
-        fk_entities = self.get_foreign_keys(data_map, config)
+        fk_entities, fk_rows = self.get_foreign_keys(data_map, config, with_rows=True)
         pk_entities = self.get_primary_keys(data_map, config)
 
         print("=== Validating Links ===")
         logger.info("=== Validating Links ===")
 
+        all_pks = self._build_pk_index(pk_entities)
+
         validation_results = {}
+        provenance_results = {}
         for entity, fk_values in fk_entities.items():
-            invalid_keys = [
-                fk for fk in fk_values if all(
-                    fk not in pk_values for pk_values in pk_entities.values()
-                )
+            broken = [
+                (fk, row) for fk, row in zip(fk_values, fk_rows[entity])
+                if not self._key_in_index(fk, all_pks)
+                and not self._in_known_keys(fk, known_keys, exact_index)
             ]
+            if registry is not None and broken:
+                registered = registry.find_existing(fk for fk, _ in broken)
+                broken = [
+                    (fk, row) for fk, row in broken if not self._key_in_index(fk, registered)
+                ]
+            invalid_keys = [fk for fk, _ in broken]
             validation_results[entity] = invalid_keys
+            provenance_results[entity] = self._group_rows(
+                broken, (source_files or {}).get(entity)
+            )
             print(
                 f"Entity '{entity}' has {len(invalid_keys)} invalid foreign keys: "
                 f"{invalid_keys}"
             )
             if invalid_keys:
-                logger.warning(
-                    f"Entity '{entity}' has {len(invalid_keys)} invalid foreign keys: {invalid_keys}"
-                )
+                logger.warning(f"Entity '{entity}' has {len(invalid_keys)} invalid foreign keys.")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Invalid foreign keys for entity '{entity}': {invalid_keys}")
             else:
                 logger.info(
                     f"Entity '{entity}' has no invalid foreign keys."
                 )
+        if registry is not None and update_registry:
+            self.register_keys(registry, pk_entities, validation_results)
         self.link_validation_results = validation_results
+        self.link_provenance_results = provenance_results
+        if return_provenance:
+            return provenance_results
         return validation_results
+
+    @staticmethod
+    def _group_rows(broken: List[tuple], spans: List[tuple] = None) -> List[Dict[str, Any]]:
+        """
+        Groups (key, row) pairs of broken foreign keys into one entry per distinct key
+        and source file.
+
+        Args:
+            broken (List[tuple]): The (foreign key, record index) pairs, in record order.
+            spans (List[tuple], optional): The (first row, file path) spans of the files
+                the entity was read from (see ParseData.source_files). Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per distinct key (and file) with 'key',
+            'rows' and 'source_file', in order of first appearance.
+        """
+        if spans:
+            first_rows = [first_row for first_row, _ in spans]
+        groups = {}
+        for fk, row in broken:
+            file = spans[bisect_right(first_rows, row) - 1][1] if spans else None
+            # unhashable keys (e.g. unwrapped lists) are grouped by their JSON form
+            group_key = (
+                fk if Linkage._is_hashable(fk) else json.dumps(fk, sort_keys=True, default=str),
+                file,
+            )
+            if group_key not in groups:
+                groups[group_key] = {"key": fk, "rows": [], "source_file": file}
+            groups[group_key]["rows"].append(row)
+        return list(groups.values())
+
+    def register_keys(
+        self, registry: KeyRegistry, pk_entities: Dict[str, List[Any]],
+        validation_results: Dict[str, List[Any]] = None
+    ) -> int:
+        """
+        Appends primary keys to a persistent key registry. If validation results are
+        given, nothing is registered unless every entity passed link validation.
+
+        Args:
+            registry (KeyRegistry): The registry to append to.
+            pk_entities (Dict[str, List[Any]]): A dictionary mapping each entity name to its
+                primary key values, as returned by get_primary_keys.
+            validation_results (Dict[str, List[Any]], optional): The link validation results
+                of the batch. Defaults to None.
+
+        Returns:
+            int: The number of new keys registered.
+        """
+        if validation_results is not None and any(validation_results.values()):
+            logger.warning("Link validation failed, keys were not added to the registry.")
+            return 0
+        n_added = 0
+        for entity, pk_values in pk_entities.items():
+            n_added += registry.add_keys(entity, pk_values)
+        logger.info(f"Registered {n_added} new keys in {registry.db_path}")
+        return n_added
+
+    def validate_links_out_of_core(
+        self, data_map: Dict[str, List[Dict[str, Any]]], config: Dict[str, Any],
+        root_node: List[str] = None, db_path: str = None, batch_size: int = 10000,
+        known_keys: Dict[str, Any] = None, exact_index: Any = None
+    ) -> Dict[str, List[str]]:
+        """
+        Validates links like validate_links, but streams the primary and foreign keys
+        into an on-disk KeyIndex (SQLite) and anti-joins them there, so memory use is
+        bounded by the batch size rather than by the number of keys.
+
+        The records of each entity are read once per key field and may be a stream
+        (e.g. a generator or lazily loaded node), as long as it can be iterated again
+        for each field.
+
+        Args:
+            data_map (Dict[str, List[Dict[str, Any]]]): Contains the data for
+                each entity
+            config (Dict[str, Any]): The entity linkage config
+            root_node (List[str], optional): List of root node names that are allowed to have
+                unmatched foreign keys. Defaults to ['subject'].
+            db_path (str, optional): Path of the SQLite file to use for the index. Defaults
+                to a temporary file which is removed afterwards.
+            batch_size (int, optional): The number of keys inserted per batch. Defaults to 10000.
+            known_keys (Dict[str, BloomFilter], optional): Bloom filters of keys accepted in
+                earlier submissions, as in validate_links. Defaults to None.
+            exact_index (optional): An exact index used to confirm bloom filter hits, as in
+                validate_links. Defaults to None.
+
+        Returns:
+            Dict[str, List[str]]: The same result as validate_links, a dictionary of entities
+                and their invalid foreign keys. If the config is invalid, returns the config
+                validation result.
+
+        Raises:
+            KeyError: If an entity specified in the config is missing from the data_map.
+        """
+        if root_node is None:
+            root_node = ['subject']
+
+        logger.info("Validating config map before link validation.")
+        valid_config = self.test_config_links(config, root_node=root_node, verbose=False)
+        if valid_config != "valid":
+            logger.error("Invalid Config Map")
+            logger.error(f"Config: {config}")
+            return valid_config
+
+        for entity in config.keys():
+            if entity not in data_map:
+                msg = (
+                    f"Entity '{entity}' specified in config is missing from data_map. "
+                    f"Available entities: {list(data_map.keys())}"
+                )
+                logger.error(msg)
+                raise KeyError(msg)
+
+        logger.info("=== Validating Links (out of core) ===")
+        validation_results = {}
+        with KeyIndex(db_path=db_path, batch_size=batch_size) as key_index:
+            for entity, keys in config.items():
+                pk_field = keys.get('primary_key')
+                if pk_field is not None:
+                    key_index.add_primary_keys(
+                        entity, self._iter_key_values(
+                            entity, data_map[entity], pk_field, "primary",
+                            fallback_field=self._pk_fallback(pk_field)
+                        )
+                    )
+                fk_fields = keys.get('foreign_key')
+                if fk_fields is None:
+                    fk_fields = []
+                elif not isinstance(fk_fields, list):
+                    fk_fields = [fk_fields]
+                for fk_field in fk_fields:
+                    key_index.add_foreign_keys(
+                        entity, self._iter_key_values(entity, data_map[entity], fk_field, "foreign")
+                    )
+
+            for entity in config.keys():
+                invalid_keys = [
+                    fk for fk in key_index.iter_invalid_foreign_keys(entity)
+                    if not self._in_known_keys(fk, known_keys, exact_index)
+                ]
+                validation_results[entity] = invalid_keys
+                if invalid_keys:
+                    logger.warning(
+                        f"Entity '{entity}' has {len(invalid_keys)} invalid foreign keys."
+                    )
+                else:
+                    logger.info(f"Entity '{entity}' has no invalid foreign keys.")
+
+        self.link_validation_results = validation_results
+        return validation_results
+
+    def get_schema_links(self, resolved_schema: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Reads the declared links of every node in the resolved schema and flattens
+        them, including links nested in subgroups, into a list of edges per node.
+
+        Args:
+            resolved_schema (Dict[str, Any]): The resolved gen3 JSON schema, keyed by
+                '<node>.yaml', e.g. ResolveSchema.schema_resolved.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: A dictionary mapping each node name to a list
+            of edges. Each edge is a dictionary with the keys 'name', 'target_type',
+            'multiplicity', 'required', 'group' (index of the subgroup in the node's links,
+            or None for a top-level link) and 'group_required'.
+        """
+        schema_links = {}
+        for schema_key, schema in resolved_schema.items():
+            if not isinstance(schema, dict):
+                continue
+            node = schema_key[:-5] if schema_key.endswith('.yaml') else schema_key
+            edges = []
+            for group_idx, link in enumerate(schema.get("links", [])):
+                if "subgroup" in link:
+                    for sub_link in link["subgroup"]:
+                        edges.append({
+                            "name": sub_link.get("name"),
+                            "target_type": sub_link.get("target_type"),
+                            "multiplicity": sub_link.get("multiplicity"),
+                            "required": bool(sub_link.get("required", False)),
+                            "group": group_idx,
+                            "group_required": bool(link.get("required", False)),
+                        })
+                else:
+                    edges.append({
+                        "name": link.get("name"),
+                        "target_type": link.get("target_type"),
+                        "multiplicity": link.get("multiplicity"),
+                        "required": bool(link.get("required", False)),
+                        "group": None,
+                        "group_required": bool(link.get("required", False)),
+                    })
+            schema_links[node] = edges
+        logger.info(f"Read schema links for {len(schema_links)} nodes.")
+        return schema_links
+
+    def _link_values(self, value: Any) -> List[Any]:
+        """
+        Returns the referenced key(s) of a link field value. A link may be a
+        {"submitter_id": ...} dictionary, a plain value, or a list of either
+        (for to-many links).
+        """
+        if value is None:
+            return []
+        if isinstance(value, list):
+            values = []
+            for item in value:
+                values.extend(self._link_values(item))
+            return values
+        if isinstance(value, dict):
+            return [value['submitter_id']] if 'submitter_id' in value else [value]
+        return [value]
+
+    def _get_target_index(
+        self, target: str, data_map: Dict[str, List[Dict[str, Any]]], target_indexes: Dict[str, set]
+    ) -> set:
+        """
+        Returns the set of submitter_ids of a target node, building it on first use.
+        """
+        if target not in target_indexes:
+            target_indexes[target] = {
+                record['submitter_id'] for record in data_map[target]
+                if 'submitter_id' in record and self._is_hashable(record['submitter_id'])
+            }
+            logger.debug(f"Built key index for target node '{target}' with {len(target_indexes[target])} keys.")
+        return target_indexes[target]
+
+    def validate_schema_links(
+        self, data_map: Dict[str, List[Dict[str, Any]]], resolved_schema: Dict[str, Any],
+        root_node: List[str] = None, known_keys: Dict[str, Any] = None,
+        exact_index: Any = None, registry: KeyRegistry = None
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Validates links using the edges declared in the resolved schema rather than
+        relationships inferred from the data.
+
+        For each node in the data map, every declared link is checked by looking up the
+        referenced submitter_ids in a key index of the link's target node only. One index
+        is built per target node and shared between all edges pointing at it.
+
+        Args:
+            data_map (Dict[str, List[Dict[str, Any]]]): Contains the data for each entity.
+            resolved_schema (Dict[str, Any]): The resolved gen3 JSON schema, keyed by
+                '<node>.yaml', e.g. ResolveSchema.schema_resolved.
+            root_node (List[str], optional): List of root node names whose links to nodes
+                that are absent from the data map are skipped. Defaults to self.root_node.
+            known_keys (Dict[str, BloomFilter], optional): Bloom filters of keys accepted in
+                earlier submissions, keyed by node. Keys not found in the data map are checked
+                against the filter of the link's target node. Defaults to None.
+            exact_index (optional): An exact index with a contains(key, node) method used
+                to confirm bloom filter hits for the link's target node. Defaults to None.
+            registry (KeyRegistry, optional): A persistent registry of keys accepted in
+                earlier batches. Keys not found in the data map are looked up among the
+                registered keys of the link's target node. Defaults to None.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: A dictionary mapping each entity to a
+            dictionary of its edges, keyed by link name. Each edge result contains
+            'target_type', 'status' ('checked', 'skipped' or 'target_missing'), 'n_links'
+            (number of referenced keys) and 'invalid_keys'.
+        """
+        if root_node is None:
+            root_node = self.root_node
+
+        schema_links = self.get_schema_links(resolved_schema)
+        registered_nodes = set(registry.nodes()) if registry is not None else set()
+        target_indexes = {}
+        validation_results = {}
+
+        logger.info("=== Validating Schema Links ===")
+        for entity, records in data_map.items():
+            if entity not in schema_links:
+                logger.warning(f"Warning: {entity} not found in resolved schema keys.")
+                continue
+
+            entity_results = {}
+            for edge in schema_links[entity]:
+                link_name = edge["name"]
+                target = edge["target_type"]
+                values = []
+                for record in records:
+                    if link_name in record:
+                        values.extend(self._link_values(record[link_name]))
+
+                if target in data_map:
+                    index = self._get_target_index(target, data_map, target_indexes)
+                    invalid_keys = [
+                        v for v in values if not self._key_in_index(v, index)
+                        and not self._in_known_keys(v, known_keys, exact_index, nodes=[target])
+                    ]
+                    status = "checked"
+                elif (known_keys and target in known_keys) or target in registered_nodes:
+                    invalid_keys = [
+                        v for v in values
+                        if not self._in_known_keys(v, known_keys, exact_index, nodes=[target])
+                    ]
+                    status = "checked"
+                elif entity in root_node or not values:
+                    invalid_keys = []
+                    status = "skipped"
+                else:
+                    invalid_keys = values
+                    status = "target_missing"
+
+                if registry is not None and invalid_keys:
+                    registered = registry.find_existing(invalid_keys, node=target)
+                    invalid_keys = [
+                        v for v in invalid_keys if not self._key_in_index(v, registered)
+                    ]
+
+                entity_results[link_name] = {
+                    "target_type": target,
+                    "status": status,
+                    "n_links": len(values),
+                    "invalid_keys": invalid_keys,
+                }
+                if invalid_keys:
+                    logger.warning(
+                        f"Entity '{entity}' link '{link_name}' -> '{target}' has "
+                        f"{len(invalid_keys)} invalid keys ({status})."
+                    )
+            validation_results[entity] = entity_results
+
+        self.schema_link_validation_results = validation_results
+        return validation_results
+
+    def check_link_cardinality(
+        self, data_map: Dict[str, List[Dict[str, Any]]], resolved_schema: Dict[str, Any]
+    ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Enforces the `multiplicity` and `required` properties of the links declared in
+        the resolved schema.
+
+        For every declared edge of a node (source -> target), the number of targets per
+        source record and the source records per target key are counted with hash maps in
+        a single pass over the records, so the check runs in linear time. The multiplicity
+        is read from the source's point of view:
+
+        - many_to_one: each source record links to at most one target.
+        - one_to_many: each target is linked by at most one source record.
+        - one_to_one: both of the above.
+        - many_to_many: no constraint.
+
+        A record is missing a required link if a required top-level link is absent or
+        empty, or if none of the links of a required subgroup are present.
+
+        Args:
+            data_map (Dict[str, List[Dict[str, Any]]]): Contains the data for each entity.
+            resolved_schema (Dict[str, Any]): The resolved gen3 JSON schema, keyed by
+                '<node>.yaml', e.g. ResolveSchema.schema_resolved.
+
+        Returns:
+            Dict[str, Dict[str, List[Dict[str, Any]]]]: A dictionary mapping each entity to a
+            dictionary with the lists 'multiplicity_violations' and 'missing_required_links'.
+            A multiplicity violation has the keys 'link', 'target_type', 'multiplicity',
+            'violation' ('multiple_targets' or 'multiple_sources'), 'keys' and 'indices'.
+            A missing required link has the keys 'index' and 'links'.
+        """
+        schema_links = self.get_schema_links(resolved_schema)
+        results = {}
+
+        logger.info("=== Checking Link Multiplicity and Required Links ===")
+        for entity, records in data_map.items():
+            if entity not in schema_links:
+                logger.warning(f"Warning: {entity} not found in resolved schema keys.")
+                continue
+            edges = schema_links[entity]
+            violations = []
+            # record index -> names of links present in the record
+            present = {}
+
+            for edge in edges:
+                link_name = edge["name"]
+                multiplicity = edge["multiplicity"]
+                sources_per_target = {}
+                for idx, record in enumerate(records):
+                    keys = self._link_values(record.get(link_name))
+                    if not keys:
+                        continue
+                    present.setdefault(idx, set()).add(link_name)
+                    distinct_keys = list(dict.fromkeys(
+                        k for k in keys if self._is_hashable(k)
+                    ))
+                    if multiplicity in ("many_to_one", "one_to_one") and len(distinct_keys) > 1:
+                        violations.append({
+                            "link": link_name,
+                            "target_type": edge["target_type"],
+                            "multiplicity": multiplicity,
+                            "violation": "multiple_targets",
+                            "keys": distinct_keys,
+                            "indices": [idx],
+                        })
+                    for key in distinct_keys:
+                        sources_per_target.setdefault(key, []).append(idx)
+
+                if multiplicity in ("one_to_many", "one_to_one"):
+                    for key, indices in sources_per_target.items():
+                        if len(indices) > 1:
+                            violations.append({
+                                "link": link_name,
+                                "target_type": edge["target_type"],
+                                "multiplicity": multiplicity,
+                                "violation": "multiple_sources",
+                                "keys": [key],
+                                "indices": indices,
+                            })
+
+            # Required top-level links, and required subgroups (at least one link present)
+            required_sets = []
+            groups = {}
+            for edge in edges:
+                if edge["required"]:
+                    required_sets.append([edge["name"]])
+                elif edge["group"] is not None and edge["group_required"]:
+                    groups.setdefault(edge["group"], []).append(edge["name"])
+            required_sets.extend(groups.values())
+
+            missing = []
+            if required_sets:
+                for idx in range(len(records)):
+                    record_links = present.get(idx, set())
+                    missing_links = [
+                        name for names in required_sets
+                        if not record_links.intersection(names)
+                        for name in names
+                    ]
+                    if missing_links:
+                        missing.append({"index": idx, "links": missing_links})
+
+            results[entity] = {
+                "multiplicity_violations": violations,
+                "missing_required_links": missing,
+            }
+            if violations or missing:
+                logger.warning(
+                    f"Entity '{entity}' has {len(violations)} multiplicity violations and "
+                    f"{len(missing)} records missing required links."
+                )
+
+        self.link_cardinality_results = results
+        return results
@@ -1,2 +1,7 @@
 from .parse_xlsx import *
-from .parse_data import *
\ No newline at end of file
+from .parse_data import *
+from .data_map import *
+from .json_stream import *
+from .parse_tsv import *
+from .coerce import *
+from .parse_parquet import *
@@ -0,0 +1,308 @@
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, List, Set
+import math
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+_BOOLEANS = {'true': True, 'false': False, 'yes': True, 'no': False, '1': True, '0': False}
+
+# The order in which declared types are tried for a value that matches none of them
+_TARGET_ORDER = ('integer', 'number', 'boolean', 'string')
+
+_MAX_SAFE_INTEGER = 2 ** 53
+
+
+def _json_kind(value: Any) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, (bool, np.bool_)):
+        return 'boolean'
+    if isinstance(value, (int, np.integer)):
+        return 'integer'
+    if isinstance(value, (float, np.floating)):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, (datetime, date, np.datetime64)):
+        return 'datetime'
+    if isinstance(value, dict):
+        return 'object'
+    if isinstance(value, (list, tuple)):
+        return 'array'
+    return 'other'
+
+
+def _safe_whole(value: float) -> bool:
+    # Whole floats beyond 2**53 may already have lost precision, so they are left alone
+    return math.isfinite(value) and value.is_integer() and abs(value) < _MAX_SAFE_INTEGER
+
+
+def _to_integer(value: Any, kind: str) -> Any:
+    if kind == 'number':
+        value = float(value)
+        return int(value) if _safe_whole(value) else None
+    if kind == 'string':
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _to_number(value: Any, kind: str) -> Any:
+    if kind != 'string':
+        return None
+    text = value.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _to_string(value: Any, kind: str) -> Any:
+    if kind == 'integer':
+        return str(int(value))
+    if kind == 'number':
+        value = float(value)
+        return str(int(value)) if _safe_whole(value) else repr(value)
+    if kind == 'datetime':
+        return pd.Timestamp(value).isoformat()
+    return None
+
+
+def _series_kinds(series: pd.Series) -> pd.Series:
+    # Typed columns are classified from their dtype; only object columns are inspected per value
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return pd.Series('boolean', index=series.index)
+    if pd.api.types.is_integer_dtype(dtype):
+        return pd.Series('integer', index=series.index)
+    if pd.api.types.is_float_dtype(dtype):
+        return pd.Series('number', index=series.index)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.Series('datetime', index=series.index)
+    if pd.api.types.is_string_dtype(dtype) and not pd.api.types.is_object_dtype(dtype):
+        return pd.Series('string', index=series.index)
+    return series.map(_json_kind)
+
+
+def series_to_list(series: pd.Series) -> list:
+    """
+    Converts a column to a list of plain Python values, with None for every null
+    (None, NaN, NaT).
+
+    Args:
+        series (pd.Series): The column.
+
+    Returns:
+        list: The column's values.
+    """
+    # tolist() boxes numpy scalars to python types in C; nulls become None
+    values = series.tolist()
+    null_mask = series.isna().to_numpy()
+    if null_mask.any():
+        for idx in np.flatnonzero(null_mask):
+            values[idx] = None
+    return values
+
+
+def declared_types(property_schema: Dict[str, Any]) -> Set[str]:
+    """
+    Collects the JSON types a property accepts, from its 'type' keyword or from the
+    'type' of each 'oneOf'/'anyOf' alternative.
+
+    Args:
+        property_schema (dict): The resolved schema of the property.
+
+    Returns:
+        set: The declared type names, empty if the property declares none.
+    """
+    types = set()
+    declared = property_schema.get('type')
+    if declared is not None:
+        types.update([declared] if isinstance(declared, str) else declared)
+    else:
+        for keyword in ('oneOf', 'anyOf'):
+            for alternative in property_schema.get(keyword, []):
+                if isinstance(alternative, dict):
+                    types.update(declared_types(alternative))
+    return types
+
+
+class SchemaCoercer:
+    """
+    Coerces parsed values to the types declared in the resolved schema, one column at a
+    time, before validation. Spreadsheet data often holds integers as floats (12.0),
+    booleans as strings and dates as Timestamps, which would otherwise each fail a 'type'
+    check in Validate.
+
+    Only values that match none of a property's declared types are touched, and only
+    when they convert exactly: whole floats below 2**53 and integer strings to integers,
+    numeric strings to numbers, 'true'/'false'/'yes'/'no'/'1'/'0' to booleans, and dates
+    and numbers to strings. Anything else is left for Validate to report. Every coercion is
+    counted per node, property and transformation, and logged once per column.
+
+    Attributes:
+        resolved_schema (dict): The resolved gen3 JSON schema, keyed by '<node>.yaml'.
+        transformations (Counter): The number of values coerced, keyed by
+            (node, property, from_type, to_type).
+    """
+
+    def __init__(self, resolved_schema: Dict[str, Any]):
+        if resolved_schema is None:
+            logger.error("Provided resolved_schema is None.")
+            raise ValueError("resolved_schema cannot be None.")
+        self.resolved_schema = resolved_schema
+        self.transformations = Counter()
+        self._type_cache = {}
+
+    def property_types(self, node: str) -> Dict[str, Set[str]]:
+        """
+        Returns the declared types of each property of a node that has any.
+
+        Args:
+            node (str): The node name.
+
+        Returns:
+            dict: A dictionary mapping each property name to its set of declared types.
+        """
+        if node not in self._type_cache:
+            schema = self.resolved_schema.get(f"{node}.yaml", {})
+            self._type_cache[node] = {
+                prop: types for prop, prop_schema in schema.get('properties', {}).items()
+                if isinstance(prop_schema, dict) and (types := declared_types(prop_schema))
+            }
+        return self._type_cache[node]
+
+    @staticmethod
+    def _convert(values: pd.Series, kinds: pd.Series, target: str) -> pd.Series:
+        # Returns the converted values; cells that do not convert are None. Numbers are
+        # converted with Python ints and floats, never through float64/int64 arrays, so a
+        # coercion only ever changes the type of a value, not the value itself.
+        if target == 'boolean':
+            text = values.where(kinds.isin(['string', 'integer'])).astype(str).str.strip().str.lower()
+            return text.map(_BOOLEANS).astype(object)
+        convert = {'integer': _to_integer, 'number': _to_number, 'string': _to_string}.get(target)
+        if convert is None:
+            return pd.Series(None, index=values.index, dtype=object)
+        return pd.Series(
+            [convert(value, kind) for value, kind in zip(values.tolist(), kinds.tolist())],
+            index=values.index, dtype=object
+        )
+
+    def coerce_series(self, node: str, prop: str, series: pd.Series) -> pd.Series:
+        """
+        Coerces the values of one property to its declared types.
+
+        Args:
+            node (str): The node name.
+            prop (str): The property name.
+            series (pd.Series): The values of the property.
+
+        Returns:
+            pd.Series: The coerced values (an object Series), or the input Series itself
+            if nothing was coerced.
+        """
+        types = self.property_types(node).get(prop)
+        if not types:
+            return series
+        accepted = set(types)
+        if 'number' in accepted:
+            accepted.add('integer')
+        kinds = _series_kinds(series)
+        pending = (series.notna() & ~kinds.isin(accepted | {'null'})).to_numpy().copy()
+        if not pending.any():
+            return series
+
+        result = series.astype(object)
+        for target in _TARGET_ORDER:
+            if target not in types or not pending.any():
+                continue
+            converted = self._convert(series[pending], kinds[pending], target)
+            done = converted.notna().to_numpy()
+            if not done.any():
+                continue
+            idx = np.flatnonzero(pending)[done]
+            result.iloc[idx] = converted[done].to_numpy()
+            for from_kind, count in kinds.iloc[idx].value_counts().items():
+                self.transformations[(node, prop, from_kind, target)] += int(count)
+                logger.info(f"Coerced {count} values of {node}.{prop} from {from_kind} to {target}.")
+            pending[idx] = False
+        return result
+
+    def coerce_frame(self, node: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Coerces every column of a DataFrame whose name is a property of the node.
+
+        Args:
+            node (str): The node (sheet) name.
+            df (pd.DataFrame): The node's rows.
+
+        Returns:
+            pd.DataFrame: A DataFrame with the coerced columns replaced, or the input
+            DataFrame if nothing was coerced. The input is not modified.
+        """
+        types = self.property_types(node)
+        coerced = {}
+        for column in df.columns:
+            if column in types:
+                values = df[column]
+                series = self.coerce_series(node, column, values)
+                if series is not values:
+                    coerced[column] = series
+        return df.assign(**coerced) if coerced else df
+
+    def coerce_records(self, node: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Coerces the records of a node in place. The values of each typed property are
+        gathered in a single pass over the records, then coerced one column at a time.
+
+        Args:
+            node (str): The node name.
+            records (list): The node's records.
+
+        Returns:
+            list: The same list of records.
+        """
+        types = self.property_types(node)
+        if not types:
+            return records
+        columns = {}
+        for idx, record in enumerate(records):
+            for prop, value in record.items():
+                if prop in types:
+                    column = columns.get(prop)
+                    if column is None:
+                        column = columns[prop] = ([], [])
+                    column[0].append(idx)
+                    column[1].append(value)
+        for prop, (positions, values) in columns.items():
+            series = pd.Series(values, dtype=object)
+            coerced = self.coerce_series(node, prop, series)
+            if coerced is series:
+                continue
+            for idx, value in zip(positions, coerced.tolist()):
+                records[idx][prop] = value
+        return records
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Lists the counted transformations.
+
+        Returns:
+            list: One dictionary per transformation with 'node', 'property', 'from',
+            'to' and 'count'.
+        """
+        return [
+            {"node": node, "property": prop, "from": from_kind, "to": to_kind, "count": count}
+            for (node, prop, from_kind, to_kind), count in self.transformations.items()
+        ]
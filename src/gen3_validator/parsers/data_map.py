@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LazyDataMap(Mapping):
+    """
+    A read-only, dict-like data map that parses a node file only when the node is indexed.
+
+    The node names are known up front from the file list, so iterating, `len` and `in`
+    never read a file. Loaded nodes are cached; with `max_nodes` set, the least recently
+    used node is evicted once more than `max_nodes` nodes are loaded, and is parsed again
+    on its next access.
+
+    Attributes:
+        source_files (Dict[str, Any]): A dictionary mapping each node name to its file path
+            (or list of part file paths).
+        loader (Callable[[Any], List[dict]]): Reads the records of a node from its
+            source_files entry.
+        max_nodes (int, optional): The maximum number of loaded nodes kept in memory.
+            Defaults to None, which keeps every loaded node.
+    """
+
+    def __init__(
+        self, source_files: Dict[str, Any], loader: Callable[[Any], List[dict]],
+        max_nodes: int = None
+    ):
+        if max_nodes is not None and max_nodes < 1:
+            raise ValueError("max_nodes must be at least 1.")
+        self.source_files = dict(source_files)
+        self.loader = loader
+        self.max_nodes = max_nodes
+        self._cache = OrderedDict()
+
+    def __getitem__(self, node: str) -> List[dict]:
+        if node in self._cache:
+            self._cache.move_to_end(node)
+            return self._cache[node]
+        if node not in self.source_files:
+            raise KeyError(node)
+        logger.info(f"Loading node '{node}' from {self.source_files[node]}")
+        records = self.loader(self.source_files[node])
+        self._cache[node] = records
+        if self.max_nodes is not None and len(self._cache) > self.max_nodes:
+            evicted, _ = self._cache.popitem(last=False)
+            logger.debug(f"Evicted node '{evicted}' from the data map cache.")
+        return records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.source_files)
+
+    def __len__(self) -> int:
+        return len(self.source_files)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self.source_files
+
+    def __repr__(self) -> str:
+        return f"LazyDataMap(nodes={list(self.source_files)}, loaded={list(self._cache)})"
+
+    def loaded_nodes(self) -> List[str]:
+        """
+        Lists the nodes currently held in memory, from least to most recently used.
+
+        Returns:
+            list: The loaded node names.
+        """
+        return list(self._cache)
+
+    def evict(self, node: str = None) -> None:
+        """
+        Drops a loaded node (or all loaded nodes) from memory.
+
+        Args:
+            node (str, optional): The node to drop. Defaults to None, which drops all nodes.
+        """
+        if node is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(node, None)
@@ -0,0 +1,228 @@
+from typing import IO, Any, Callable, Dict, Iterator, List, Union
+import gzip
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+NDJSON_EXTENSIONS = ('.jsonl', '.ndjson')
+JSON_EXTENSIONS = ('.json',) + NDJSON_EXTENSIONS
+COMPRESSION_EXTENSIONS = ('.gz', '.zst')
+
+_WHITESPACE = ' \t\n\r'
+
+
+def strip_compression(path: str) -> str:
+    """
+    Removes a '.gz' or '.zst' extension from a path, e.g. 'sample.json.gz' -> 'sample.json'.
+
+    Args:
+        path (str): The file path or name.
+
+    Returns:
+        str: The path without its compression extension.
+    """
+    for ext in COMPRESSION_EXTENSIONS:
+        if path.endswith(ext):
+            return path[:-len(ext)]
+    return path
+
+
+def open_text(path: str) -> IO[str]:
+    """
+    Opens a node file for reading text, decompressing '.gz' (gzip) and '.zst' (Zstandard)
+    files as a stream.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        IO[str]: A text file object.
+
+    Raises:
+        ImportError: If the file is Zstandard compressed and the optional 'zstandard'
+            package is not installed.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                f"Reading {path} requires the 'zstandard' package: pip install zstandard"
+            ) from e
+        return zstandard.open(path, 'rt', encoding='utf-8')
+    return open(path)
+
+
+def iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the records of a newline delimited JSON file, one line at a time. Blank lines
+    are skipped.
+
+    Args:
+        path (str): The path to the '.jsonl' or '.ndjson' file, optionally compressed.
+
+    Yields:
+        dict: Each record in the file.
+
+    Raises:
+        json.JSONDecodeError: If a line is not valid JSON. The message includes the
+            line number.
+    """
+    with open_text(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise json.JSONDecodeError(
+                    f"{e.msg} (line {line_number} of {path})", e.doc, e.pos
+                ) from e
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Yields the elements of a top-level JSON array one at a time, reading the file in
+    chunks, so only the current chunk and record are held in memory rather than the whole
+    file and its parsed list. A file whose top-level value is not an array is parsed whole
+    and yielded as a single value. The same documents as json.load are accepted: elements
+    must be separated by exactly one comma, and only whitespace may follow the array.
+
+    Args:
+        path (str): The path to the JSON file, optionally compressed.
+        chunk_size (int, optional): The number of characters read at a time. Defaults to 1 MiB.
+
+    Yields:
+        Any: Each element of the array, in file order.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON, including an empty file.
+            Elements before the error have already been yielded.
+    """
+    decoder = json.JSONDecoder()
+    with open_text(path) as f:
+        buffer = f.read(chunk_size)
+        eof = not buffer
+        pos = _skip(buffer, 0)
+        while pos == len(buffer) and not eof:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            pos = _skip(buffer, pos)
+
+        if pos == len(buffer):
+            raise json.JSONDecodeError("Expecting value", buffer, pos)
+        if buffer[pos] != '[':
+            # Not an array: fall back to a whole-file parse
+            yield json.loads(buffer[pos:] + f.read())
+            return
+        pos += 1
+
+        first = True
+        expect_value = True
+        while True:
+            pos = _skip(buffer, pos)
+            if pos < len(buffer):
+                char = buffer[pos]
+                if not expect_value:
+                    if char == ',':
+                        pos += 1
+                        expect_value = True
+                        continue
+                    if char == ']':
+                        _check_trailing(f, buffer, pos + 1, chunk_size)
+                        return
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                if char == ']':
+                    if first:
+                        _check_trailing(f, buffer, pos + 1, chunk_size)
+                        return
+                    raise json.JSONDecodeError("Expecting value", buffer, pos)
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # A value ending at the buffer edge may be cut short (e.g. a number)
+                    if end < len(buffer) or eof:
+                        yield value
+                        pos = end
+                        first = False
+                        expect_value = False
+                        continue
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+            elif eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            # Drop the consumed part of the buffer before growing it
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def _check_trailing(f: IO[str], buffer: str, pos: int, chunk_size: int) -> None:
+    # Only whitespace may follow the closing bracket, as with json.load
+    while True:
+        end = _skip(buffer, pos)
+        if end < len(buffer):
+            raise json.JSONDecodeError("Extra data", buffer, end)
+        buffer = f.read(chunk_size)
+        if not buffer:
+            return
+        pos = 0
+
+
+def _skip(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def iter_json_records(path: str, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the records of a node file: line by line for NDJSON ('.jsonl'/'.ndjson'), and
+    element by element for a JSON array.
+
+    Args:
+        path (str): The path to the node file.
+        chunk_size (int, optional): The chunk size for JSON arrays. Defaults to 1 MiB.
+
+    Yields:
+        dict: Each record in the file.
+    """
+    if strip_compression(path).endswith(NDJSON_EXTENSIONS):
+        return iter_ndjson(path)
+    return iter_json_array(path, chunk_size=chunk_size)
+
+
+class NodeStream:
+    """
+    A re-iterable stream of the records of one node. Each iteration reads the node file
+    again, so consumers that make several passes (e.g. primary then foreign keys) never
+    need the full list of records in memory. A node split over several part files is
+    streamed as one sequence, in file order.
+
+    Attributes:
+        path (Union[str, List[str]]): The path to the node file, or the paths of its parts.
+        opener (Callable[[str], Iterator[dict]]): Returns a fresh record iterator for a
+            file. Defaults to iter_json_records.
+    """
+
+    def __init__(
+        self, path: Union[str, List[str]],
+        opener: Callable[[str], Iterator[Dict[str, Any]]] = iter_json_records
+    ):
+        self.path = path
+        self.opener = opener
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        paths = self.path if isinstance(self.path, list) else [self.path]
+        for path in paths:
+            yield from self.opener(path)
+
+    def __repr__(self) -> str:
+        return f"NodeStream(path={self.path!r})"
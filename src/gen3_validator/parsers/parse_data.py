@@ -1,64 +1,290 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fnmatch import fnmatch
+from functools import partial
 import json
 import os
+import re
+from .coerce import SchemaCoercer
+from .data_map import LazyDataMap
+from .json_stream import (
+    JSON_EXTENSIONS, NDJSON_EXTENSIONS, NodeStream, iter_json_records, iter_ndjson,
+    open_text, strip_compression
+)
+
+# e.g. 'sample.part-0001.json.gz' holds part of the 'sample' node
+_PART_SUFFIX = re.compile(r'\.part-?\d+$')
+
+
+def _parse_json_file(path: str):
+    if strip_compression(path).endswith(NDJSON_EXTENSIONS):
+        return list(iter_ndjson(path))
+    with open_text(path) as f:
+        return json.load(f)
+
+
+def _read_json(path: str) -> dict:
+    try:
+        return _parse_json_file(path)
+    except FileNotFoundError:
+        print(f"Error: The file {path} was not found.")
+    except json.JSONDecodeError:
+        print(f"Error: The file {path} could not be decoded as JSON.")
+    except Exception as e:
+        print(f"An unexpected error occurred while reading {path}: {e}")
+
+
+def _is_data_file(file_name: str) -> bool:
+    return strip_compression(file_name).endswith(JSON_EXTENSIONS)
+
+
+def _node_name(path: str) -> str:
+    file_name = strip_compression(os.path.basename(path))
+    for ext in JSON_EXTENSIONS:
+        if file_name.endswith(ext):
+            return _PART_SUFFIX.sub('', file_name[:-len(ext)])
+    return file_name
+
+
+def _merge_parts(parts: list) -> tuple:
+    """
+    Concatenates the records of the files of one node, in file order.
+
+    Parameters:
+    - parts (list): A list of (file path, records) tuples.
+
+    Returns:
+    - tuple: The merged records, and a list of (first row, file path) spans, one per
+      file. A node read from a single file has the one span [(0, path)].
+    """
+    if len(parts) == 1:
+        return parts[0][1], [(0, parts[0][0])]
+    merged = []
+    spans = []
+    for file, records in parts:
+        spans.append((len(merged), file))
+        merged.extend(records)
+    return merged, spans
+
+
+def _file_spans(paths: list) -> list:
+    # The first rows of part files are only known once the parts are read
+    if len(paths) == 1:
+        return [(0, paths[0])]
+    return [(None, path) for path in paths]
+
+
+def _iter_node_records(path: str, link_suffix: str = 's'):
+    if link_suffix is None:
+        yield from iter_json_records(path)
+        return
+    alias = f"{_node_name(path)}{link_suffix}"
+    for entry in iter_json_records(path):
+        entry[alias] = entry['submitter_id']
+        yield entry
+
+
+def _load_node_file(path: str, link_suffix: str = 's') -> tuple:
+    """
+    Reads one node file and adds the '<node><link_suffix>' link alias to each record.
+    Defined at module level so it can run in a process pool.
+
+    Parameters:
+    - path (str): The path to the JSON or NDJSON file.
+    - link_suffix (str): Suffix appended to the node name for the link alias. If None,
+      the records are returned as parsed.
+
+    Returns:
+    - tuple: The node name and its list of records.
+
+    Raises:
+    - ValueError: If the file is missing or cannot be read or decoded. The message
+      names the file and the original error, which is chained as the cause.
+    - ImportError: If the file is compressed with a codec whose optional package is
+      not installed.
+    """
+    try:
+        json_data = _parse_json_file(path)
+    except ImportError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Could not load node file {path}: {e}") from e
+    file_basename = _node_name(path)
+    if link_suffix is not None:
+        alias = f"{file_basename}{link_suffix}"
+        for entry in json_data:
+            entry[alias] = entry['submitter_id']
+    return file_basename, json_data
 
 
 class ParseData:
     """Parses JSON data from a specified folder or a single file, and constructs a dictionary representation of the data."""
 
     def __init__(
-        self, data_folder_path: str = None, data_file_path: str = None, link_suffix: str = 's'
+        self, data_folder_path: str = None, data_file_path: str = None, link_suffix: str = 's',
+        workers: int = None, use_processes: bool = False, lazy: bool = False,
+        max_cached_nodes: int = None, recursive: bool = False, include: list = None,
+        exclude: list = None, materialize_links: bool = False, resolved_schema: dict = None
     ):
+        """
+        Parameters:
+        - data_folder_path (str, optional): Path to a folder containing JSON files. Files
+          may be gzip ('.gz') or Zstandard ('.zst') compressed, and part files of one node
+          (e.g. 'sample.part-0001.json.gz') are merged into the 'sample' node.
+        - data_file_path (str, optional): Path to a single JSON file.
+        - link_suffix (str): Suffix appended to the node name for the link alias. Default is 's'.
+        - workers (int, optional): Number of files to load concurrently. Default is None,
+          which loads files one after another.
+        - use_processes (bool): If True, files are parsed in a process pool rather than a
+          thread pool. Threads suit slow (e.g. network) storage, processes suit CPU bound
+          parsing of large files. Default is False.
+        - lazy (bool): If True, data_dict is a LazyDataMap that parses each node file on
+          first access instead of loading every file up front. Default is False.
+        - max_cached_nodes (int, optional): With lazy=True, the maximum number of parsed
+          nodes kept in memory; the least recently used node is evicted beyond it.
+          Default is None, which keeps every parsed node.
+        - recursive (bool): If True, data files are discovered in sub folders too. Default is False.
+        - include (list, optional): Glob patterns; only data files whose name or path
+          relative to the folder matches one of them are loaded. Default is None (all files).
+        - exclude (list, optional): Glob patterns of files and sub folders to skip, matched
+          against the name or the relative path. Default is None.
+        - materialize_links (bool): If True, the '<node><link_suffix>' link alias is written
+          into every record as a copy of its submitter_id. By default records are left as
+          parsed: Linkage resolves the alias to the submitter_id at lookup time, and
+          Validate does not report it. Default is False.
+        - resolved_schema (dict, optional): The resolved gen3 JSON schema. If given, the
+          loaded records of each node are coerced to the types declared for the node (see
+          SchemaCoercer), e.g. 12.0 to 12 for an integer property. Record streams from
+          iter_node are not coerced. Default is None.
+
+        Attributes:
+        - source_files (dict): A dictionary mapping each node name to a list of
+          (first row, file path) spans, one per file of the node, in row order. A node
+          read from a single file maps to [(0, path)]. The entries are set when the files
+          are discovered; with lazy=True, the first rows of a node split over part files
+          are None until the node is loaded.
+        """
         self.folder_path = data_folder_path
         self.file_path = data_file_path
         self.link_suffix = link_suffix
+        self.materialize_links = materialize_links
+        self.workers = workers
+        self.use_processes = use_processes
+        self.lazy = lazy
+        self.recursive = recursive
+        self.include = include
+        self.exclude = exclude
+        self.coercer = SchemaCoercer(resolved_schema) if resolved_schema is not None else None
         self.file_path_list = self.list_data_files()
-        self.data_dict = self.load_json_data(
-            self.file_path_list, link_suffix=self.link_suffix
-        )
+        self.node_files = {}
+        for path in self.file_path_list:
+            self.node_files.setdefault(_node_name(path), []).append(path)
+        self.source_files = {node: _file_spans(files) for node, files in self.node_files.items()}
+        if self.lazy:
+            self.data_dict = LazyDataMap(
+                self.node_files, loader=self._load_node_records, max_nodes=max_cached_nodes
+            )
+        else:
+            self.data_dict = self.load_json_data(
+                self.file_path_list, link_suffix=self._alias_suffix()
+            )
         self.data_nodes = self.get_node_names()
 
+    def _alias_suffix(self) -> str:
+        # None tells the loaders to leave the records untouched
+        return self.link_suffix if self.materialize_links else None
+
+    def _load_node_records(self, paths: list) -> list:
+        parts = [(path, _load_node_file(path, self._alias_suffix())[1]) for path in paths]
+        records, source = _merge_parts(parts)
+        node = _node_name(paths[0])
+        self.source_files[node] = source
+        if self.coercer is not None:
+            self.coercer.coerce_records(node, records)
+        return records
+
     def read_json(self, path: str) -> dict:
-        try:
-            with open(path) as f:
-                data = json.load(f)
-                return data
-        except FileNotFoundError:
-            print(f"Error: The file {path} was not found.")
-        except json.JSONDecodeError:
-            print(f"Error: The file {path} could not be decoded as JSON.")
-        except Exception as e:
-            print(f"An unexpected error occurred while reading {path}: {e}")
+        return _read_json(path)
 
     def list_data_files(self) -> list:
         """
         Lists all JSON data files in the specified folder or returns the single file path.
 
         This method checks if a folder path is provided. If so, it lists all files in the folder
-        that have a '.json' extension and returns their absolute paths. If no folder path is provided,
-        it returns the single file path specified during initialization.
+        (and its sub folders, if recursive) that have a '.json', '.jsonl' or '.ndjson'
+        extension, optionally followed by '.gz' or '.zst', and that pass the include and
+        exclude globs, and returns their absolute paths. If no folder path is provided, it
+        returns the single file path specified during initialization.
 
         Returns:
-        - list: A list of absolute file paths to JSON files.
+        - list: A list of absolute file paths to JSON files, sorted by path.
         """
         if self.folder_path:
-            json_paths = [
-                os.path.abspath(os.path.join(self.folder_path, f))
-                for f in os.listdir(self.folder_path)
-                if f.endswith(".json")
-            ]
+            json_paths = sorted(
+                os.path.abspath(path) for path in self._scan_folder(self.folder_path)
+            )
         else:
             json_paths = [self.file_path]
         return json_paths
 
+    def _matches(self, patterns: list, rel_path: str, name: str) -> bool:
+        return any(fnmatch(rel_path, p) or fnmatch(name, p) for p in patterns)
+
+    def _scan_folder(self, folder: str) -> list:
+        paths = []
+        directories = [folder]
+        while directories:
+            directory = directories.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rel_path = os.path.relpath(entry.path, folder).replace(os.sep, '/')
+                    if self.exclude and self._matches(self.exclude, rel_path, entry.name):
+                        continue
+                    if entry.is_dir():
+                        if self.recursive:
+                            directories.append(entry.path)
+                    elif _is_data_file(entry.name) and (
+                        not self.include or self._matches(self.include, rel_path, entry.name)
+                    ):
+                        paths.append(entry.path)
+        return paths
+
     def load_json_data(self, json_paths: list, link_suffix: str = 's') -> dict:
+        """
+        Loads the JSON files into a dictionary keyed by node name, adding the
+        '<node><link_suffix>' link alias to each record.
+
+        With `workers` set, files are read and post-processed concurrently. The
+        dictionary is assembled in the order of json_paths, so the result does not
+        depend on which file finishes first. Part files of the same node are merged
+        in that order, and the node's source_files entry gets the first row of each part.
+        With a resolved schema, each node's records are then coerced to the declared types.
+
+        Parameters:
+        - json_paths (list): The paths of the JSON files.
+        - link_suffix (str): Suffix appended to the node name for the link alias. If None,
+          the records are returned as parsed.
+
+        Returns:
+        - dict: A dictionary mapping each node name to its list of records.
+        """
+        if self.workers and self.workers > 1 and len(json_paths) > 1:
+            executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            with executor_class(max_workers=self.workers) as executor:
+                loaded = list(executor.map(
+                    _load_node_file, json_paths, [link_suffix] * len(json_paths)
+                ))
+        else:
+            loaded = [_load_node_file(file, link_suffix) for file in json_paths]
+
+        node_parts = {}
+        for file, (file_basename, json_data) in zip(json_paths, loaded):
+            node_parts.setdefault(file_basename, []).append((file, json_data))
+
         json_files = {}
-        for file in json_paths:
-            json_data = self.read_json(file)
-            file_basename = os.path.basename(file)
-            file_basename = file_basename.replace('.json', '')
-            for entry in json_data:
-                entry[f"{file_basename}{link_suffix}"] = entry['submitter_id']
-            json_files[file_basename] = json_data
+        for file_basename, parts in node_parts.items():
+            json_files[file_basename], self.source_files[file_basename] = _merge_parts(parts)
+            if self.coercer is not None:
+                self.coercer.coerce_records(file_basename, json_files[file_basename])
         return json_files
 
     def get_node_names(self) -> list:
@@ -66,19 +292,47 @@ class ParseData:
         Retrieves the names of nodes from the JSON files.
 
         This method iterates over the list of file paths and extracts the node names
-        by removing the '.json' extension from each file name.
+        by removing the extensions (and any '.part-NNNN' suffix) from each file name.
+        Each node is listed once, even if it is split over several files.
 
         Returns:
         - list: A list of node names extracted from the JSON file paths.
         """
         node_names = []
         for node in self.file_path_list:
-            if node.endswith('.json'):
-                last_item = os.path.basename(node)
-                node_names.append(last_item[:-5])
+            if _is_data_file(node):
+                node_names.append(_node_name(node))
             else:
                 node_names.append(node)
-        return node_names
+        return list(dict.fromkeys(node_names))
+
+    def iter_node(self, node: str) -> NodeStream:
+        """
+        Returns a stream of the records of a node, read from its file(s) one record at a time
+        (line by line for NDJSON, element by element for a JSON array), with the link alias
+        added to each record if materialize_links is set. The full list of records is never
+        built.
+
+        Parameters:
+        - node (str): The name of the node.
+
+        Returns:
+        - NodeStream: A re-iterable stream of the node's records.
+        """
+        return NodeStream(
+            self.node_files[node], opener=partial(_iter_node_records, link_suffix=self._alias_suffix())
+        )
+
+    def stream_data_map(self) -> dict:
+        """
+        Returns a data map of record streams, one per node, for the validation and linkage
+        stages that consume records one at a time (Validate.validate_schema,
+        Linkage.validate_links_out_of_core).
+
+        Returns:
+        - dict: A dictionary mapping each node name to its NodeStream.
+        """
+        return {node: self.iter_node(node) for node in self.node_files}
 
     def return_data(self, node: str) -> dict:
         """
@@ -0,0 +1,251 @@
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List
+import os
+import logging
+from .data_map import LazyDataMap
+
+logger = logging.getLogger(__name__)
+
+PARQUET_EXTENSIONS = ('.parquet',)
+ARROW_EXTENSIONS = ('.arrow', '.feather')
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.ipc
+    except ImportError as e:
+        raise ImportError(
+            "Reading Parquet or Arrow files requires the 'pyarrow' package: pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+def _is_columnar_file(file_name: str) -> bool:
+    return file_name.endswith(PARQUET_EXTENSIONS + ARROW_EXTENSIONS)
+
+
+def _columnar_node_name(path: str) -> str:
+    file_name = os.path.basename(path)
+    for ext in PARQUET_EXTENSIONS + ARROW_EXTENSIONS:
+        if file_name.endswith(ext):
+            return file_name[:-len(ext)]
+    return file_name
+
+
+def read_table(path: str, columns: List[str] = None):
+    """
+    Reads a Parquet or Arrow IPC ('.arrow', '.feather') file into a pyarrow Table through
+    a memory map. Arrow IPC buffers are used in place, without a copy; Parquet pages are
+    decoded from the mapped file.
+
+    Args:
+        path (str): The path to the file.
+        columns (List[str], optional): Only read these columns. Defaults to None (all columns).
+
+    Returns:
+        pyarrow.Table: The table.
+
+    Raises:
+        ImportError: If the optional 'pyarrow' package is not installed.
+    """
+    pa = _import_pyarrow()
+    if path.endswith(ARROW_EXTENSIONS):
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        return table.select(columns) if columns is not None else table
+    return pa.parquet.read_table(path, columns=columns, memory_map=True)
+
+
+class ParquetRecords(Sequence):
+    """
+    A read-only record view over a pyarrow Table, for the stages that consume records
+    (Validate, Linkage, RecordGraph). The data stays columnar: records are built one
+    record batch at a time while iterating, and a single record on indexing, so the
+    full list of dictionaries is never held in memory.
+
+    Null values are left out of the records, as a missing key in a JSON record becomes
+    a null when the records are written to Parquet.
+
+    Attributes:
+        table (pyarrow.Table): The node's rows.
+        batch_size (int): The maximum number of rows converted to records at a time.
+        drop_nulls (bool): If True, null values are left out of the records.
+    """
+
+    def __init__(self, table, batch_size: int = 65536, drop_nulls: bool = True):
+        self.table = table
+        self.batch_size = batch_size
+        self.drop_nulls = drop_nulls
+
+    def _clean(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.drop_nulls:
+            return record
+        return {key: value for key, value in record.items() if value is not None}
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for batch in self.table.to_batches(max_chunksize=self.batch_size):
+            for record in batch.to_pylist():
+                yield self._clean(record)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return [self._clean(r) for r in self.table.slice(start, max(stop - start, 0)).to_pylist()]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("ParquetRecords index out of range")
+        return self._clean(self.table.slice(idx, 1).to_pylist()[0])
+
+    def __repr__(self) -> str:
+        return f"ParquetRecords(rows={len(self)}, columns={self.table.column_names})"
+
+    def batches(self, columns: List[str] = None) -> Iterator[Any]:
+        """
+        Yields the rows as pyarrow RecordBatches of at most `batch_size` rows, for
+        vectorized processing.
+
+        Args:
+            columns (List[str], optional): Only include these columns. Defaults to None.
+
+        Yields:
+            pyarrow.RecordBatch: Each batch of rows.
+        """
+        table = self.table.select(columns) if columns is not None else self.table
+        yield from table.to_batches(max_chunksize=self.batch_size)
+
+    def column_values(self, field: str, fallback_field: str = None, missing: Any = None) -> List[Any]:
+        """
+        Reads one field of every record as a list, straight from the column, matching
+        `record.get(field, missing)` over the records (or the fallback field when a record
+        does not have `field`).
+
+        Args:
+            field (str): The field name.
+            fallback_field (str, optional): The field read when a record does not have
+                `field`. Defaults to None.
+            missing (Any, optional): The value for records with neither field. Defaults to None.
+
+        Returns:
+            List[Any]: The value of each record, in row order.
+        """
+        names = self.table.column_names
+        if field in names:
+            values = self.table.column(field).to_pylist()
+        else:
+            values = [None] * len(self)
+        if not self.drop_nulls and field in names:
+            return values
+        if fallback_field is not None and fallback_field in names:
+            fallback = self.table.column(fallback_field).to_pylist()
+            values = [v if v is not None else f for v, f in zip(values, fallback)]
+        return [v if v is not None else missing for v in values]
+
+
+class ParseParquet:
+    """Maps a folder of '<node>.parquet' (or Arrow IPC) files to a data map of record views over memory-mapped tables."""
+
+    def __init__(
+        self, data_folder_path: str = None, data_file_path: str = None,
+        batch_size: int = 65536, lazy: bool = False, max_cached_nodes: int = None,
+        drop_nulls: bool = True
+    ):
+        """
+        Parameters:
+        - data_folder_path (str, optional): Path to a folder of '<node>.parquet',
+          '<node>.arrow' or '<node>.feather' files, one node per file.
+        - data_file_path (str, optional): Path to a single file.
+        - batch_size (int): The maximum number of rows converted to records at a time.
+          Default is 65536.
+        - lazy (bool): If True, data_dict is a LazyDataMap that opens each node file on
+          first access. Default is False.
+        - max_cached_nodes (int, optional): With lazy=True, the maximum number of opened
+          nodes kept in memory. Default is None, which keeps every opened node.
+        - drop_nulls (bool): If True, null values are left out of the records. Default is True.
+        """
+        _import_pyarrow()
+        self.folder_path = data_folder_path
+        self.file_path = data_file_path
+        self.batch_size = batch_size
+        self.lazy = lazy
+        self.drop_nulls = drop_nulls
+        self.file_path_list = self.list_data_files()
+        self.node_files = {}
+        for path in self.file_path_list:
+            self.node_files.setdefault(_columnar_node_name(path), []).append(path)
+        if self.lazy:
+            self.data_dict = LazyDataMap(
+                self.node_files, loader=self._load_node_records, max_nodes=max_cached_nodes
+            )
+        else:
+            self.data_dict = {
+                node: self._load_node_records(paths) for node, paths in self.node_files.items()
+            }
+        self.data_nodes = list(self.node_files)
+
+    def list_data_files(self) -> list:
+        """
+        Lists all Parquet and Arrow files in the specified folder or returns the single file path.
+
+        Returns:
+        - list: A list of absolute file paths, sorted by path.
+        """
+        if self.folder_path:
+            return sorted(
+                os.path.abspath(entry.path) for entry in os.scandir(self.folder_path)
+                if entry.is_file() and _is_columnar_file(entry.name)
+            )
+        return [self.file_path]
+
+    def read_node_table(self, node: str, columns: List[str] = None):
+        """
+        Reads the table of a node, concatenating the tables of its files.
+
+        Parameters:
+        - node (str): The name of the node.
+        - columns (list, optional): Only read these columns. Default is None (all columns).
+
+        Returns:
+        - pyarrow.Table: The node's rows.
+        """
+        pa = _import_pyarrow()
+        tables = [read_table(path, columns=columns) for path in self.node_files[node]]
+        return tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+
+    def _load_node_records(self, paths: list) -> ParquetRecords:
+        table = self.read_node_table(_columnar_node_name(paths[0]))
+        logger.info(f"Opened {table.num_rows} rows from {paths}")
+        return ParquetRecords(table, batch_size=self.batch_size, drop_nulls=self.drop_nulls)
+
+    def iter_batches(self, node: str, columns: List[str] = None) -> Iterator[Any]:
+        """
+        Yields the rows of a node as pyarrow RecordBatches, reading only the requested
+        columns, for vectorized validation and key extraction.
+
+        Parameters:
+        - node (str): The name of the node.
+        - columns (list, optional): Only include these columns. Default is None (all columns).
+
+        Yields:
+        - pyarrow.RecordBatch: Each batch of at most batch_size rows.
+        """
+        table = self.read_node_table(node, columns=columns)
+        yield from table.to_batches(max_chunksize=self.batch_size)
+
+    def return_data(self, node: str) -> ParquetRecords:
+        """
+        Retrieves the record view of a specified node.
+
+        Parameters:
+        - node (str): The name of the node.
+
+        Returns:
+        - ParquetRecords: The node's records.
+        """
+        return self.data_dict[node]
@@ -0,0 +1,237 @@
+from typing import Any, Dict, Iterator, List
+import os
+import re
+import pandas as pd
+import logging
+from .coerce import SchemaCoercer, series_to_list
+from .data_map import LazyDataMap
+from .json_stream import NodeStream, strip_compression
+
+logger = logging.getLogger(__name__)
+
+DELIMITED_EXTENSIONS = ('.tsv', '.csv', '.txt')
+
+# e.g. 'samples.submitter_id' or, for one of several links, 'samples.submitter_id#2'
+_LINK_COLUMN = re.compile(r'^(?P<link>[^.#]+)\.(?P<field>submitter_id|id)(?:#(?P<index>\d+))?$')
+
+
+def _is_delimited_file(file_name: str) -> bool:
+    return strip_compression(file_name).endswith(DELIMITED_EXTENSIONS)
+
+
+def _tsv_node_name(path: str) -> str:
+    file_name = strip_compression(os.path.basename(path))
+    for ext in DELIMITED_EXTENSIONS:
+        if file_name.endswith(ext):
+            return file_name[:-len(ext)]
+    return file_name
+
+
+def _link_plan(columns: List[str]) -> tuple:
+    """
+    Splits the header into plain columns and Gen3 link columns.
+
+    Parameters:
+    - columns (list): The column names of the file.
+
+    Returns:
+    - tuple: The plain column names, and a dictionary mapping each link name to a
+      dictionary of {index: {field: column}}, where index is None for a single link and
+      the '#n' number for a link to several records.
+    """
+    plain = []
+    links = {}
+    for column in columns:
+        match = _LINK_COLUMN.match(str(column))
+        if match is None:
+            plain.append(column)
+            continue
+        index = match.group('index')
+        index = int(index) if index is not None else None
+        links.setdefault(match.group('link'), {}).setdefault(index, {})[match.group('field')] = column
+    return plain, links
+
+
+def format_tsv_chunk(chunk: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Converts a chunk of a Gen3 submission TSV into records. Link columns such as
+    'samples.submitter_id' are nested into {"samples": {"submitter_id": ...}}, and numbered
+    link columns ('samples.submitter_id#1', 'samples.submitter_id#2', ...) into a list of
+    such dictionaries. Empty cells are left out of the record, as they are on submission.
+
+    Parameters:
+    - chunk (pd.DataFrame): The rows of the file.
+
+    Returns:
+    - list: The records of the chunk.
+    """
+    plain, links = _link_plan(list(chunk.columns))
+    columns = {column: series_to_list(chunk[column]) for column in chunk.columns}
+    records = []
+    for row in range(len(chunk)):
+        record = {}
+        for column in plain:
+            value = columns[column][row]
+            if value is not None:
+                record[column] = value
+        for link, indexed in links.items():
+            targets = []
+            for index in sorted(indexed, key=lambda i: -1 if i is None else i):
+                target = {
+                    field: columns[column][row]
+                    for field, column in indexed[index].items()
+                    if columns[column][row] is not None
+                }
+                if target:
+                    targets.append(target)
+            if not targets:
+                continue
+            if len(indexed) == 1 and None in indexed:
+                record[link] = targets[0]
+            else:
+                record[link] = targets
+        records.append(record)
+    return records
+
+
+class ParseTsv:
+    """Parses Gen3 submission TSV (or CSV) files in chunks, and constructs a dictionary representation of the data."""
+
+    def __init__(
+        self, data_folder_path: str = None, data_file_path: str = None, sep: str = None,
+        chunksize: int = 10000, lazy: bool = False, max_cached_nodes: int = None,
+        resolved_schema: dict = None
+    ):
+        """
+        Parameters:
+        - data_folder_path (str, optional): Path to a folder of '.tsv', '.csv' or '.txt'
+          files, one node per file, optionally gzip ('.gz') or Zstandard ('.zst') compressed.
+        - data_file_path (str, optional): Path to a single delimited file.
+        - sep (str, optional): The delimiter. Default is None, which uses ',' for '.csv'
+          files and a tab otherwise.
+        - chunksize (int): The number of rows read at a time. Default is 10000.
+        - lazy (bool): If True, data_dict is a LazyDataMap that reads each node file on
+          first access instead of loading every file up front. Default is False.
+        - max_cached_nodes (int, optional): With lazy=True, the maximum number of parsed
+          nodes kept in memory. Default is None, which keeps every parsed node.
+        - resolved_schema (dict, optional): The resolved gen3 JSON schema. If given, each
+          chunk is coerced to the types declared for the node (see SchemaCoercer) before
+          the records are built. Default is None.
+        """
+        self.folder_path = data_folder_path
+        self.file_path = data_file_path
+        self.sep = sep
+        self.chunksize = chunksize
+        self.lazy = lazy
+        self.coercer = SchemaCoercer(resolved_schema) if resolved_schema is not None else None
+        self.file_path_list = self.list_data_files()
+        self.node_files = {}
+        for path in self.file_path_list:
+            self.node_files.setdefault(_tsv_node_name(path), []).append(path)
+        if self.lazy:
+            self.data_dict = LazyDataMap(
+                self.node_files, loader=self._load_node_records, max_nodes=max_cached_nodes
+            )
+        else:
+            self.data_dict = {
+                node: self._load_node_records(paths) for node, paths in self.node_files.items()
+            }
+        self.data_nodes = list(self.node_files)
+
+    def list_data_files(self) -> list:
+        """
+        Lists all delimited data files in the specified folder or returns the single file path.
+
+        Returns:
+        - list: A list of absolute file paths, sorted by path.
+        """
+        if self.folder_path:
+            return sorted(
+                os.path.abspath(entry.path) for entry in os.scandir(self.folder_path)
+                if entry.is_file() and _is_delimited_file(entry.name)
+            )
+        return [self.file_path]
+
+    def _separator(self, path: str) -> str:
+        if self.sep is not None:
+            return self.sep
+        return ',' if strip_compression(path).endswith('.csv') else '\t'
+
+    def iter_batches(self, path: str) -> Iterator[pd.DataFrame]:
+        """
+        Reads a delimited file in chunks of `chunksize` rows. Every cell is read as text,
+        so IDs keep their leading zeros and a column has the same type in every chunk;
+        pass a resolved schema to have the columns coerced to their declared types. Only
+        empty cells are read as null, so values such as 'NA' or 'null' are kept as strings.
+
+        Parameters:
+        - path (str): The path to the file.
+
+        Yields:
+        - pd.DataFrame: Each chunk of rows, as a column batch.
+        """
+        reader = pd.read_csv(
+            path, sep=self._separator(path), chunksize=self.chunksize, dtype=str,
+            keep_default_na=False, na_values=[''], compression='infer'
+        )
+        with reader:
+            yield from reader
+
+    def iter_records(self, path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Reads the records of a delimited file chunk by chunk, coercing the columns if a
+        resolved schema was given and nesting the link columns.
+
+        Parameters:
+        - path (str): The path to the file.
+
+        Yields:
+        - dict: Each record in the file.
+        """
+        node = _tsv_node_name(path)
+        for chunk in self.iter_batches(path):
+            if self.coercer is not None:
+                chunk = self.coercer.coerce_frame(node, chunk)
+            yield from format_tsv_chunk(chunk)
+
+    def _load_node_records(self, paths: list) -> list:
+        records = []
+        for path in paths:
+            records.extend(self.iter_records(path))
+        logger.info(f"Loaded {len(records)} records from {paths}")
+        return records
+
+    def iter_node(self, node: str) -> NodeStream:
+        """
+        Returns a stream of the records of a node, read from its file(s) one chunk at a time.
+
+        Parameters:
+        - node (str): The name of the node.
+
+        Returns:
+        - NodeStream: A re-iterable stream of the node's records.
+        """
+        return NodeStream(self.node_files[node], opener=self.iter_records)
+
+    def stream_data_map(self) -> dict:
+        """
+        Returns a data map of record streams, one per node, for the validation and linkage
+        stages that consume records one at a time (Validate.validate_schema,
+        Linkage.validate_links_out_of_core).
+
+        Returns:
+        - dict: A dictionary mapping each node name to its NodeStream.
+        """
+        return {node: self.iter_node(node) for node in self.node_files}
+
+    def return_data(self, node: str) -> list:
+        """
+        Retrieves the records of a specified node.
+
+        Parameters:
+        - node (str): The name of the node.
+
+        Returns:
+        - list: The records of the node.
+        """
+        return self.data_dict[node]
@@ -1,11 +1,97 @@
+from concurrent.futures import ProcessPoolExecutor
+import datetime
+from itertools import islice
 import json
 import pandas as pd
 import os
+import time
 import numpy as np
 import logging
+from .coerce import SchemaCoercer, series_to_list
 
 logger = logging.getLogger(__name__)
 
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _json_default(obj):
+    # Types outside JSON are encoded the same way whichever encoder is used
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj) -> bytes:
+    # Unlike json.dump, json.dumps encodes in one shot, so the C encoder is always used
+    return json.dumps(
+        obj, default=_json_default, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_dumps(obj) -> bytes:
+    # Datetimes and numpy scalars go through _json_default, as with the json fallback
+    return orjson.dumps(
+        obj, default=_json_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+# Encodes an object as compact UTF-8 JSON, with orjson if it is installed
+_dumps = _orjson_dumps if orjson is not None else _stdlib_dumps
+
+
+def write_records(records, json_path: str, ndjson: bool = False) -> int:
+    """
+    Writes records to a JSON array file, or one record per line for NDJSON, through a
+    large write buffer. A list is encoded in one call; any other iterable (e.g. records
+    streamed from a workbook) is encoded record by record, with the same output.
+
+    Args:
+        records (list or Iterable[dict]): The records to write.
+        json_path (str): The path to the output file.
+        ndjson (bool): If True, each record is written on its own line. Default is False.
+
+    Returns:
+        int: The number of records written.
+    """
+    with open(json_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+        if isinstance(records, list) and not ndjson:
+            f.write(_dumps(records))
+            return len(records)
+        n_records = 0
+        if not ndjson:
+            f.write(b'[')
+        for record in records:
+            if ndjson:
+                f.write(_dumps(record) + b'\n')
+            else:
+                f.write(b',' + _dumps(record) if n_records else _dumps(record))
+            n_records += 1
+        if not ndjson:
+            f.write(b']')
+        return n_records
+
+
+def _write_sheet(
+    sheet_name: str, df: pd.DataFrame, json_path: str, link_suffix: str, ndjson: bool,
+    resolved_schema: dict = None
+) -> tuple:
+    # Module level so it can run in a process pool; only the sheet's DataFrame is pickled
+    start = time.perf_counter()
+    parser = ParseXlsxMetadata(None, link_suffix=link_suffix, resolved_schema=resolved_schema)
+    records = parser.format_pd_to_json({sheet_name: df}, sheet_name)
+    write_records(records, json_path, ndjson=ndjson)
+    transformations = parser.coercer.transformations if parser.coercer is not None else None
+    return len(records), time.perf_counter() - start, transformations
+
 class ParseXlsxMetadata:
     """
     Converts a specified sheet from the metadata dictionary
@@ -17,31 +103,73 @@ class ParseXlsxMetadata:
         xlsx_path (str): The path to the Excel file containing metadata templates.
         link_suffix (str): A suffix to append to link identifiers, default is 's'.
             e.g. if you name your links as "nodeName_link" you may set this to "_link"
+        skip_rows (int): The number of rows after the header to drop from each sheet.
+        streaming (bool): If True, sheets are read row by row from a read-only openpyxl
+            workbook, with skip_rows applied while reading, instead of loading each sheet
+            fully with pandas and slicing it. XlsxValidationPipeline and stream_to_json
+            then format the rows `chunksize` at a time, without a DataFrame of the whole
+            sheet. Default is False.
+        chunksize (int): The number of rows formatted at a time when streaming. Default
+            is 10000.
+        sheet_names (list, optional): The sheets to load. Default is None, which loads all
+            sheets.
+        workers (int, optional): The number of sheets converted and written concurrently
+            by write_dict_to_json, in a process pool. Default is None, which writes sheets
+            one after another.
+        ndjson (bool): If True, sheets are written as newline delimited JSON ('.jsonl'),
+            one record per line, instead of a JSON array. Default is False.
+        resolved_schema (dict, optional): The resolved gen3 JSON schema. If given, the
+            columns of each sheet are coerced to the types declared for the node (see
+            SchemaCoercer) when the records are formatted. Default is None.
+        coercer (SchemaCoercer or None): Coerces the columns and counts the
+            transformations, if resolved_schema is given.
     """
 
-    def __init__(self, xlsx_path: str, link_suffix: str = 's', skip_rows: int = 0):
+    def __init__(
+        self, xlsx_path: str, link_suffix: str = 's', skip_rows: int = 0,
+        streaming: bool = False, sheet_names: list = None, workers: int = None,
+        ndjson: bool = False, resolved_schema: dict = None, chunksize: int = 10000
+    ):
         self.xlsx_path = xlsx_path
         self.skip_rows = skip_rows
         self.xlsx_data_dict = None
         self.link_suffix = link_suffix
+        self.streaming = streaming
+        self.sheet_names = sheet_names
+        self.workers = workers
+        self.ndjson = ndjson
+        self.resolved_schema = resolved_schema
+        self.chunksize = chunksize
+        self.coercer = SchemaCoercer(resolved_schema) if resolved_schema is not None else None
 
     def parse_metadata_template(self) -> dict:
         """
         Parses an Excel file and converts each sheet into a DataFrame.
 
         This function reads an Excel file specified by the `xlsx_path` and loads
-        each sheet into a dictionary where the keys are the sheet names and the
-        values are the DataFrames representing the data in those sheets. The first
-        few rows of each DataFrame are removed based on the `skip_rows` attribute.
+        each sheet (or only the sheets in `sheet_names`) into a dictionary where the
+        keys are the sheet names and the values are the DataFrames representing the
+        data in those sheets. The first few rows of each DataFrame are removed based
+        on the `skip_rows` attribute, and the remaining rows keep their original
+        index. With `streaming` set, the rows are read from a read-only workbook and
+        skipped rows are never loaded.
 
         Returns:
             dict: A dictionary where each key is a sheet name and each value is a
             DataFrame containing the data from that sheet, with the specified number
             of rows removed.
         """
+        if self.streaming:
+            pd_dict = self._read_streaming()
+            self.xlsx_data_dict = pd_dict
+            return pd_dict
+
         try:
             # load xlsx file
-            pd_dict = pd.read_excel(self.xlsx_path, sheet_name=None)
+            if self.sheet_names is None:
+                pd_dict = pd.read_excel(self.xlsx_path, sheet_name=None)
+            else:
+                pd_dict = pd.read_excel(self.xlsx_path, sheet_name=list(self.sheet_names))
             logger.info(f"Excel file {self.xlsx_path} loaded successfully.")
         except Exception as e:
             logger.error(f"Failed to load Excel file {self.xlsx_path}: {e}")
@@ -57,6 +185,188 @@ class ParseXlsxMetadata:
 
         return pd_dict
 
+    def _open_workbook(self):
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise ImportError(
+                "Streaming Excel files requires the 'openpyxl' package: pip install openpyxl"
+            ) from e
+        return load_workbook(self.xlsx_path, read_only=True, data_only=True)
+
+    def iter_sheet_rows(self, sheet_name: str, workbook=None):
+        """
+        Streams the rows of a sheet from a read-only workbook, as dictionaries keyed by
+        the header row, with duplicate column names renamed as pandas does ('a', 'a.1').
+        The `skip_rows` rows after the header are skipped while reading. Empty rows
+        inside the sheet are kept, as with pd.read_excel, and empty rows at the end are
+        dropped.
+
+        Args:
+            sheet_name (str): The name of the sheet.
+            workbook (optional): An open read-only openpyxl workbook. Defaults to None,
+                which opens (and closes) the workbook at `xlsx_path`.
+
+        Yields:
+            dict: Each data row, mapping column name to cell value.
+        """
+        close = workbook is None
+        if workbook is None:
+            workbook = self._open_workbook()
+        try:
+            header, rows = self._sheet_rows(workbook[sheet_name])
+            for row in rows:
+                yield dict(zip(header, row))
+        finally:
+            if close:
+                workbook.close()
+
+    @staticmethod
+    def _dedup_header(header: list) -> list:
+        # Renames duplicate columns the way pandas does ('a', 'a.1', ...), skipping names
+        # that are already taken; unnamed columns are renamed last, as in pandas
+        header = list(header)
+        counts = {}
+        unnamed = [idx for idx, col in enumerate(header) if str(col).startswith('Unnamed: ')]
+        order = [idx for idx in range(len(header)) if idx not in unnamed] + unnamed
+        for idx in order:
+            col = old_col = header[idx]
+            cur_count = counts.get(col, 0)
+            while cur_count > 0:
+                counts[old_col] = cur_count + 1
+                col = f"{old_col}.{cur_count}"
+                cur_count = cur_count + 1 if col in header else counts.get(col, 0)
+            header[idx] = col
+            counts[col] = cur_count + 1
+        return header
+
+    @staticmethod
+    def _drop_trailing_empty_rows(rows):
+        # Empty rows inside the sheet are kept (as pandas does), so row positions match;
+        # only the empty rows at the end, which openpyxl reports for formatted cells, are dropped
+        pending = []
+        for row in rows:
+            if any(value is not None for value in row):
+                yield from pending
+                pending.clear()
+                yield row
+            else:
+                pending.append(row)
+
+    def _sheet_rows(self, worksheet) -> tuple:
+        rows = worksheet.iter_rows(values_only=True)
+        header_row = list(next(rows, ()))
+        while header_row and header_row[-1] is None:
+            header_row.pop()
+        header = self._dedup_header([
+            value if value is not None else f"Unnamed: {idx}"
+            for idx, value in enumerate(header_row)
+        ])
+        data_rows = worksheet.iter_rows(
+            min_row=2 + self.skip_rows, max_col=len(header) or None, values_only=True
+        )
+        return header, self._drop_trailing_empty_rows(data_rows)
+
+    def _selected_sheets(self, workbook) -> list:
+        return list(workbook.sheetnames) if self.sheet_names is None else list(self.sheet_names)
+
+    def iter_sheet_chunks(self, sheet_name: str, workbook=None):
+        """
+        Streams a sheet from a read-only workbook as DataFrames of at most `chunksize`
+        rows. The rows keep their position in the sheet as index, the same index
+        pd.read_excel followed by slicing off `skip_rows` gives, and empty cells are NaN.
+        The columns hold the cell values as stored (object dtype), so the records do
+        not depend on how the rows are chunked; unlike pd.read_excel, whole numbers in
+        a column with empty cells are not turned into floats. A sheet without data rows
+        yields a single empty DataFrame with the sheet's columns.
+
+        Args:
+            sheet_name (str): The name of the sheet.
+            workbook (optional): An open read-only openpyxl workbook. Defaults to None,
+                which opens (and closes) the workbook at `xlsx_path`.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the sheet's data rows.
+        """
+        close = workbook is None
+        if workbook is None:
+            workbook = self._open_workbook()
+        try:
+            header, rows = self._sheet_rows(workbook[sheet_name])
+            start = self.skip_rows
+            while True:
+                batch = list(islice(rows, self.chunksize))
+                if not batch and start > self.skip_rows:
+                    return
+                df = pd.DataFrame(
+                    batch, columns=header, index=pd.RangeIndex(start, start + len(batch)),
+                    dtype=object
+                )
+                # Empty cells are NaN, as with pd.read_excel
+                yield df.where(df.notna(), np.nan)
+                if len(batch) < self.chunksize:
+                    return
+                start += len(batch)
+        finally:
+            if close:
+                workbook.close()
+
+    def iter_sheet_records(self, sheet_name: str, workbook=None):
+        """
+        Streams the formatted records of a sheet (see format_pd_to_json), formatting
+        the rows `chunksize` at a time, so neither the sheet's whole DataFrame nor its
+        full list of records is held in memory.
+
+        Args:
+            sheet_name (str): The name of the sheet.
+            workbook (optional): An open read-only openpyxl workbook. Defaults to None,
+                which opens (and closes) the workbook at `xlsx_path`.
+
+        Yields:
+            dict: Each formatted record.
+        """
+        for chunk in self.iter_sheet_chunks(sheet_name, workbook=workbook):
+            yield from self.format_pd_to_json({sheet_name: chunk}, sheet_name)
+
+    def _open_streaming(self):
+        try:
+            workbook = self._open_workbook()
+            logger.info(f"Excel file {self.xlsx_path} opened in read-only mode.")
+        except Exception as e:
+            logger.error(f"Failed to load Excel file {self.xlsx_path}: {e}")
+            raise
+        return workbook
+
+    def iter_workbook_records(self):
+        """
+        Streams the formatted records of each (selected) sheet from one read-only
+        workbook, which is closed once every sheet has been read. Each sheet's records
+        must be consumed before moving on to the next sheet.
+
+        Yields:
+            tuple: The sheet name and an iterator over its records (see
+            iter_sheet_records).
+        """
+        workbook = self._open_streaming()
+        try:
+            for sheet_name in self._selected_sheets(workbook):
+                yield sheet_name, self.iter_sheet_records(sheet_name, workbook=workbook)
+        finally:
+            workbook.close()
+
+    def _read_streaming(self) -> dict:
+        workbook = self._open_streaming()
+        pd_dict = {}
+        try:
+            for sheet_name in self._selected_sheets(workbook):
+                chunks = list(self.iter_sheet_chunks(sheet_name, workbook=workbook))
+                # The column types are inferred over the whole sheet, as with pd.read_excel
+                pd_dict[sheet_name] = pd.concat(chunks).infer_objects()
+                logger.debug(f"Streamed {len(pd_dict[sheet_name])} rows from sheet {sheet_name}.")
+        finally:
+            workbook.close()
+        return pd_dict
+
     def get_sheet_names(self) -> list:
         """
         Retrieves the names of all sheets in the Excel file.
@@ -95,6 +405,13 @@ class ParseXlsxMetadata:
     def format_pd_to_json(self, xlsx_data_dict: dict, sheet_name: str) -> list:
         """formats the pandas data frame into a specific json format
 
+        The records are built in a single pass from the column arrays, without copying
+        the DataFrame: null values (NaN, NaT) become None and the foreign key is wrapped
+        as {"submitter_id": ...} per column, then each row is zipped into a dictionary.
+        The added 'type', 'key_fk', 'key_pk', link and 'submitter_id' keys follow the
+        sheet's columns, and '_uid' columns are dropped. With a resolved schema, the
+        columns are first coerced to the types declared for the sheet's node.
+
         Args:
             xlsx_data_dict (dict): A dictionary where each key is a sheet name and each
             value is a DataFrame.
@@ -107,21 +424,29 @@ class ParseXlsxMetadata:
             pk, fk = self.get_pk_fk_pairs(xlsx_data_dict, sheet_name)
 
             df = xlsx_data_dict[sheet_name]
-            df = df.replace({np.nan: None, pd.NaT: None})
-            df['type'] = sheet_name  # add node / entity name
+            if self.coercer is not None:
+                df = self.coercer.coerce_frame(sheet_name, df)
+            n_rows = len(df)
+            columns = {
+                column: series_to_list(df[column]) for column in df.columns
+            }
             fk_name = fk.split('_uid')[0]  # getting foreign key node name
 
-            df['key_fk'] = df[fk].tolist()  # creating var for fk
-            df['key_pk'] = df[pk].tolist()  # creating var for pk
-
+            columns['type'] = [sheet_name] * n_rows  # add node / entity name
+            columns['key_fk'] = columns[fk]  # creating var for fk
+            columns['key_pk'] = columns[pk]  # creating var for pk
             # format foreign key
-            df[f"{fk_name}{self.link_suffix}"] = df[fk].apply(lambda x: {"submitter_id": x})
-            df_cleaned = df.where(pd.notnull(df), None)  # removing NaN values
+            columns[f"{fk_name}{self.link_suffix}"] = [{"submitter_id": x} for x in columns[fk]]
             # adding primary key as submitter_id key
-            df_cleaned['submitter_id'] = df_cleaned[pk].tolist()
+            columns['submitter_id'] = columns[pk]
             # removing _uid columns
-            df_cleaned = df_cleaned.loc[:, ~df_cleaned.columns.str.endswith('_uid')]
-            data_list = df_cleaned.to_dict(orient='records')  # converting to dict
+            keys = [
+                key for key in columns
+                if not (isinstance(key, str) and key.endswith('_uid'))
+            ]
+            data_list = [
+                dict(zip(keys, row)) for row in zip(*(columns[key] for key in keys))
+            ]
             return data_list
         except Exception as e:
             logger.error(f"Failed to convert sheet {sheet_name} to JSON: {e}")
@@ -130,7 +455,8 @@ class ParseXlsxMetadata:
 
     def pd_to_json(self, xlsx_data_dict: dict, sheet_name: str, json_path: str) -> None:
         """
-        Writes a list of json objects to a json file
+        Writes a list of json objects to a json file (or an NDJSON file if `ndjson` is
+        set), with a fast encoder and a buffered write.
 
         Args:
             xlsx_data_dict (dict): A dictionary where each key is a sheet name and each
@@ -142,17 +468,24 @@ class ParseXlsxMetadata:
             None
         """
         try:
+            start = time.perf_counter()
             data_list = self.format_pd_to_json(xlsx_data_dict, sheet_name)
-            with open(json_path, 'w') as f:
-                json.dump(data_list, f)
-            logger.info(f"Sheet {sheet_name} converted to JSON and saved to {json_path}.")
+            write_records(data_list, json_path, ndjson=self.ndjson)
+            logger.info(
+                f"Sheet {sheet_name} converted to JSON and saved to {json_path} "
+                f"({len(data_list)} records in {time.perf_counter() - start:.2f}s)."
+            )
         except Exception as e:
             logger.error(f"Failed to convert sheet {sheet_name} to JSON: {e}")
             raise
 
     def write_dict_to_json(self, xlsx_data_dict: dict, output_dir: str) -> None:
         """
-        Writes a dictionary of pandas DataFrames to JSON files.
+        Writes a dictionary of pandas DataFrames to JSON files, named
+        '<sheet_name>.json' (or '<sheet_name>.jsonl' if `ndjson` is set).
+
+        With `workers` set, the sheets are converted and written in a process pool, and
+        the time taken by each sheet is logged.
 
         Args:
             xlsx_data_dict (dict): The dictionary containing DataFrames to be written to JSON files.
@@ -165,12 +498,65 @@ class ParseXlsxMetadata:
             if not os.path.exists(output_dir):
                 os.makedirs(output_dir)
                 logger.info(f"Created output directory: {output_dir}")
-            
-            for key, value in xlsx_data_dict.items():
-                json_path = f"{output_dir}/{key}.json"
-                self.pd_to_json(xlsx_data_dict, key, json_path)
+
+            extension = 'jsonl' if self.ndjson else 'json'
+            json_paths = {key: f"{output_dir}/{key}.{extension}" for key in xlsx_data_dict}
+            if self.workers and self.workers > 1 and len(xlsx_data_dict) > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    futures = {
+                        key: executor.submit(
+                            _write_sheet, key, value, json_paths[key], self.link_suffix,
+                            self.ndjson, self.resolved_schema
+                        )
+                        for key, value in xlsx_data_dict.items()
+                    }
+                    for key, future in futures.items():
+                        try:
+                            n_records, elapsed, transformations = future.result()
+                        except Exception as e:
+                            logger.error(f"Failed to convert sheet {key} to JSON: {e}")
+                            raise
+                        if transformations:
+                            self.coercer.transformations.update(transformations)
+                        logger.info(
+                            f"Sheet {key} converted to JSON and saved to {json_paths[key]} "
+                            f"({n_records} records in {elapsed:.2f}s)."
+                        )
+            else:
+                for key in xlsx_data_dict:
+                    self.pd_to_json(xlsx_data_dict, key, json_paths[key])
 
             logger.info(f"JSON files written to {output_dir}")
         except Exception as e:
             logger.error(f"Failed to write JSON files to {output_dir}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def stream_to_json(self, output_dir: str) -> None:
+        """
+        Writes each (selected) sheet of the workbook to '<sheet_name>.json' (or
+        '<sheet_name>.jsonl' if `ndjson` is set), streaming the rows from a read-only
+        workbook and formatting them `chunksize` at a time (see iter_sheet_records).
+        The files hold the same records as those written by write_dict_to_json, but no
+        sheet is loaded into a DataFrame as a whole.
+
+        Args:
+            output_dir (str): The directory where JSON files will be created.
+
+        Returns:
+            None
+        """
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            extension = 'jsonl' if self.ndjson else 'json'
+            for sheet_name, records in self.iter_workbook_records():
+                start = time.perf_counter()
+                json_path = f"{output_dir}/{sheet_name}.{extension}"
+                n_records = write_records(records, json_path, ndjson=self.ndjson)
+                logger.info(
+                    f"Sheet {sheet_name} converted to JSON and saved to {json_path} "
+                    f"({n_records} records in {time.perf_counter() - start:.2f}s)."
+                )
+            logger.info(f"JSON files written to {output_dir}")
+        except Exception as e:
+            logger.error(f"Failed to write JSON files to {output_dir}: {e}")
+            raise
@@ -0,0 +1,168 @@
+from typing import Any, Dict, List
+import os
+import logging
+from .parsers.parse_xlsx import ParseXlsxMetadata, write_records
+from .validate import Validate
+from .linkage import Linkage
+
+logger = logging.getLogger(__name__)
+
+
+class XlsxValidationPipeline:
+    """
+    Validates a metadata workbook in memory, without writing and re-reading JSON files.
+
+    The usual workflow writes every sheet to JSON with ParseXlsxMetadata.write_dict_to_json
+    and reads the files back with ParseData before validation. This pipeline formats each
+    sheet's DataFrame into records once, and passes the resulting data map straight to
+    Validate and Linkage. Writing the JSON files is an optional side output.
+
+    Attributes:
+        parser (ParseXlsxMetadata): The workbook parser.
+        resolved_schema (dict): The resolved gen3 JSON schema to validate against.
+        root_node (List[str]): Root node names passed to Linkage. Defaults to ['subject'].
+        xlsx_data_dict (dict or None): The DataFrame of each sheet.
+        data_map (dict or None): The records of each sheet, keyed by sheet (node) name.
+        validate (Validate or None): The Validate instance of the last run.
+        linkage (Linkage or None): The Linkage instance of the last run.
+        link_config (dict or None): The linkage config generated in the last run.
+    """
+
+    def __init__(
+        self, parser: ParseXlsxMetadata, resolved_schema: dict, root_node: List[str] = None
+    ):
+        if resolved_schema is None:
+            logger.error("Provided resolved_schema is None.")
+            raise ValueError("resolved_schema cannot be None.")
+        self.parser = parser
+        self.resolved_schema = resolved_schema
+        self.root_node = root_node if root_node is not None else ['subject']
+        self.xlsx_data_dict = None
+        self.data_map = None
+        self.validate = None
+        self.linkage = None
+        self.link_config = None
+
+    @classmethod
+    def from_xlsx(
+        cls, xlsx_path: str, resolved_schema: dict, root_node: List[str] = None, **parser_kwargs
+    ) -> "XlsxValidationPipeline":
+        """
+        Creates a pipeline for a workbook file.
+
+        Args:
+            xlsx_path (str): The path to the Excel file.
+            resolved_schema (dict): The resolved gen3 JSON schema.
+            root_node (List[str], optional): Root node names. Defaults to ['subject'].
+            **parser_kwargs: Passed to ParseXlsxMetadata (e.g. link_suffix, skip_rows,
+                streaming, sheet_names).
+
+        Returns:
+            XlsxValidationPipeline: The pipeline.
+        """
+        return cls(ParseXlsxMetadata(xlsx_path, **parser_kwargs), resolved_schema, root_node=root_node)
+
+    @classmethod
+    def from_dataframes(
+        cls, xlsx_data_dict: dict, resolved_schema: dict, root_node: List[str] = None,
+        link_suffix: str = 's'
+    ) -> "XlsxValidationPipeline":
+        """
+        Creates a pipeline for DataFrames that are already loaded, e.g. by
+        ParseXlsxMetadata.parse_metadata_template.
+
+        Args:
+            xlsx_data_dict (dict): A dictionary mapping each sheet name to its DataFrame.
+            resolved_schema (dict): The resolved gen3 JSON schema.
+            root_node (List[str], optional): Root node names. Defaults to ['subject'].
+            link_suffix (str, optional): The link suffix. Defaults to 's'.
+
+        Returns:
+            XlsxValidationPipeline: The pipeline.
+        """
+        parser = ParseXlsxMetadata(None, link_suffix=link_suffix)
+        parser.xlsx_data_dict = xlsx_data_dict
+        pipeline = cls(parser, resolved_schema, root_node=root_node)
+        pipeline.xlsx_data_dict = xlsx_data_dict
+        return pipeline
+
+    def build_data_map(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Formats the records of every sheet, parsing the workbook first if needed. With
+        the parser's `streaming` set, the records are formatted from the workbook's rows
+        in chunks (see ParseXlsxMetadata.iter_sheet_records), and xlsx_data_dict is left
+        unset.
+
+        Returns:
+            dict: A dictionary mapping each sheet name to its list of records.
+        """
+        if self.xlsx_data_dict is None and self.parser.streaming:
+            self.data_map = {
+                sheet_name: list(records)
+                for sheet_name, records in self.parser.iter_workbook_records()
+            }
+            logger.info(f"Built in-memory data map for sheets: {list(self.data_map)}")
+            return self.data_map
+        if self.xlsx_data_dict is None:
+            self.xlsx_data_dict = self.parser.parse_metadata_template()
+        self.data_map = {
+            sheet_name: self.parser.format_pd_to_json(self.xlsx_data_dict, sheet_name)
+            for sheet_name in self.xlsx_data_dict
+        }
+        logger.info(f"Built in-memory data map for sheets: {list(self.data_map)}")
+        return self.data_map
+
+    def write_json(self, output_dir: str) -> None:
+        """
+        Writes the records of each sheet to '<output_dir>/<sheet_name>.json' (or '.jsonl'
+        if the parser's `ndjson` is set), the same files as
+        ParseXlsxMetadata.write_dict_to_json, without formatting them again.
+
+        Args:
+            output_dir (str): The directory where the JSON files will be created.
+        """
+        if self.data_map is None:
+            self.build_data_map()
+        os.makedirs(output_dir, exist_ok=True)
+        extension = 'jsonl' if self.parser.ndjson else 'json'
+        for sheet_name, records in self.data_map.items():
+            json_path = f"{output_dir}/{sheet_name}.{extension}"
+            write_records(records, json_path, ndjson=self.parser.ndjson)
+            logger.info(f"Sheet {sheet_name} saved to {json_path}.")
+
+    def run(self, output_dir: str = None, check_links: bool = True) -> dict:
+        """
+        Runs schema validation and, optionally, link validation on the workbook.
+
+        Args:
+            output_dir (str, optional): If given, the JSON files are also written to this
+                directory. Defaults to None.
+            check_links (bool, optional): If True, a linkage config is generated and the
+                links are validated. Defaults to True.
+
+        Returns:
+            dict: A dictionary with 'validation_result' (as returned by
+            Validate.validate_schema), and 'link_config' and 'link_validation_result'
+            (None when check_links is False).
+        """
+        if self.data_map is None:
+            self.build_data_map()
+        if output_dir is not None:
+            self.write_json(output_dir)
+
+        self.validate = Validate(self.data_map, self.resolved_schema)
+        validation_result = self.validate.validate_schema()
+
+        link_validation_result = None
+        if check_links:
+            self.linkage = Linkage(root_node=self.root_node, link_suffix=self.parser.link_suffix)
+            self.link_config = self.linkage.generate_config(self.data_map)
+            link_validation_result = self.linkage.validate_links(
+                self.data_map, self.link_config, root_node=self.root_node
+            )
+
+        return {
+            "validation_result": validation_result,
+            "link_config": self.link_config,
+            "link_validation_result": link_validation_result,
+        }
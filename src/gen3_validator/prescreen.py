@@ -0,0 +1,157 @@
+from typing import Dict, Any, List, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Prescreen:
+    """
+    The Prescreen class performs a fast, key-level check of data against a resolved
+    gen3 JSON schema before (or instead of) full jsonschema validation. For every node
+    in the resolved schema it precomputes the set of allowed properties and the set of
+    required keys, then compares each record's key set (or a table's column headers)
+    with plain set operations to report unknown and missing properties in bulk.
+
+    Attributes:
+        resolved_schema (dict): The resolved gen3 JSON schema, keyed by '<node>.yaml'.
+        link_suffix (str): The suffix of the '<node><link_suffix>' link alias. ParseData
+            only writes the alias into the records with materialize_links=True (Linkage
+            otherwise resolves it to the submitter_id), so it is allowed but never
+            required, and never reported as unknown. Defaults to 's'.
+        key_sets (dict): A dictionary where each key is a node name and the value is a
+            dictionary with 'allowed' and 'required' frozensets, plus an 'open' flag that
+            is True when the schema allows additional properties.
+        prescreen_result (dict or None): Stores the result of the last prescreen_data_map call.
+    """
+
+    def __init__(self, resolved_schema: dict, link_suffix: str = 's'):
+        if resolved_schema is None:
+            logger.error("Provided resolved_schema is None.")
+            raise ValueError("resolved_schema cannot be None.")
+        self.resolved_schema = resolved_schema
+        self.link_suffix = link_suffix
+        self.key_sets = self.build_key_sets()
+        self.prescreen_result = None
+        logger.info("Prescreen class initialised.")
+
+    def build_key_sets(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Precomputes the allowed and required key sets for each node in the resolved schema.
+
+        Returns:
+            dict: A dictionary mapping each node name to a dictionary with the keys
+            'allowed' (frozenset), 'required' (frozenset) and 'open' (bool).
+        """
+        key_sets = {}
+        for schema_key, schema in self.resolved_schema.items():
+            if not isinstance(schema, dict) or "properties" not in schema:
+                continue
+            node = schema_key[:-5] if schema_key.endswith('.yaml') else schema_key
+            allowed = {k for k in schema["properties"].keys() if k != "$ref"}
+            allowed.add(f"{node}{self.link_suffix}")
+            key_sets[node] = {
+                "allowed": frozenset(allowed),
+                "required": frozenset(schema.get("required", [])),
+                "open": schema.get("additionalProperties", True) is not False,
+            }
+        logger.info(f"Built prescreen key sets for {len(key_sets)} nodes.")
+        return key_sets
+
+    def prescreen_keys(self, node: str, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Compares a collection of keys against the allowed and required keys of a node.
+
+        Args:
+            node (str): The name of the node, e.g. 'sample'.
+            keys (Iterable[str]): The keys of a record, or the column headers of a table.
+
+        Returns:
+            dict: A dictionary with the sorted lists 'unknown_properties' and
+            'missing_required'.
+
+        Raises:
+            KeyError: If the node is not present in the resolved schema.
+        """
+        if node not in self.key_sets:
+            msg = f"Node '{node}' not found in resolved schema."
+            logger.error(msg)
+            raise KeyError(msg)
+
+        node_keys = self.key_sets[node]
+        keys = keys if isinstance(keys, (set, frozenset)) else set(keys)
+        unknown = [] if node_keys["open"] else sorted(keys - node_keys["allowed"])
+        missing = sorted(node_keys["required"] - keys)
+        return {"unknown_properties": unknown, "missing_required": missing}
+
+    def prescreen_records(self, node: str, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Prescreens every record of a node and returns the records that failed.
+
+        Records that share the same key set are only compared once, so the cost of the
+        set operations is paid per distinct key signature rather than per record.
+
+        Args:
+            node (str): The name of the node, e.g. 'sample'.
+            records (Iterable[dict]): The records for the node.
+
+        Returns:
+            list: A list of dictionaries with the keys 'index', 'unknown_properties' and
+            'missing_required', one for each record with at least one finding.
+        """
+        signature_cache = {}
+        failures = []
+        for idx, record in enumerate(records):
+            signature = frozenset(record.keys())
+            result = signature_cache.get(signature)
+            if result is None:
+                result = self.prescreen_keys(node, signature)
+                signature_cache[signature] = result
+            if result["unknown_properties"] or result["missing_required"]:
+                failures.append({"index": idx, **result})
+        logger.info(
+            f"Prescreened node '{node}': {len(failures)} records with key errors "
+            f"across {len(signature_cache)} distinct key sets."
+        )
+        return failures
+
+    def prescreen_columns(self, node: str, columns: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Prescreens the column headers of tabular input for a node. This is a single set
+        comparison, regardless of the number of rows in the table.
+
+        Args:
+            node (str): The name of the node, e.g. 'sample'.
+            columns (Iterable[str]): The column headers, e.g. DataFrame.columns.
+
+        Returns:
+            dict: A dictionary with the sorted lists 'unknown_properties' and
+            'missing_required'.
+        """
+        result = self.prescreen_keys(node, columns)
+        logger.info(
+            f"Prescreened columns for node '{node}': "
+            f"{len(result['unknown_properties'])} unknown, "
+            f"{len(result['missing_required'])} missing."
+        )
+        return result
+
+    def prescreen_data_map(self, data_map: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Prescreens every node in the data map that is present in the resolved schema.
+
+        Args:
+            data_map (dict): A dictionary where each key is an entity name and the value is
+                a list of records for that entity.
+
+        Returns:
+            dict: A dictionary mapping each entity name to the list of failed records, as
+            returned by prescreen_records.
+        """
+        results = {}
+        for node in data_map.keys():
+            if node not in self.key_sets:
+                logger.warning(f"Warning: {node} not found in resolved schema keys.")
+                continue
+            results[node] = self.prescreen_records(node, data_map[node])
+        self.prescreen_result = results
+        return results
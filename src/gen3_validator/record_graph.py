@@ -0,0 +1,236 @@
+from typing import Dict, Any, List
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class RecordGraph:
+    """
+    A record-level graph over a data map, used to find records that are not connected
+    to any root node record (e.g. a subject), even when each of their own links resolves.
+
+    Every record gets an integer ID, and the child -> parent links are stored as NumPy
+    arrays in compressed sparse row (CSR) form, indexed by parent. Reachability is a
+    level-synchronous breadth first search from all root node records, where each level
+    is expanded with array operations, so the graph scales to millions of records.
+
+    Attributes:
+        root_node (List[str]): Names of the root node entities whose records start the
+            search. Defaults to ['subject'].
+        key_field (str): The record field holding the record's key. Defaults to 'submitter_id'.
+        link_suffix (str): The suffix of link field names, used to find the entity a link
+            field points to ('subjects' -> 'subject') when the config does not name it.
+            Defaults to 's'.
+        entities (List[str]): The entity names, in data map order.
+        offsets (np.ndarray): The first record ID of each entity; entity i holds the IDs
+            offsets[i] to offsets[i + 1] - 1.
+        indptr (np.ndarray): CSR row pointers; the children of record ID p are
+            indices[indptr[p]:indptr[p + 1]].
+        indices (np.ndarray): CSR column indices (child record IDs).
+        depth (np.ndarray or None): The depth of each record below the root records after
+            find_orphans, or -1 for unreachable records.
+        orphan_results (dict or None): Stores the result of the last find_orphans call.
+    """
+
+    def __init__(
+        self, root_node: List[str] = None, key_field: str = 'submitter_id', link_suffix: str = 's'
+    ):
+        if root_node is None:
+            root_node = ['subject']
+        self.root_node = root_node
+        self.key_field = key_field
+        self.link_suffix = link_suffix
+        self.entities = []
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.keys = []
+        self.depth = None
+        self.orphan_results = None
+        logger.debug(f"Initialized RecordGraph with root_node: {self.root_node}")
+
+    @staticmethod
+    def _link_keys(value: Any) -> List[Any]:
+        if isinstance(value, dict):
+            return [value['submitter_id']] if 'submitter_id' in value else []
+        if isinstance(value, list):
+            return [v['submitter_id'] for v in value if isinstance(v, dict) and 'submitter_id' in v]
+        return []
+
+    def build(
+        self, data_map: Dict[str, List[Dict[str, Any]]], config: Dict[str, Any] = None
+    ) -> "RecordGraph":
+        """
+        Builds the graph from a data map.
+
+        Args:
+            data_map (Dict[str, List[Dict[str, Any]]]): Contains the data for each entity.
+            config (Dict[str, Any], optional): A linkage config as generated by
+                Linkage.generate_config. If given, only the 'foreign_key' field(s) of each
+                entity are followed. Defaults to None, which follows every field holding a
+                {"submitter_id": ...} link.
+
+        Keys are matched within the entity a link points to: the entity whose config
+        'primary_key' is the link field, or else the entity named by the field
+        ('<node><link_suffix>'). For any other field, a key is only followed if a single
+        entity has it. Unhashable key values are skipped and counted.
+
+        Returns:
+            RecordGraph: The graph itself, for chaining.
+        """
+        self.entities = list(data_map.keys())
+        sizes = [len(data_map[entity]) for entity in self.entities]
+        self.offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+        n_records = int(self.offsets[-1])
+
+        # (entity, record key) -> record ID; keys are only unique within an entity
+        self.keys = [None] * n_records
+        key_to_id = {}
+        key_entities = {}
+        unhashable = 0
+        for entity_idx, entity in enumerate(self.entities):
+            base = int(self.offsets[entity_idx])
+            for idx, record in enumerate(data_map[entity]):
+                key = record.get(self.key_field)
+                self.keys[base + idx] = key
+                if key is None:
+                    continue
+                if not _is_hashable(key):
+                    unhashable += 1
+                    continue
+                if (entity, key) in key_to_id:
+                    logger.warning(f"Duplicate key '{key}' in entity '{entity}', keeping the first record.")
+                    continue
+                key_to_id[(entity, key)] = base + idx
+                key_entities.setdefault(key, []).append(entity)
+
+        # Link field -> target entity, from the config's primary keys, then the
+        # '<node><link_suffix>' naming convention
+        field_targets = {f"{entity}{self.link_suffix}": entity for entity in self.entities}
+        if config is not None:
+            for entity, entity_config in config.items():
+                pk = entity_config.get('primary_key') if isinstance(entity_config, dict) else None
+                if pk is not None and entity in data_map:
+                    field_targets[pk] = entity
+
+        # Child -> parent edges
+        children = []
+        parents = []
+        ambiguous = 0
+        for entity_idx, entity in enumerate(self.entities):
+            base = int(self.offsets[entity_idx])
+            fields = None
+            if config is not None and entity in config:
+                fields = config[entity].get('foreign_key')
+                if fields is None:
+                    fields = []
+                elif not isinstance(fields, list):
+                    fields = [fields]
+            for idx, record in enumerate(data_map[entity]):
+                items = (
+                    ((field, record.get(field)) for field in fields)
+                    if fields is not None else record.items()
+                )
+                for field, value in items:
+                    target = field_targets.get(field)
+                    for key in self._link_keys(value):
+                        if not _is_hashable(key):
+                            unhashable += 1
+                            continue
+                        if target is None:
+                            # Unknown link field: only follow keys owned by a single entity
+                            owners = key_entities.get(key, ())
+                            if len(owners) > 1:
+                                ambiguous += 1
+                                continue
+                            parent_id = key_to_id.get((owners[0], key)) if owners else None
+                        else:
+                            parent_id = key_to_id.get((target, key))
+                        if parent_id is not None:
+                            children.append(base + idx)
+                            parents.append(parent_id)
+
+        if unhashable:
+            logger.warning(f"Skipped {unhashable} unhashable key values while building the record graph.")
+        if ambiguous:
+            logger.warning(
+                f"Skipped {ambiguous} links whose key is shared by several entities and whose "
+                f"field does not name a target entity."
+            )
+
+        children = np.asarray(children, dtype=np.int64)
+        parents = np.asarray(parents, dtype=np.int64)
+        order = np.argsort(parents, kind='stable')
+        self.indices = children[order]
+        self.indptr = np.concatenate((
+            [0], np.cumsum(np.bincount(parents, minlength=n_records))
+        )).astype(np.int64)
+        logger.info(f"Built record graph with {n_records} records and {len(children)} links.")
+        return self
+
+    def _expand(self, frontier: np.ndarray) -> np.ndarray:
+        # Gather the CSR rows of all frontier records in one vectorized step
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int64)
+        row_starts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return self.indices[np.arange(total, dtype=np.int64) + row_starts]
+
+    def find_orphans(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Runs a breadth first search from all root node records and reports, per entity,
+        the records that cannot be reached, together with the depth of the reachable ones.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: A dictionary mapping each entity to a dictionary with
+            'n_records', 'n_reachable', 'orphans' (list of dictionaries with the record
+            'index' and 'key'), and 'depth' (dictionary mapping each depth to the number of
+            reachable records at that depth; root records have depth 0).
+        """
+        n_records = int(self.offsets[-1])
+        depth = np.full(n_records, -1, dtype=np.int64)
+        root_ids = [
+            np.arange(self.offsets[i], self.offsets[i + 1], dtype=np.int64)
+            for i, entity in enumerate(self.entities) if entity in self.root_node
+        ]
+        frontier = np.concatenate(root_ids) if root_ids else np.zeros(0, dtype=np.int64)
+        depth[frontier] = 0
+        level = 0
+        while frontier.size:
+            reached = self._expand(frontier)
+            reached = np.unique(reached[depth[reached] < 0])
+            level += 1
+            depth[reached] = level
+            frontier = reached
+        self.depth = depth
+
+        results = {}
+        for entity_idx, entity in enumerate(self.entities):
+            start, end = int(self.offsets[entity_idx]), int(self.offsets[entity_idx + 1])
+            entity_depth = depth[start:end]
+            orphan_idx = np.flatnonzero(entity_depth < 0)
+            levels, counts = np.unique(entity_depth[entity_depth >= 0], return_counts=True)
+            results[entity] = {
+                "n_records": end - start,
+                "n_reachable": int(end - start - orphan_idx.size),
+                "orphans": [
+                    {"index": int(idx), "key": self.keys[start + int(idx)]} for idx in orphan_idx
+                ],
+                "depth": {int(lvl): int(cnt) for lvl, cnt in zip(levels, counts)},
+            }
+            if orphan_idx.size:
+                logger.warning(f"Entity '{entity}' has {orphan_idx.size} orphaned records.")
+
+        self.orphan_results = results
+        return results
@@ -0,0 +1,109 @@
+from typing import Dict, Any, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UniqueKeyChecker:
+    """
+    Enforces the `uniqueKeys` declared in the resolved gen3 JSON schema.
+
+    For every node, each declared unique key tuple (e.g. ['project_id', 'submitter_id'])
+    gets a hash map from the tuple of record values to the indices of the records with
+    those values. Records are added one at a time, so the checker can run inside the
+    record loop of Validate.validate_schema without a second read of the data.
+
+    A record is skipped for a unique key when none of the key's fields are present, e.g.
+    system generated fields such as 'id' that are not part of a submission. Missing fields
+    of a partially present key are compared as None.
+
+    Attributes:
+        resolved_schema (dict): The resolved gen3 JSON schema, keyed by '<node>.yaml'.
+        unique_keys (dict): A dictionary mapping each node name to its list of unique key
+            tuples.
+    """
+
+    def __init__(self, resolved_schema: dict):
+        if resolved_schema is None:
+            logger.error("Provided resolved_schema is None.")
+            raise ValueError("resolved_schema cannot be None.")
+        self.resolved_schema = resolved_schema
+        self.unique_keys = self.get_unique_keys()
+        self._seen = {}
+        logger.info("UniqueKeyChecker class initialised.")
+
+    def get_unique_keys(self) -> Dict[str, List[Tuple[str, ...]]]:
+        """
+        Reads the declared unique keys of every node in the resolved schema.
+
+        Returns:
+            dict: A dictionary mapping each node name to a list of unique key tuples.
+        """
+        unique_keys = {}
+        for schema_key, schema in self.resolved_schema.items():
+            if not isinstance(schema, dict):
+                continue
+            node = schema_key[:-5] if schema_key.endswith('.yaml') else schema_key
+            unique_keys[node] = [tuple(key) for key in schema.get("uniqueKeys", [])]
+        return unique_keys
+
+    @staticmethod
+    def _hashable(value: Any) -> Any:
+        if isinstance(value, dict):
+            return tuple(sorted((k, UniqueKeyChecker._hashable(v)) for k, v in value.items()))
+        if isinstance(value, list):
+            return tuple(UniqueKeyChecker._hashable(v) for v in value)
+        return value
+
+    def add(self, node: str, idx: int, record: Dict[str, Any]) -> None:
+        """
+        Adds a record to the hash maps of each unique key of its node.
+
+        Args:
+            node (str): The name of the node, e.g. 'sample'.
+            idx (int): The index of the record in the node's data.
+            record (dict): The record.
+        """
+        for key in self.unique_keys.get(node, []):
+            if not any(field in record for field in key):
+                continue
+            values = tuple(self._hashable(record.get(field)) for field in key)
+            self._seen.setdefault((node, key), {}).setdefault(values, []).append(idx)
+
+    def duplicates(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Returns the duplicated unique key values found in the records added so far.
+
+        Returns:
+            dict: A dictionary mapping each node name with duplicates to a list of
+            dictionaries with the keys 'unique_key' (list of fields), 'values' (list of
+            the duplicated values) and 'indices' (list of record indices).
+        """
+        results = {}
+        for (node, key), seen in self._seen.items():
+            for values, indices in seen.items():
+                if len(indices) > 1:
+                    results.setdefault(node, []).append({
+                        "unique_key": list(key),
+                        "values": list(values),
+                        "indices": indices,
+                    })
+        for node, node_duplicates in results.items():
+            logger.warning(f"Node '{node}' has {len(node_duplicates)} duplicated unique key values.")
+        return results
+
+    def check_data_map(self, data_map: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Adds every record of the data map and returns the duplicates.
+
+        Args:
+            data_map (dict): A dictionary where each key is an entity name and the value is
+                a list of records for that entity.
+
+        Returns:
+            dict: The duplicates, as returned by duplicates().
+        """
+        for node, records in data_map.items():
+            for idx, record in enumerate(records):
+                self.add(node, idx, record)
+        return self.duplicates()
@@ -5,8 +5,10 @@ from functools import wraps
 from time import time
 import pandas as pd
 import json
+import re
 import uuid
 import logging
+from .unique_keys import UniqueKeyChecker
 
 logger = logging.getLogger(__name__)
 
@@ -46,9 +48,28 @@ class Validate:
         self.resolved_schema = resolved_schema
         self.validation_result = None
         self.key_map = None
+        self.unique_key_result = None
         logger.info("Validate class initialised.")
 
 
+    @staticmethod
+    def _is_link_alias_error(error, obj) -> bool:
+        """
+        Checks if a validation error is the additionalProperties error raised only by
+        link alias fields, i.e. extra fields holding a copy of the record's submitter_id.
+        """
+        if error.validator != 'additionalProperties' or error.path or not isinstance(obj, dict):
+            return False
+        if 'submitter_id' not in obj:
+            return False
+        properties = error.schema.get('properties', {})
+        patterns = error.schema.get('patternProperties', {})
+        extras = [
+            key for key in obj
+            if key not in properties and not any(re.search(p, key) for p in patterns)
+        ]
+        return bool(extras) and all(obj[key] == obj['submitter_id'] for key in extras)
+
     def validate_object(self, obj, idx, validator) -> list:
         """
         Validates a single JSON object against a provided JSON schema validator.
@@ -60,16 +81,24 @@ class Validate:
 
         Returns:
         - list: A list of dictionaries containing validation results and log messages.
+
+        Notes:
+        - An `additionalProperties` error caused only by the '<node><link_suffix>' link
+          alias (a copy of the submitter_id added by ParseData(materialize_links=True)) is
+          not reported. Records without the alias report all of their errors.
         """
         validation_results = []
         try:
-            errors = list(validator.iter_errors(obj))
+            errors = [
+                error for error in validator.iter_errors(obj)
+                if not self._is_link_alias_error(error, obj)
+            ]
             logger.debug(f"Object at index {idx} validated with {len(errors)} errors.")
         except Exception as e:
             logger.error(f"Error in validate_object during object validation at index {idx}: {e}")
             return validation_results
 
-        if len(errors[1:]) == 0:
+        if len(errors) == 0:
             result = {
                 "index": idx,
                 "validation_result": "PASS",
@@ -81,7 +110,7 @@ class Validate:
             }
             validation_results.append(result)
         else:
-            for error in errors[1:]:
+            for error in errors:
                 invalid_key = ".".join(str(k) for k in error.path) if error.path else "root"
                 schema_path = ".".join(str(k) for k in error.schema_path)
 
@@ -98,14 +127,20 @@ class Validate:
 
         return validation_results
 
-    def validate_schema(self) -> dict:
+    def validate_schema(self, check_unique_keys: bool = False) -> dict:
         """
         Validates the data in self.data_map against the schemas in self.resolved_schema.
 
+        Parameters:
+        - check_unique_keys (bool): If True, the `uniqueKeys` declared in the schema are
+          also checked in the same pass over the data, and the duplicates are stored in
+          self.unique_key_result. Defaults to False.
+
         Returns:
         - dict: A dictionary containing validation results for each entity.
         """
         validation_results = {}
+        unique_checker = UniqueKeyChecker(self.resolved_schema) if check_unique_keys else None
 
         try:
             logger.info("Validating Data with Schema...")
@@ -139,9 +174,13 @@ class Validate:
                     node_results.append(result)
                 except Exception as e:
                     logger.error(f"Error in validate_schema validating object at index {idx} for node {node}: {e}")
+                if unique_checker is not None:
+                    unique_checker.add(node, idx, obj)
 
             validation_results[node] = node_results
 
+        if unique_checker is not None:
+            self.unique_key_result = unique_checker.duplicates()
         self.validation_result = validation_results
         return validation_results
     
@@ -0,0 +1,100 @@
+import json
+import pytest
+from gen3_validator.bloom import BloomFilter, load_bloom_filters, build_bloom_filters, main
+
+
+@pytest.fixture
+def bloom_fixture():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    bloom.update(f"subject_{i}" for i in range(100))
+    return bloom
+
+
+def test_init_BloomFilter():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    assert bloom.n_items == 0
+    # ~9.6 bits per key and 7 hashes for a 1% false positive rate
+    assert bloom.n_bits == 9586
+    assert bloom.n_hashes == 7
+
+
+@pytest.mark.parametrize("capacity, error_rate", [(0, 0.01), (10, 0), (10, 1.5)])
+def test_init_BloomFilter_invalid(capacity, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=capacity, error_rate=error_rate)
+
+
+def test_contains(bloom_fixture):
+    assert len(bloom_fixture) == 100
+    assert all(f"subject_{i}" in bloom_fixture for i in range(100))
+    false_positives = sum(f"sample_{i}" in bloom_fixture for i in range(1000))
+    assert false_positives < 50
+    assert ["subject_1"] not in bloom_fixture
+
+
+def test_save_and_load(bloom_fixture, tmp_path):
+    path = str(tmp_path / "subject.bloom")
+    bloom_fixture.save(path)
+    loaded = BloomFilter.load(path)
+    assert loaded.n_items == 100
+    assert loaded.bits == bloom_fixture.bits
+    assert "subject_42" in loaded
+
+
+def test_load_invalid_file(tmp_path):
+    path = tmp_path / "bad.bloom"
+    path.write_bytes(b"not a bloom filter")
+    with pytest.raises(ValueError):
+        BloomFilter.load(str(path))
+
+
+def test_build_and_refresh_bloom_filters(tmp_path):
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    (exports / "subject.json").write_text(json.dumps([{"submitter_id": "subject_1"}, {"submitter_id": "subject_2"}]))
+    (exports / "sample.ndjson").write_text('{"submitter_id": "sample_1"}\n\n{"submitter_id": "sample_2"}\n')
+    output_dir = str(tmp_path / "filters")
+
+    filters = build_bloom_filters(
+        [str(exports / "subject.json"), str(exports / "sample.ndjson")], output_dir
+    )
+    assert set(filters.keys()) == {"subject", "sample"}
+    assert filters["subject"].capacity == 4
+
+    (exports / "update").mkdir()
+    (exports / "update" / "subject.jsonl").write_text('{"submitter_id": "subject_3"}\n')
+    build_bloom_filters([str(exports / "update" / "subject.jsonl")], output_dir, refresh=True)
+
+    loaded = load_bloom_filters(output_dir)
+    assert loaded["subject"].n_items == 3
+    assert "subject_1" in loaded["subject"] and "subject_3" in loaded["subject"]
+    assert "sample_2" in loaded["sample"]
+
+    # Refreshing with keys that are already in the filter does not count them again
+    build_bloom_filters([str(exports / "update" / "subject.jsonl")], output_dir, refresh=True)
+    assert load_bloom_filters(output_dir)["subject"].n_items == 3
+
+
+def test_duplicate_keys_counted_once():
+    bloom = BloomFilter(capacity=10, error_rate=0.01)
+    bloom.update(["subject_1", "subject_1", "subject_2"])
+    assert bloom.n_items == 2
+
+
+def test_keys_hashed_by_value_equality():
+    bloom = BloomFilter(capacity=10, error_rate=0.01)
+    bloom.update([1, False])
+    assert True in bloom and 1.0 in bloom
+    assert 0 in bloom and 0.0 in bloom
+    assert bloom.n_items == 2
+    bloom.update([True, 0.0])
+    assert bloom.n_items == 2
+    assert "1" not in bloom
+
+
+def test_main(tmp_path, capsys):
+    export = tmp_path / "subject.json"
+    export.write_text(json.dumps([{"submitter_id": "subject_1"}]))
+    main([str(export), "--output-dir", str(tmp_path / "filters"), "--error-rate", "0.001"])
+    assert "subject: 1 keys" in capsys.readouterr().out
+    assert load_bloom_filters(str(tmp_path / "filters"))["subject"].error_rate == 0.001
@@ -0,0 +1,130 @@
+import pytest
+import pandas as pd
+from gen3_validator.parsers.coerce import SchemaCoercer, declared_types, series_to_list
+
+
+@pytest.fixture
+def resolved_schema():
+    return {
+        "sample.yaml": {
+            "properties": {
+                "submitter_id": {"type": ["string"]},
+                "freeze_thaw_cycles": {"type": "integer"},
+                "volume": {"type": "number"},
+                "baseline_timepoint": {"type": "boolean"},
+                "sample_id": {"type": "string"},
+                "collected": {"oneOf": [{"type": "string"}, {"type": "null"}]},
+                "sample_provider": {"enum": ["Baker", "USYD"]},
+            }
+        }
+    }
+
+
+@pytest.fixture
+def coercer(resolved_schema):
+    return SchemaCoercer(resolved_schema)
+
+
+def test_declared_types():
+    assert declared_types({"type": "integer"}) == {"integer"}
+    assert declared_types({"type": ["string", "null"]}) == {"string", "null"}
+    assert declared_types({"anyOf": [{"type": "object"}, {"type": "array"}]}) == {"object", "array"}
+    assert declared_types({"enum": ["a"]}) == set()
+
+
+def test_series_to_list():
+    assert series_to_list(pd.Series([1, 2])) == [1, 2]
+    assert type(series_to_list(pd.Series([1, 2]))[0]) is int
+    assert series_to_list(pd.Series([1.5, float("nan")])) == [1.5, None]
+    assert series_to_list(pd.Series(["a", None], dtype=object)) == ["a", None]
+    assert series_to_list(pd.to_datetime(pd.Series(["2020-01-01", None]))) == \
+        [pd.Timestamp("2020-01-01"), None]
+
+
+def test_coerce_frame(coercer):
+    df = pd.DataFrame({
+        "submitter_id": ["sample_1", "sample_2", "sample_3"],
+        "freeze_thaw_cycles": [1.0, None, 2.5],
+        "volume": ["1.5", "2", "lots"],
+        "baseline_timepoint": ["Yes", "false", None],
+        "sample_id": [101, 102.0, 3.5],
+        "collected": pd.to_datetime(["2020-01-01 00:00", None, "2021-06-30 12:00"]),
+        "sample_provider": [1, 2, 3],
+    })
+    result = coercer.coerce_frame("sample", df)
+    assert result["freeze_thaw_cycles"].tolist()[0] == 1
+    assert isinstance(result["freeze_thaw_cycles"].tolist()[0], int)
+    assert result["freeze_thaw_cycles"].tolist()[2] == 2.5
+    assert result["volume"].tolist() == [1.5, 2.0, "lots"]
+    assert result["baseline_timepoint"].tolist()[:2] == [True, False]
+    assert result["sample_id"].tolist() == ["101", "102", "3.5"]
+    assert result["collected"].tolist()[0] == "2020-01-01T00:00:00"
+    assert result["collected"].tolist()[2] == "2021-06-30T12:00:00"
+    assert result["sample_provider"].tolist() == [1, 2, 3]
+    assert df["freeze_thaw_cycles"].tolist()[0] == 1.0
+    assert coercer.transformations[("sample", "freeze_thaw_cycles", "number", "integer")] == 1
+    assert coercer.transformations[("sample", "volume", "string", "number")] == 2
+    assert coercer.transformations[("sample", "sample_id", "number", "string")] == 3
+
+
+def test_coerce_frame_unchanged(coercer):
+    df = pd.DataFrame({"submitter_id": ["sample_1"], "freeze_thaw_cycles": [3]})
+    assert coercer.coerce_frame("sample", df) is df
+    assert coercer.coerce_frame("subject", df) is df
+    assert not coercer.transformations
+
+
+def test_coerce_records(coercer):
+    records = [
+        {"submitter_id": "sample_1", "freeze_thaw_cycles": 12.0, "baseline_timepoint": "TRUE"},
+        {"submitter_id": "sample_2", "freeze_thaw_cycles": "3"},
+        {"submitter_id": "sample_3", "freeze_thaw_cycles": None, "baseline_timepoint": "maybe"},
+    ]
+    assert coercer.coerce_records("sample", records) is records
+    assert records == [
+        {"submitter_id": "sample_1", "freeze_thaw_cycles": 12, "baseline_timepoint": True},
+        {"submitter_id": "sample_2", "freeze_thaw_cycles": 3},
+        {"submitter_id": "sample_3", "freeze_thaw_cycles": None, "baseline_timepoint": "maybe"},
+    ]
+    assert {
+        (row["property"], row["from"], row["to"], row["count"]) for row in coercer.summary()
+    } == {
+        ("freeze_thaw_cycles", "number", "integer", 1),
+        ("freeze_thaw_cycles", "string", "integer", 1),
+        ("baseline_timepoint", "string", "boolean", 1),
+    }
+
+
+def test_requires_schema():
+    with pytest.raises(ValueError):
+        SchemaCoercer(None)
+
+
+@pytest.mark.parametrize("prop, value, expected", [
+    ("freeze_thaw_cycles", "9007199254740993", 9007199254740993),
+    ("freeze_thaw_cycles", " 12345678901234567890 ", 12345678901234567890),
+    ("freeze_thaw_cycles", 12.0, 12),
+    ("freeze_thaw_cycles", float(2 ** 53), float(2 ** 53)),
+    ("freeze_thaw_cycles", "12.5", "12.5"),
+    ("volume", "9007199254740993", 9007199254740993),
+    ("volume", "nan", "nan"),
+    ("sample_id", 12345678901234567, "12345678901234567"),
+    ("sample_id", 1e20, "1e+20"),
+    ("sample_id", 2.5, "2.5"),
+    ("sample_id", 7.0, "7"),
+])
+def test_coerce_exact_values(coercer, prop, value, expected):
+    records = [{"submitter_id": "sample_1", prop: value}]
+    coercer.coerce_records("sample", records)
+    assert records[0][prop] == expected
+    assert type(records[0][prop]) is type(expected)
+
+
+def test_coerce_frame_large_integers(coercer):
+    df = pd.DataFrame({
+        "sample_id": pd.Series([12345678901234567, 3], dtype="int64"),
+        "freeze_thaw_cycles": ["9007199254740993", "4"],
+    })
+    result = coercer.coerce_frame("sample", df)
+    assert result["sample_id"].tolist() == ["12345678901234567", "3"]
+    assert result["freeze_thaw_cycles"].tolist() == [9007199254740993, 4]
@@ -0,0 +1,64 @@
+import pytest
+from gen3_validator.parsers.data_map import LazyDataMap
+
+
+@pytest.fixture
+def loader_calls():
+    return []
+
+
+@pytest.fixture
+def lazy_map(loader_calls):
+    def loader(path):
+        loader_calls.append(path)
+        return [{"submitter_id": f"{path}_1"}]
+
+    return LazyDataMap(
+        {"subject": "subject.json", "sample": "sample.json", "file": "file.json"},
+        loader=loader, max_nodes=2
+    )
+
+
+def test_keys_do_not_load(lazy_map, loader_calls):
+    assert list(lazy_map) == ["subject", "sample", "file"]
+    assert len(lazy_map) == 3
+    assert "sample" in lazy_map
+    assert "aliquot" not in lazy_map
+    assert loader_calls == []
+
+
+def test_getitem_loads_once(lazy_map, loader_calls):
+    assert lazy_map["sample"] == [{"submitter_id": "sample.json_1"}]
+    lazy_map["sample"]
+    assert loader_calls == ["sample.json"]
+    assert lazy_map.loaded_nodes() == ["sample"]
+
+
+def test_missing_node_raises(lazy_map):
+    with pytest.raises(KeyError):
+        lazy_map["aliquot"]
+    assert lazy_map.get("aliquot") is None
+
+
+def test_lru_eviction(lazy_map, loader_calls):
+    lazy_map["subject"]
+    lazy_map["sample"]
+    lazy_map["subject"]
+    lazy_map["file"]
+    assert lazy_map.loaded_nodes() == ["subject", "file"]
+    lazy_map["sample"]
+    assert loader_calls == ["subject.json", "sample.json", "file.json", "sample.json"]
+
+
+def test_evict(lazy_map):
+    lazy_map["subject"]
+    lazy_map["sample"]
+    lazy_map.evict("subject")
+    assert lazy_map.loaded_nodes() == ["sample"]
+    lazy_map.evict()
+    assert lazy_map.loaded_nodes() == []
+
+
+def test_invalid_max_nodes():
+    with pytest.raises(ValueError):
+        LazyDataMap({}, loader=list, max_nodes=0)
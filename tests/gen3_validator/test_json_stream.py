@@ -0,0 +1,85 @@
+import json
+import pytest
+from gen3_validator.parsers.json_stream import (
+    iter_json_array, iter_json_records, iter_ndjson, NodeStream
+)
+
+
+@pytest.fixture
+def records():
+    return [
+        {"submitter_id": "sample_1", "note": "has ] and [ and \", inside", "n": 12345},
+        {"submitter_id": "sample_2", "subjects": [{"submitter_id": "subject_1"}], "x": None},
+        {"submitter_id": "sample_3", "unicode": "café", "f": 1.5e3},
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_iter_json_array(tmp_path, records, chunk_size):
+    path = tmp_path / "sample.json"
+    path.write_text(json.dumps(records, indent=2))
+    assert list(iter_json_array(str(path), chunk_size=chunk_size)) == records
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_iter_json_array_numbers_at_chunk_edge(tmp_path, chunk_size):
+    path = tmp_path / "numbers.json"
+    path.write_text("[1234567, 89,\n 10]")
+    assert list(iter_json_array(str(path), chunk_size=chunk_size)) == [1234567, 89, 10]
+
+
+def test_iter_json_array_empty_and_non_array(tmp_path):
+    empty = tmp_path / "empty.json"
+    empty.write_text("  [ ]  ")
+    assert list(iter_json_array(str(empty))) == []
+    obj = tmp_path / "object.json"
+    obj.write_text('{"submitter_id": "a"}')
+    assert list(iter_json_array(str(obj), chunk_size=4)) == [{"submitter_id": "a"}]
+
+
+def test_iter_json_array_malformed(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text('[{"submitter_id": "a"}, {"submitter_id": ')
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(str(path), chunk_size=8))
+
+
+def test_iter_ndjson(tmp_path, records):
+    path = tmp_path / "sample.ndjson"
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n\n")
+    assert list(iter_ndjson(str(path))) == records
+    assert list(iter_json_records(str(path))) == records
+
+    bad = tmp_path / "bad.jsonl"
+    bad.write_text('{"a": 1}\n{"a": \n')
+    with pytest.raises(json.JSONDecodeError, match="line 2"):
+        list(iter_ndjson(str(bad)))
+
+
+def test_node_stream_is_reiterable(tmp_path, records):
+    path = tmp_path / "sample.json"
+    path.write_text(json.dumps(records))
+    stream = NodeStream(str(path))
+    assert list(stream) == records
+    assert list(stream) == records
+
+
+@pytest.mark.parametrize("document", [
+    "[1 2]", "[1,]", "[,1]", "[1,,2]", "[1]]", "[1] [2]", "[] trailing", "", "   \n", "[1", "[",
+])
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_iter_json_array_rejects_what_json_rejects(tmp_path, document, chunk_size):
+    path = tmp_path / "bad.json"
+    path.write_text(document)
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(document)
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(str(path), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("document", ["[1, 2]  \n", "[ ]", "[[1], {\"a\": [2]}]\n\n"])
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_iter_json_array_matches_json_loads(tmp_path, document, chunk_size):
+    path = tmp_path / "good.json"
+    path.write_text(document)
+    assert list(iter_json_array(str(path), chunk_size=chunk_size)) == json.loads(document)
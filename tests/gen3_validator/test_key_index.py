@@ -0,0 +1,108 @@
+import datetime
+import os
+import numpy as np
+import pytest
+from gen3_validator.key_index import KeyIndex, KeyRegistry
+
+
+@pytest.fixture
+def key_index():
+    index = KeyIndex(batch_size=2)
+    yield index
+    index.close()
+
+
+def test_init_KeyIndex_temporary():
+    index = KeyIndex()
+    db_path = index.db_path
+    assert os.path.exists(db_path)
+    assert index.batch_size == 10000
+    index.close()
+    assert not os.path.exists(db_path)
+
+
+def test_init_KeyIndex_db_path(tmp_path):
+    db_path = str(tmp_path / "keys.sqlite")
+    with KeyIndex(db_path=db_path) as index:
+        index.add_primary_keys("subject", ["subject_1"])
+    # a user supplied database is kept
+    assert os.path.exists(db_path)
+    # keys of an earlier run are cleared when the database is opened again
+    with KeyIndex(db_path=db_path) as index:
+        assert not index.contains("subject_1")
+        index.add_foreign_keys("sample", ["subject_1"])
+        assert list(index.iter_invalid_foreign_keys("sample")) == ["subject_1"]
+
+
+def test_add_primary_keys_and_contains(key_index):
+    n_keys = key_index.add_primary_keys("subject", iter(["subject_1", "subject_2", "subject_1", 3]))
+    assert n_keys == 4
+    assert key_index.contains("subject_1")
+    assert key_index.contains(3)
+    assert not key_index.contains("3")
+    assert not key_index.contains(["subject_1"])
+    assert key_index.contains("subject_1", "subject")
+    assert not key_index.contains("subject_1", "sample")
+
+
+def test_keys_match_like_a_set(key_index):
+    day = datetime.date(2024, 1, 1)
+    big = 2 ** 70
+    key_index.add_primary_keys("subject", [("a", 1), day, big, 1, None])
+    assert key_index.contains(("a", True)) and key_index.contains(("a", 1.0))
+    assert key_index.contains(day) and key_index.contains(big) and key_index.contains(float(big))
+    assert key_index.contains(True) and key_index.contains(np.int64(1))
+    assert key_index.contains(None)
+    assert not key_index.contains(("a", "1")) and not key_index.contains(str(big))
+    key_index.add_foreign_keys(
+        "sample", [("a", 1), ("b", 2), day, datetime.date(2024, 1, 2), big, big + 1, True, {"x": 1}]
+    )
+    assert list(key_index.iter_invalid_foreign_keys("sample")) == [
+        ("b", 2), datetime.date(2024, 1, 2), big + 1, {"x": 1}
+    ]
+
+
+def test_iter_invalid_foreign_keys(key_index):
+    key_index.add_primary_keys("subject", ["subject_1"])
+    key_index.add_primary_keys("sample", ["sample_1"])
+    key_index.add_foreign_keys("sample", ["missing_b", "subject_1", "missing_a", "missing_b", ["x"]])
+    key_index.add_foreign_keys("genomics_assay", ["sample_1"])
+    assert list(key_index.iter_invalid_foreign_keys("sample")) == ["missing_b", "missing_a", "missing_b", ["x"]]
+    assert list(key_index.iter_invalid_foreign_keys("genomics_assay")) == []
+    assert list(key_index.iter_invalid_foreign_keys("not_an_entity")) == []
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = KeyRegistry(db_path=str(tmp_path / "project.sqlite"), project_id="P1", batch_size=2)
+    yield registry
+    registry.close()
+
+
+def test_registry_add_keys_and_lookup(registry):
+    assert registry.add_keys("subject", ["subject_1", "subject_2", "subject_1"]) == 2
+    assert registry.add_keys("subject", ["subject_2", "subject_3"]) == 1
+    registry.add_keys("sample", ["sample_1"])
+    assert registry.contains("subject_1")
+    assert registry.contains("subject_1", node="subject")
+    assert not registry.contains("subject_1", node="sample")
+    assert registry.find_existing(["subject_1", "sample_1", "missing", ["x"]]) == {"subject_1", "sample_1"}
+    assert registry.count() == 4
+    assert registry.count("subject") == 3
+    assert registry.nodes() == ["sample", "subject"]
+
+
+def test_registry_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "project.sqlite")
+    with KeyRegistry(db_path=db_path, project_id="P1") as registry:
+        registry.add_keys("subject", ["subject_1"])
+    with KeyRegistry(db_path=db_path) as registry:
+        assert registry.project_id == "P1"
+        assert registry.contains("subject_1")
+
+
+def test_registry_project_mismatch(tmp_path):
+    db_path = str(tmp_path / "project.sqlite")
+    KeyRegistry(db_path=db_path, project_id="P1").close()
+    with pytest.raises(ValueError):
+        KeyRegistry(db_path=db_path, project_id="P2")
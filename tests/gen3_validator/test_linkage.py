@@ -1,5 +1,5 @@
 import pytest
-from gen3_validator.linkage import Linkage
+from gen3_validator.linkage import Linkage, ConfigValidationResult
 
 @pytest.fixture
 def fixture_root_node():
@@ -9,6 +9,8 @@ def test_init_Linkage(fixture_root_node):
     LinkageInstance = Linkage()
     assert LinkageInstance.root_node == fixture_root_node
     assert LinkageInstance.link_validation_results is None
+    assert LinkageInstance.schema_link_validation_results is None
+    assert LinkageInstance.link_cardinality_results is None
 
 @pytest.fixture
 def fixture_Linkage(fixture_root_node):
@@ -203,6 +205,46 @@ def test_test_config_links_root_node_broken_link_ignored(fixture_Linkage, fixtur
     assert result == "valid"
 
 
+def test_check_config_links_valid(fixture_Linkage, fixture_config_valid, capsys):
+    result = fixture_Linkage.check_config_links(fixture_config_valid, root_node=["subject"])
+    assert isinstance(result, ConfigValidationResult)
+    assert result.valid is True
+    assert result.broken_links == {}
+    assert result.resolved_links == {"sample": ["subject"], "genomics_assay": ["sample"]}
+    # printing is off by default
+    assert capsys.readouterr().out == ""
+
+def test_check_config_links_invalid_and_root(fixture_Linkage, fixture_config_root_broken):
+    config = dict(fixture_config_root_broken)
+    config["genomics_assay"] = {"primary_key": "genomics_assays", "foreign_key": "not_a_real_pk"}
+    result = fixture_Linkage.check_config_links(config, root_node=["subject"])
+    assert result.valid is False
+    assert result.broken_links == {"genomics_assay": "not_a_real_pk"}
+    assert result.ignored_links == {"subject": "not_a_real_pk"}
+
+def test_check_config_links_self_reference_is_broken(fixture_Linkage):
+    config = {
+        "subject": {"primary_key": "subjects", "foreign_key": None},
+        "sample": {"primary_key": "samples", "foreign_key": "samples"},
+    }
+    result = fixture_Linkage.check_config_links(config, root_node=["subject"])
+    assert result.broken_links == {"sample": "samples"}
+
+
+def test_check_config_links_unhashable_primary_key(fixture_Linkage):
+    config = {
+        "subject": {"primary_key": ["subjects"], "foreign_key": None},
+        "sample": {"primary_key": "samples", "foreign_key": "subjects"},
+    }
+    result = fixture_Linkage.check_config_links(config, root_node=["subject"])
+    assert result.broken_links == {"sample": "subjects"}
+
+def test_test_config_links_verbose_false(fixture_Linkage, fixture_config_valid, capsys):
+    result = fixture_Linkage.test_config_links(fixture_config_valid, root_node=["subject"], verbose=False)
+    assert result == "valid"
+    assert capsys.readouterr().out == ""
+
+
 
 def test_test_config_links_missing_foreign_key_raises(fixture_Linkage):
     linkage = fixture_Linkage
@@ -342,3 +384,460 @@ def test_get_primary_keys_and_foreign_keys_missing_key_in_record(fixture_Linkage
     assert fk_result == {"subject": [], "sample": [], "genomics_assay": []}
 
 
+def test_extract_keys_matches_streaming_path(fixture_Linkage, caplog):
+    records = [
+        {"samples": [{"submitter_id": "sample_2"}, {"submitter_id": "sample_3"}]},
+        {"samples": {"submitter_id": "sample_1"}},
+        {"samples": None},
+        {"other": "x"},
+        {"samples": "sample_4"},
+        {"samples": ["sample_5"]},
+        {"samples": {"id": "no_submitter_id"}},
+        {"other": "y"},
+    ]
+    with caplog.at_level("WARNING", logger="gen3_validator.linkage"):
+        keys = fixture_Linkage._extract_keys("assay", records, "samples", "foreign")
+    assert keys == [
+        "sample_2", "sample_3", "sample_1", "sample_4", ["sample_5"], {"id": "no_submitter_id"}
+    ]
+    assert keys == list(fixture_Linkage._iter_key_values("assay", records, "samples", "foreign"))
+    missing = [r.message for r in caplog.records if "missing the foreign key field" in r.message]
+    assert missing == [
+        "2 records in entity 'assay' are missing the foreign key field 'samples'.",
+        "2 records in entity 'assay' are missing the foreign key field 'samples'.",
+    ]
+
+
+
+def test_validate_links_preserves_order_and_duplicates(fixture_Linkage, fixture_link_config):
+    data_map = {
+        "subject": [{"subjects": "subject_1"}],
+        "sample": [
+            {"samples": "sample_1", "subjects": {"submitter_id": "missing_b"}},
+            {"samples": "sample_2", "subjects": {"submitter_id": "subject_1"}},
+            {"samples": "sample_3", "subjects": {"submitter_id": "missing_a"}},
+            {"samples": "sample_4", "subjects": {"submitter_id": "missing_b"}},
+        ],
+        "genomics_assay": [
+            {"genomics_assays": "ga_1", "samples": ["sample_1"]},  # unhashable fk
+        ],
+    }
+    result = fixture_Linkage.validate_links(data_map, fixture_link_config)
+    assert result["sample"] == ["missing_b", "missing_a", "missing_b"]
+    assert result["genomics_assay"] == [["sample_1"]]
+    assert result["subject"] == []
+
+
+def test_validate_links_provenance(fixture_Linkage, fixture_link_config):
+    data_map = {
+        "subject": [{"subjects": "subject_1"}],
+        "sample": [
+            {"samples": "sample_1", "subjects": {"submitter_id": "missing_b"}},
+            {"samples": "sample_2", "subjects": {"submitter_id": "subject_1"}},
+            {"samples": "sample_3", "subjects": {"submitter_id": "missing_a"}},
+            {"samples": "sample_4", "subjects": [{"submitter_id": "missing_b"}]},
+        ],
+        "genomics_assay": [
+            {"genomics_assays": "ga_1", "samples": "sample_1"},
+            {"genomics_assays": "ga_2", "samples": ["sample_1"]},  # unhashable fk
+        ],
+    }
+    result = fixture_Linkage.validate_links(
+        data_map, fixture_link_config,
+        source_files={"sample": [(0, "/data/sample.json")]}, return_provenance=True
+    )
+    assert result["sample"] == [
+        {"key": "missing_b", "rows": [0, 3], "source_file": "/data/sample.json"},
+        {"key": "missing_a", "rows": [2], "source_file": "/data/sample.json"},
+    ]
+    assert result["genomics_assay"] == [{"key": ["sample_1"], "rows": [1], "source_file": None}]
+    assert result["subject"] == []
+    assert fixture_Linkage.link_provenance_results == result
+    assert fixture_Linkage.link_validation_results["sample"] == ["missing_b", "missing_a", "missing_b"]
+
+
+def test_group_rows_with_part_file_spans(fixture_Linkage):
+    broken = [("missing_a", 0), ("missing_a", 3), ("missing_b", 4)]
+    spans = [(0, "sample.part-0001.json"), (3, "sample.part-0002.json")]
+    assert fixture_Linkage._group_rows(broken, spans) == [
+        {"key": "missing_a", "rows": [0], "source_file": "sample.part-0001.json"},
+        {"key": "missing_a", "rows": [3], "source_file": "sample.part-0002.json"},
+        {"key": "missing_b", "rows": [4], "source_file": "sample.part-0002.json"},
+    ]
+
+
+def test_validate_links_virtual_link_alias(fixture_Linkage):
+    data_map = {
+        "subject": [{"submitter_id": "subject_1"}],
+        "sample": [
+            {"submitter_id": "sample_1", "subjects": {"submitter_id": "subject_1"}},
+            {"submitter_id": "sample_2", "subjects": {"submitter_id": "subject_2"}},
+        ],
+    }
+    config = fixture_Linkage.generate_config(data_map)
+    assert config["sample"]["primary_key"] == "samples"
+    assert fixture_Linkage.get_primary_keys(data_map, config) == {
+        "subject": ["subject_1"], "sample": ["sample_1", "sample_2"]
+    }
+    result = fixture_Linkage.validate_links(data_map, config)
+    assert result == {"subject": [], "sample": ["subject_2"]}
+
+
+def test_validate_links_custom_link_suffix(fixture_Linkage):
+    data_map = {
+        "subject": [{"submitter_id": "subject_1"}],
+        "sample": [{"submitter_id": "sample_1", "subject_id": {"submitter_id": "subject_1"}}],
+        "aliquot": [{"submitter_id": "aliquot_1", "sample_id": {"submitter_id": "sample_1"}}],
+    }
+    # the suffix is given per call, not to the Linkage instance
+    config = fixture_Linkage.generate_config(data_map, link_suffix="_id")
+    assert config["sample"] == {"primary_key": "sample_id", "foreign_key": "subject_id"}
+    assert fixture_Linkage.validate_links(data_map, config) == {"subject": [], "sample": [], "aliquot": []}
+    assert fixture_Linkage.validate_links_out_of_core(data_map, config) == {
+        "subject": [], "sample": [], "aliquot": []
+    }
+
+
+def test_build_pk_index(fixture_Linkage):
+    all_pks = fixture_Linkage._build_pk_index(
+        {"subject": ["subject_1", "subject_1"], "sample": ["sample_1", ["unhashable"]]}
+    )
+    assert all_pks == {"subject_1", "sample_1"}
+
+
+@pytest.fixture
+def fixture_resolved_schema_links():
+    return {
+        "subject.yaml": {
+            "id": "subject",
+            "links": [
+                {"name": "projects", "target_type": "project", "multiplicity": "many_to_one", "required": True}
+            ],
+        },
+        "sample.yaml": {
+            "id": "sample",
+            "links": [
+                {"name": "subjects", "target_type": "subject", "multiplicity": "many_to_one", "required": True}
+            ],
+        },
+        "genomics_assay.yaml": {
+            "id": "genomics_assay",
+            "links": [
+                {
+                    "exclusive": None,
+                    "required": True,
+                    "subgroup": [
+                        {"name": "samples", "target_type": "sample", "multiplicity": "many_to_one", "required": False},
+                        {"name": "subjects", "target_type": "subject", "multiplicity": "many_to_one", "required": False},
+                    ],
+                }
+            ],
+        },
+    }
+
+
+def test_get_schema_links(fixture_Linkage, fixture_resolved_schema_links):
+    links = fixture_Linkage.get_schema_links(fixture_resolved_schema_links)
+    assert links["sample"] == [{
+        "name": "subjects", "target_type": "subject", "multiplicity": "many_to_one",
+        "required": True, "group": None, "group_required": True,
+    }]
+    assert [edge["name"] for edge in links["genomics_assay"]] == ["samples", "subjects"]
+    assert all(edge["group"] == 0 for edge in links["genomics_assay"])
+    assert all(edge["group_required"] for edge in links["genomics_assay"])
+    assert not any(edge["required"] for edge in links["genomics_assay"])
+
+
+def test_validate_schema_links(fixture_Linkage, fixture_resolved_schema_links):
+    data_map = {
+        "subject": [{"submitter_id": "subject_1", "projects": {"code": "P1"}}],
+        "sample": [
+            {"submitter_id": "sample_1", "subjects": {"submitter_id": "subject_1"}},
+            # sample_2 exists as a key, but not in subject, so it must not match
+            {"submitter_id": "sample_2", "subjects": {"submitter_id": "sample_1"}},
+        ],
+        "genomics_assay": [
+            {"submitter_id": "ga_1", "samples": [{"submitter_id": "sample_1"}, {"submitter_id": "sample_9"}]},
+            {"submitter_id": "ga_2", "subjects": {"submitter_id": "subject_1"}},
+        ],
+    }
+    result = fixture_Linkage.validate_schema_links(data_map, fixture_resolved_schema_links)
+    assert result["subject"]["projects"]["status"] == "skipped"
+    assert result["sample"]["subjects"] == {
+        "target_type": "subject", "status": "checked", "n_links": 2, "invalid_keys": ["sample_1"]
+    }
+    assert result["genomics_assay"]["samples"]["invalid_keys"] == ["sample_9"]
+    assert result["genomics_assay"]["subjects"]["invalid_keys"] == []
+    assert fixture_Linkage.schema_link_validation_results == result
+
+
+def test_validate_schema_links_target_missing(fixture_Linkage, fixture_resolved_schema_links):
+    data_map = {
+        "genomics_assay": [
+            {"submitter_id": "ga_1", "samples": {"submitter_id": "sample_1"}},
+        ],
+    }
+    result = fixture_Linkage.validate_schema_links(data_map, fixture_resolved_schema_links)
+    assert result["genomics_assay"]["samples"]["status"] == "target_missing"
+    assert result["genomics_assay"]["samples"]["invalid_keys"] == ["sample_1"]
+    assert result["genomics_assay"]["subjects"]["status"] == "skipped"
+
+
+@pytest.fixture
+def fixture_data_map_multi_fk():
+    return {
+        "subject": [
+            {"submitter_id": "subject_1", "subjects": "subject_1"},
+        ],
+        "core_metadata_collection": [
+            {"submitter_id": "cmc_1", "core_metadata_collections": "cmc_1"},
+        ],
+        "imaging_file": [
+            # sparse first record: no link at all
+            {"submitter_id": "img_1", "imaging_files": "img_1"},
+            {"submitter_id": "img_2", "subjects": {"submitter_id": "subject_1"}, "imaging_files": "img_2"},
+            {
+                "submitter_id": "img_3",
+                "subjects": {"submitter_id": "subject_1"},
+                "core_metadata_collections": [{"submitter_id": "cmc_1"}],
+                "imaging_files": "img_3",
+            },
+            {"submitter_id": "img_4", "subjects": {"submitter_id": "subject_9"}, "imaging_files": "img_4"},
+        ],
+    }
+
+
+def test_discover_foreign_keys(fixture_Linkage, fixture_data_map_multi_fk):
+    result = fixture_Linkage.discover_foreign_keys(fixture_data_map_multi_fk)
+    assert result["subject"] == {"n_scanned": 1, "foreign_keys": {}}
+    assert result["imaging_file"]["n_scanned"] == 4
+    assert list(result["imaging_file"]["foreign_keys"].keys()) == ["subjects", "core_metadata_collections"]
+    assert result["imaging_file"]["foreign_keys"]["subjects"] == {"count": 3, "coverage": 0.75}
+
+
+def test_discover_foreign_keys_sample_size(fixture_Linkage, fixture_data_map_multi_fk):
+    result = fixture_Linkage.discover_foreign_keys(fixture_data_map_multi_fk, sample_size=2)
+    assert result["imaging_file"]["n_scanned"] == 2
+    assert result["imaging_file"]["foreign_keys"] == {"subjects": {"count": 1, "coverage": 0.5}}
+
+
+def test_generate_config_multi_fk(fixture_Linkage, fixture_data_map_multi_fk):
+    config = fixture_Linkage.generate_config(fixture_data_map_multi_fk, multi_fk=True)
+    assert config["imaging_file"] == {
+        "primary_key": "imaging_files",
+        "foreign_key": ["subjects", "core_metadata_collections"],
+    }
+    assert config["subject"]["foreign_key"] is None
+    assert fixture_Linkage.fk_coverage["imaging_file"]["n_scanned"] == 4
+
+    config = fixture_Linkage.generate_config(fixture_data_map_multi_fk, multi_fk=True, min_coverage=0.5)
+    assert config["imaging_file"]["foreign_key"] == ["subjects"]
+
+
+def test_validate_links_multi_fk(fixture_Linkage, fixture_data_map_multi_fk):
+    config = fixture_Linkage.generate_config(fixture_data_map_multi_fk, multi_fk=True)
+    assert fixture_Linkage.test_config_links(config) == "valid"
+    result = fixture_Linkage.validate_links(fixture_data_map_multi_fk, config)
+    assert result["imaging_file"] == ["subject_9"]
+
+
+def test_check_config_links_multi_fk_broken(fixture_Linkage):
+    config = {
+        "subject": {"primary_key": "subjects", "foreign_key": None},
+        "imaging_file": {"primary_key": "imaging_files", "foreign_key": ["subjects", "not_a_real_pk"]},
+    }
+    result = fixture_Linkage.check_config_links(config)
+    assert result.broken_links == {"imaging_file": ["not_a_real_pk"]}
+
+
+def test_validate_links_out_of_core_matches_in_memory(fixture_Linkage, fixture_data_dict_fail, fixture_link_config):
+    expected = fixture_Linkage.validate_links(fixture_data_dict_fail, fixture_link_config)
+    result = fixture_Linkage.validate_links_out_of_core(fixture_data_dict_fail, fixture_link_config, batch_size=1)
+    assert result == expected
+    assert fixture_Linkage.link_validation_results == expected
+
+
+def test_validate_links_out_of_core_multi_fk(fixture_Linkage, fixture_data_map_multi_fk, tmp_path):
+    config = fixture_Linkage.generate_config(fixture_data_map_multi_fk, multi_fk=True)
+    result = fixture_Linkage.validate_links_out_of_core(
+        fixture_data_map_multi_fk, config, db_path=str(tmp_path / "keys.sqlite")
+    )
+    assert result == fixture_Linkage.validate_links(fixture_data_map_multi_fk, config)
+
+
+def test_validate_links_out_of_core_invalid_config(fixture_Linkage, fixture_data_dict_pass, fixture_config_invalid):
+    result = fixture_Linkage.validate_links_out_of_core(fixture_data_dict_pass, fixture_config_invalid)
+    assert result == {"sample": "not_a_real_pk"}
+
+
+def test_validate_links_out_of_core_missing_entity(fixture_Linkage, fixture_data_dict_pass, fixture_link_config):
+    data_map = dict(fixture_data_dict_pass)
+    del data_map["genomics_assay"]
+    with pytest.raises(KeyError):
+        fixture_Linkage.validate_links_out_of_core(data_map, fixture_link_config)
+
+
+class FakeExactIndex:
+    def __init__(self, keys):
+        self.keys = set(keys)
+        self.lookups = []
+
+    def contains(self, key, node=None):
+        self.lookups.append((node, key))
+        return (node, key) in self.keys
+
+
+def test_validate_links_known_keys(fixture_Linkage, fixture_data_dict_fail, fixture_link_config):
+    from gen3_validator.bloom import BloomFilter
+    bloom = BloomFilter(capacity=10)
+    bloom.update(["subject_e5616257f1"])
+    result = fixture_Linkage.validate_links(
+        fixture_data_dict_fail, fixture_link_config, known_keys={"subject": bloom}
+    )
+    assert result["sample"] == []
+    assert result["genomics_assay"] == ["sample_efdbe56d21"]
+
+
+def test_validate_links_known_keys_exact_index(fixture_Linkage, fixture_data_dict_fail, fixture_link_config):
+    from gen3_validator.bloom import BloomFilter
+    bloom = BloomFilter(capacity=10)
+    bloom.update(["subject_e5616257f1"])
+    exact_index = FakeExactIndex([])  # the filter hit is a false positive
+    result = fixture_Linkage.validate_links_out_of_core(
+        fixture_data_dict_fail, fixture_link_config, known_keys={"subject": bloom}, exact_index=exact_index
+    )
+    assert result["sample"] == ["subject_e5616257f1"]
+    # only filter hits go to the exact index
+    assert exact_index.lookups == [("subject", "subject_e5616257f1")]
+
+
+def test_validate_schema_links_known_keys(fixture_Linkage, fixture_resolved_schema_links):
+    from gen3_validator.bloom import BloomFilter
+    bloom = BloomFilter(capacity=10)
+    bloom.update(["sample_1"])
+    data_map = {
+        "genomics_assay": [
+            {"submitter_id": "ga_1", "samples": {"submitter_id": "sample_1"}},
+            {"submitter_id": "ga_2", "samples": {"submitter_id": "sample_2"}},
+        ],
+    }
+    result = fixture_Linkage.validate_schema_links(
+        data_map, fixture_resolved_schema_links, known_keys={"sample": bloom}
+    )
+    assert result["genomics_assay"]["samples"]["status"] == "checked"
+    assert result["genomics_assay"]["samples"]["invalid_keys"] == ["sample_2"]
+
+
+def test_validate_schema_links_exact_index_scoped_to_target(fixture_Linkage, fixture_resolved_schema_links):
+    from gen3_validator.bloom import BloomFilter
+    from gen3_validator.key_index import KeyIndex
+    bloom = BloomFilter(capacity=10)
+    bloom.update(["sample_1", "sample_2"])
+    data_map = {
+        "genomics_assay": [
+            {"submitter_id": "ga_1", "samples": {"submitter_id": "sample_1"}},
+            {"submitter_id": "ga_2", "samples": {"submitter_id": "sample_2"}},
+        ],
+    }
+    with KeyIndex() as exact_index:
+        exact_index.add_primary_keys("sample", ["sample_1"])
+        # a key of another entity does not confirm a hit in the sample filter
+        exact_index.add_primary_keys("subject", ["sample_2"])
+        result = fixture_Linkage.validate_schema_links(
+            data_map, fixture_resolved_schema_links, known_keys={"sample": bloom}, exact_index=exact_index
+        )
+    assert result["genomics_assay"]["samples"]["invalid_keys"] == ["sample_2"]
+
+
+def test_validate_links_staged_with_registry(fixture_Linkage, fixture_link_config, tmp_path):
+    from gen3_validator.key_index import KeyRegistry
+    batch_1 = {
+        "subject": [{"subjects": "subject_1"}],
+        "sample": [{"samples": "sample_1", "subjects": {"submitter_id": "subject_1"}}],
+        "genomics_assay": [],
+    }
+    batch_2 = {
+        "subject": [],
+        "sample": [{"samples": "sample_2", "subjects": {"submitter_id": "subject_1"}}],
+        "genomics_assay": [
+            {"genomics_assays": "ga_1", "samples": {"submitter_id": "sample_1"}},
+            {"genomics_assays": "ga_2", "samples": {"submitter_id": "sample_9"}},
+        ],
+    }
+    with KeyRegistry(db_path=str(tmp_path / "project.sqlite")) as registry:
+        result = fixture_Linkage.validate_links(batch_1, fixture_link_config, registry=registry, update_registry=True)
+        assert all(invalid == [] for invalid in result.values())
+        assert registry.count() == 2
+
+        result = fixture_Linkage.validate_links(batch_2, fixture_link_config, registry=registry, update_registry=True)
+        assert result == {"sample": [], "subject": [], "genomics_assay": ["sample_9"]}
+        # a failed batch is not registered
+        assert not registry.contains("sample_2")
+
+
+def test_validate_schema_links_with_registry(fixture_Linkage, fixture_resolved_schema_links, tmp_path):
+    from gen3_validator.key_index import KeyRegistry
+    data_map = {
+        "genomics_assay": [
+            {"submitter_id": "ga_1", "samples": {"submitter_id": "sample_1"}},
+            {"submitter_id": "ga_2", "samples": {"submitter_id": "subject_1"}},
+        ],
+    }
+    with KeyRegistry(db_path=str(tmp_path / "project.sqlite")) as registry:
+        registry.add_keys("sample", ["sample_1"])
+        registry.add_keys("subject", ["subject_1"])
+        result = fixture_Linkage.validate_schema_links(data_map, fixture_resolved_schema_links, registry=registry)
+    assert result["genomics_assay"]["samples"]["status"] == "checked"
+    assert result["genomics_assay"]["samples"]["invalid_keys"] == ["subject_1"]
+
+
+@pytest.fixture
+def fixture_resolved_schema_cardinality(fixture_resolved_schema_links):
+    schema = dict(fixture_resolved_schema_links)
+    schema["demographic.yaml"] = {
+        "id": "demographic",
+        "links": [
+            {"name": "subjects", "target_type": "subject", "multiplicity": "one_to_one", "required": True}
+        ],
+    }
+    return schema
+
+
+def test_check_link_cardinality(fixture_Linkage, fixture_resolved_schema_cardinality):
+    data_map = {
+        "sample": [
+            {"submitter_id": "sample_1", "subjects": {"submitter_id": "subject_1"}},
+            {"submitter_id": "sample_2", "subjects": [{"submitter_id": "subject_1"}, {"submitter_id": "subject_2"}]},
+            {"submitter_id": "sample_3", "subjects": {"submitter_id": "subject_1"}},  # many_to_one: fine
+            {"submitter_id": "sample_4"},  # missing required link
+        ],
+        "demographic": [
+            {"submitter_id": "demo_1", "subjects": {"submitter_id": "subject_1"}},
+            {"submitter_id": "demo_2", "subjects": {"submitter_id": "subject_1"}},
+            {"submitter_id": "demo_3", "subjects": {"submitter_id": "subject_2"}},
+        ],
+        "genomics_assay": [
+            {"submitter_id": "ga_1", "samples": {"submitter_id": "sample_1"}},
+            {"submitter_id": "ga_2", "subjects": {"submitter_id": "subject_1"}},
+            {"submitter_id": "ga_3", "samples": None},  # no link of the required subgroup
+        ],
+    }
+    result = fixture_Linkage.check_link_cardinality(data_map, fixture_resolved_schema_cardinality)
+
+    assert result["sample"]["multiplicity_violations"] == [{
+        "link": "subjects", "target_type": "subject", "multiplicity": "many_to_one",
+        "violation": "multiple_targets", "keys": ["subject_1", "subject_2"], "indices": [1],
+    }]
+    assert result["sample"]["missing_required_links"] == [{"index": 3, "links": ["subjects"]}]
+
+    assert result["demographic"]["multiplicity_violations"] == [{
+        "link": "subjects", "target_type": "subject", "multiplicity": "one_to_one",
+        "violation": "multiple_sources", "keys": ["subject_1"], "indices": [0, 1],
+    }]
+    assert result["demographic"]["missing_required_links"] == []
+
+    assert result["genomics_assay"]["multiplicity_violations"] == []
+    assert result["genomics_assay"]["missing_required_links"] == [
+        {"index": 2, "links": ["samples", "subjects"]}
+    ]
+    assert fixture_Linkage.link_cardinality_results == result
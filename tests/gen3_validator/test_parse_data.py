@@ -1,6 +1,8 @@
 import pytest
 import pandas as pd
 import json
+import sys
+import gzip
 from gen3_validator.parsers.parse_data import ParseData
 from unittest.mock import patch, MagicMock
 
@@ -101,6 +103,14 @@ def test_load_json_data(dictionary_of_data, mock_json_folder):
     assert parse_data.data_dict == dictionary_of_data
 
 
+def test_source_files(mock_json_folder):
+    parse_data = ParseData(data_folder_path=mock_json_folder)
+    assert parse_data.source_files == {
+        "sample": [(0, "/data/sample.json")],
+        "subject": [(0, "/data/subject.json")],
+    }
+
+
 def test_get_node_names(mock_json_folder):
     parse_data = ParseData(data_folder_path=mock_json_folder)
     assert parse_data.data_nodes == ['sample', 'subject']
@@ -109,3 +119,174 @@ def test_get_node_names(mock_json_folder):
 def test_return_data(dictionary_of_data, mock_json_folder):
     parse_data = ParseData(data_folder_path=mock_json_folder)
     assert parse_data.return_data('sample') == dictionary_of_data['sample']
+
+
+def test_load_json_data_with_workers(dictionary_of_data, mock_json_folder):
+    parse_data = ParseData(data_folder_path=mock_json_folder, workers=4)
+    assert parse_data.data_dict == dictionary_of_data
+    assert list(parse_data.data_dict) == ['sample', 'subject']
+    assert parse_data.source_files == {
+        "sample": [(0, "/data/sample.json")],
+        "subject": [(0, "/data/subject.json")],
+    }
+
+
+def test_load_json_data_with_processes(tmp_path, example_json_sample, example_json_subject):
+    (tmp_path / "subject.json").write_text(json.dumps(example_json_subject))
+    (tmp_path / "sample.json").write_text(json.dumps(example_json_sample))
+    parse_data = ParseData(data_folder_path=str(tmp_path), workers=2, use_processes=True)
+    assert parse_data.data_nodes == ['sample', 'subject']
+    assert parse_data.data_dict['subject'][0]['subjects'] == example_json_subject[0]['submitter_id']
+
+
+def test_lazy_ParseData(dictionary_of_data, mock_json_folder):
+    parse_data = ParseData(data_folder_path=mock_json_folder, lazy=True, max_cached_nodes=1)
+    assert parse_data.data_dict.loaded_nodes() == []
+    assert parse_data.data_nodes == ['sample', 'subject']
+    assert parse_data.return_data('subject') == dictionary_of_data['subject']
+    assert dict(parse_data.data_dict) == dictionary_of_data
+    assert parse_data.data_dict.loaded_nodes() == ['subject']
+
+
+def test_ndjson_and_iter_node(fs, example_json_sample, example_json_subject):
+    fs.create_dir("/ndjson")
+    fs.create_file(
+        "/ndjson/sample.jsonl", contents="\n".join(json.dumps(r) for r in example_json_sample)
+    )
+    fs.create_file("/ndjson/subject.json", contents=json.dumps(example_json_subject))
+    parse_data = ParseData(data_folder_path="/ndjson")
+    assert parse_data.data_nodes == ['sample', 'subject']
+    assert parse_data.data_dict['sample'] == example_json_sample
+
+    stream_map = parse_data.stream_data_map()
+    assert list(stream_map) == ['sample', 'subject']
+    assert list(stream_map['subject']) == example_json_subject
+    assert list(parse_data.iter_node('sample')) == example_json_sample
+
+
+@pytest.fixture
+def nested_compressed_folder(tmp_path, example_json_sample, example_json_subject):
+    part_2 = [dict(example_json_sample[0], submitter_id="sample-example-0000102")]
+    (tmp_path / "batch_1").mkdir()
+    (tmp_path / "batch_2").mkdir()
+    (tmp_path / "scratch").mkdir()
+    with gzip.open(tmp_path / "batch_1" / "sample.part-0001.json.gz", "wt") as f:
+        json.dump(example_json_sample, f)
+    with gzip.open(tmp_path / "batch_2" / "sample.part-0002.jsonl.gz", "wt") as f:
+        f.write("\n".join(json.dumps(r) for r in part_2))
+    (tmp_path / "batch_1" / "subject.json").write_text(json.dumps(example_json_subject))
+    (tmp_path / "scratch" / "subject.json").write_text("not json")
+    (tmp_path / "notes.txt").write_text("skipped")
+    return tmp_path
+
+
+def test_recursive_compressed_parts(nested_compressed_folder, example_json_sample):
+    parse_data = ParseData(
+        data_folder_path=str(nested_compressed_folder), recursive=True, exclude=["scratch"],
+        materialize_links=True
+    )
+    root = str(nested_compressed_folder)
+    assert parse_data.file_path_list == [
+        f"{root}/batch_1/sample.part-0001.json.gz",
+        f"{root}/batch_1/subject.json",
+        f"{root}/batch_2/sample.part-0002.jsonl.gz",
+    ]
+    assert parse_data.data_nodes == ['sample', 'subject']
+    samples = parse_data.data_dict['sample']
+    assert [r['submitter_id'] for r in samples] == [
+        "sample-example-0000101", "sample-example-0000102"
+    ]
+    assert samples[1]['samples'] == "sample-example-0000102"
+    assert parse_data.source_files['sample'] == [
+        (0, f"{root}/batch_1/sample.part-0001.json.gz"),
+        (1, f"{root}/batch_2/sample.part-0002.jsonl.gz"),
+    ]
+    assert len(list(parse_data.iter_node('sample'))) == 2
+
+
+def test_lazy_source_files(nested_compressed_folder):
+    parse_data = ParseData(
+        data_folder_path=str(nested_compressed_folder), recursive=True, exclude=["scratch"], lazy=True
+    )
+    root = str(nested_compressed_folder)
+    # entries are set when the files are discovered, before any node is loaded
+    assert parse_data.source_files == {
+        "sample": [
+            (None, f"{root}/batch_1/sample.part-0001.json.gz"),
+            (None, f"{root}/batch_2/sample.part-0002.jsonl.gz"),
+        ],
+        "subject": [(0, f"{root}/batch_1/subject.json")],
+    }
+    parse_data.data_dict['sample']
+    assert parse_data.source_files['sample'] == [
+        (0, f"{root}/batch_1/sample.part-0001.json.gz"),
+        (1, f"{root}/batch_2/sample.part-0002.jsonl.gz"),
+    ]
+
+
+def test_include_and_flat_discovery(nested_compressed_folder):
+    parse_data = ParseData(
+        data_folder_path=str(nested_compressed_folder), recursive=True,
+        include=["batch_1/*"], lazy=True
+    )
+    assert parse_data.data_nodes == ['sample', 'subject']
+    assert len(parse_data.data_dict['sample']) == 1
+    # without recursion, only the top folder is listed
+    assert ParseData(data_folder_path=str(nested_compressed_folder)).data_nodes == []
+
+
+def test_link_alias_is_virtual_by_default(fs):
+    fs.create_dir("/virtual")
+    records = [{"submitter_id": "sample_1", "type": "sample"}]
+    fs.create_file("/virtual/sample.json", contents=json.dumps(records))
+    assert ParseData(data_folder_path="/virtual").data_dict["sample"] == records
+    materialized = ParseData(data_folder_path="/virtual", materialize_links=True)
+    assert materialized.data_dict["sample"][0]["samples"] == "sample_1"
+    assert list(materialized.iter_node("sample"))[0]["samples"] == "sample_1"
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_coerce_with_resolved_schema(fs, lazy):
+    fs.create_dir("/coerce")
+    records = [{"submitter_id": "sample_1", "freeze_thaw_cycles": 12.0, "type": "sample"}]
+    fs.create_file("/coerce/sample.json", contents=json.dumps(records))
+    schema = {"sample.yaml": {"properties": {"freeze_thaw_cycles": {"type": "integer"}}}}
+    parse_data = ParseData(data_folder_path="/coerce", resolved_schema=schema, lazy=lazy)
+    value = parse_data.data_dict["sample"][0]["freeze_thaw_cycles"]
+    assert value == 12 and isinstance(value, int)
+    assert parse_data.coercer.transformations[("sample", "freeze_thaw_cycles", "number", "integer")] == 1
+    assert ParseData(data_folder_path="/coerce").data_dict["sample"] == records
+
+
+@pytest.mark.parametrize("workers, use_processes", [(None, False), (2, False), (2, True)])
+def test_corrupt_file_names_path(tmp_path, example_json_subject, workers, use_processes):
+    (tmp_path / "subject.json").write_text(json.dumps(example_json_subject))
+    (tmp_path / "sample.json").write_text('[{"submitter_id": ')
+    with pytest.raises(ValueError, match="sample.json"):
+        ParseData(data_folder_path=str(tmp_path), workers=workers, use_processes=use_processes)
+    with pytest.raises(ValueError, match="sample.json"):
+        ParseData(data_folder_path=str(tmp_path), workers=workers, materialize_links=True)
+    lazy = ParseData(data_folder_path=str(tmp_path), lazy=True)
+    with pytest.raises(ValueError, match="sample.json"):
+        lazy.data_dict["sample"]
+
+
+def test_missing_codec_is_not_swallowed(tmp_path, monkeypatch):
+    (tmp_path / "sample.json.zst").write_bytes(b"\x28\xb5\x2f\xfd")
+    # None in sys.modules makes `import zstandard` raise ImportError, installed or not
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    with pytest.raises(ImportError, match="pip install zstandard"):
+        ParseData(data_folder_path=str(tmp_path))
+    lazy = ParseData(data_folder_path=str(tmp_path), lazy=True)
+    with pytest.raises(ImportError, match="pip install zstandard"):
+        lazy.data_dict["sample"]
+
+
+def test_load_error_keeps_cause(tmp_path):
+    (tmp_path / "sample.json").write_text('[{"submitter_id": ')
+    with pytest.raises(ValueError, match="sample.json") as excinfo:
+        ParseData(data_folder_path=str(tmp_path))
+    assert isinstance(excinfo.value.__cause__, json.JSONDecodeError)
+    with pytest.raises(ValueError, match="missing.json") as excinfo:
+        ParseData(data_file_path=str(tmp_path / "missing.json"))
+    assert isinstance(excinfo.value.__cause__, FileNotFoundError)
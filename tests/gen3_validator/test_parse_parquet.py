@@ -0,0 +1,79 @@
+import pytest
+import pyarrow as pa
+import pyarrow.parquet as pq
+from gen3_validator.parsers.parse_parquet import ParseParquet, ParquetRecords
+from gen3_validator.parsers.data_map import LazyDataMap
+from gen3_validator.linkage import Linkage
+from gen3_validator.validate import Validate
+
+@pytest.fixture
+def subject_records():
+    return [
+        {"submitter_id": "subject_1", "type": "subject", "age": 30},
+        {"submitter_id": "subject_2", "type": "subject", "age": None},
+    ]
+
+
+@pytest.fixture
+def sample_records():
+    return [
+        {"submitter_id": "sample_1", "type": "sample", "subjects": {"submitter_id": "subject_1"}},
+        {"submitter_id": "sample_2", "type": "sample", "subjects": {"submitter_id": "subject_3"}},
+        {"submitter_id": "sample_3", "type": "sample", "subjects": {"submitter_id": "subject_2"}},
+    ]
+
+
+@pytest.fixture
+def parquet_folder(tmp_path, subject_records, sample_records):
+    pq.write_table(pa.Table.from_pylist(subject_records), tmp_path / "subject.parquet")
+    table = pa.Table.from_pylist(sample_records)
+    with pa.ipc.new_file(str(tmp_path / "sample.arrow"), table.schema) as writer:
+        writer.write_table(table)
+    (tmp_path / "notes.json").write_text("[]")
+    return tmp_path
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_parse_parquet_folder(parquet_folder, sample_records, lazy):
+    parser = ParseParquet(data_folder_path=str(parquet_folder), batch_size=2, lazy=lazy)
+    assert parser.data_nodes == ["sample", "subject"]
+    assert isinstance(parser.data_dict, LazyDataMap) == lazy
+    samples = parser.return_data("sample")
+    assert isinstance(samples, ParquetRecords)
+    assert len(samples) == 3
+    assert list(samples) == sample_records
+    assert samples[-1] == sample_records[-1]
+    assert samples[1:] == sample_records[1:]
+    with pytest.raises(IndexError):
+        samples[3]
+    # nulls are left out of the records
+    assert parser.return_data("subject")[1] == {"submitter_id": "subject_2", "type": "subject"}
+
+
+def test_iter_batches(parquet_folder):
+    parser = ParseParquet(data_folder_path=str(parquet_folder), batch_size=2)
+    batches = list(parser.iter_batches("sample", columns=["submitter_id"]))
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    assert batches[0].schema.names == ["submitter_id"]
+
+
+def test_column_values(subject_records):
+    records = ParquetRecords(pa.Table.from_pylist(subject_records))
+    missing = object()
+    assert records.column_values("age", missing=missing) == [30, missing]
+    assert records.column_values("subjects", fallback_field="submitter_id") == ["subject_1", "subject_2"]
+    kept = ParquetRecords(pa.Table.from_pylist(subject_records), drop_nulls=False)
+    assert kept[1]["age"] is None
+    assert kept.column_values("age") == [30, None]
+
+
+def test_parquet_validate_and_link(parquet_folder, sample_records):
+    parser = ParseParquet(data_folder_path=str(parquet_folder))
+    linkage = Linkage(root_node=["subject"])
+    config = linkage.generate_config(parser.data_dict)
+    assert config["sample"]["foreign_key"] == "subjects"
+    assert linkage.validate_links(parser.data_dict, config)["sample"] == ["subject_3"]
+
+    schema = {"sample.yaml": {"type": "object", "properties": {"submitter_id": {"type": "string"}}}}
+    result = Validate(parser.data_dict, schema).validate_schema()
+    assert len(result["sample"]) == len(sample_records)
@@ -0,0 +1,110 @@
+import gzip
+import pytest
+import pandas as pd
+from gen3_validator.parsers.parse_tsv import ParseTsv, format_tsv_chunk
+from gen3_validator.parsers.data_map import LazyDataMap
+from gen3_validator.linkage import Linkage
+
+
+@pytest.fixture
+def tsv_folder(tmp_path):
+    (tmp_path / "subject.tsv").write_text(
+        "type\tsubmitter_id\tprojects.code\tage\tsex\n"
+        "subject\tsubject_1\tproject_1\t30\tNA\n"
+        "subject\tsubject_2\tproject_1\t\tfemale\n"
+    )
+    with gzip.open(tmp_path / "sample.tsv.gz", "wt") as f:
+        f.write(
+            "type\tsubmitter_id\tsubjects.submitter_id\tvolume\n"
+            "sample\tsample_1\tsubject_1\t1.5\n"
+            "sample\tsample_2\tsubject_3\t2\n"
+            "sample\tsample_3\tsubject_2\t\n"
+        )
+    (tmp_path / "notes.md").write_text("not data")
+    return tmp_path
+
+
+def test_format_tsv_chunk_nests_links():
+    chunk = pd.DataFrame({
+        "submitter_id": ["aliquot_1", "aliquot_2"],
+        "samples.submitter_id#1": ["sample_1", "sample_2"],
+        "samples.submitter_id#2": ["sample_3", None],
+        "subjects.submitter_id": ["subject_1", None],
+        "subjects.id": [None, "uuid-1"],
+        "concentration": [0.5, None],
+    })
+    assert format_tsv_chunk(chunk) == [
+        {
+            "submitter_id": "aliquot_1", "concentration": 0.5,
+            "samples": [{"submitter_id": "sample_1"}, {"submitter_id": "sample_3"}],
+            "subjects": {"submitter_id": "subject_1"},
+        },
+        {
+            "submitter_id": "aliquot_2",
+            "samples": [{"submitter_id": "sample_2"}],
+            "subjects": {"id": "uuid-1"},
+        },
+    ]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_parse_tsv_folder(tsv_folder, lazy):
+    parser = ParseTsv(data_folder_path=str(tsv_folder), chunksize=1, lazy=lazy)
+    assert parser.data_nodes == ["sample", "subject"]
+    assert isinstance(parser.data_dict, LazyDataMap) == lazy
+    assert parser.return_data("subject") == [
+        {"type": "subject", "submitter_id": "subject_1", "projects.code": "project_1", "age": "30", "sex": "NA"},
+        {"type": "subject", "submitter_id": "subject_2", "projects.code": "project_1", "sex": "female"},
+    ]
+    assert parser.return_data("sample")[0] == {
+        "type": "sample", "submitter_id": "sample_1", "volume": "1.5",
+        "subjects": {"submitter_id": "subject_1"},
+    }
+
+
+def test_iter_batches_and_stream(tsv_folder):
+    parser = ParseTsv(data_file_path=str(tsv_folder / "sample.tsv.gz"), chunksize=2)
+    batches = list(parser.iter_batches(parser.file_path))
+    assert [len(batch) for batch in batches] == [2, 1]
+    stream = parser.stream_data_map()["sample"]
+    assert list(stream) == list(stream) == parser.data_dict["sample"]
+
+
+def test_csv_separator(tmp_path):
+    (tmp_path / "subject.csv").write_text("submitter_id,age\nsubject_1,30\n")
+    parser = ParseTsv(data_file_path=str(tmp_path / "subject.csv"))
+    assert parser.data_dict == {"subject": [{"submitter_id": "subject_1", "age": "30"}]}
+
+
+def test_tsv_links_validate(tsv_folder):
+    parser = ParseTsv(data_folder_path=str(tsv_folder))
+    linkage = Linkage(root_node=["subject"])
+    config = linkage.generate_config(parser.data_dict)
+    assert config["sample"]["foreign_key"] == "subjects"
+    result = linkage.validate_links(parser.data_dict, config)
+    assert result["sample"] == ["subject_3"]
+
+
+def test_coerce_with_resolved_schema(tsv_folder):
+    schema = {"subject.yaml": {"properties": {"age": {"type": "integer"}}}}
+    parser = ParseTsv(data_folder_path=str(tsv_folder), resolved_schema=schema)
+    assert parser.return_data("subject")[0]["age"] == 30
+    assert parser.coercer.transformations[("subject", "age", "string", "integer")] == 1
+
+
+def test_values_stay_text_across_chunks(tmp_path):
+    (tmp_path / "subject.tsv").write_text(
+        "submitter_id\tage\n007\t5\n0012\t\n")
+    (tmp_path / "sample.tsv").write_text(
+        "submitter_id\tsubjects.submitter_id\tage\nsample_1\t007\t5\nsample_2\t0012\t5.0\n")
+    parser = ParseTsv(data_folder_path=str(tmp_path), chunksize=1)
+    assert parser.return_data("subject") == [
+        {"submitter_id": "007", "age": "5"}, {"submitter_id": "0012"}
+    ]
+    assert [r["subjects"] for r in parser.return_data("sample")] == [
+        {"submitter_id": "007"}, {"submitter_id": "0012"}
+    ]
+    assert [r["age"] for r in parser.return_data("sample")] == ["5", "5.0"]
+    linkage = Linkage(root_node=["subject"])
+    config = linkage.generate_config(parser.data_dict)
+    assert linkage.validate_links(parser.data_dict, config)["sample"] == []
@@ -1,7 +1,11 @@
 import pytest
 import pandas as pd
 import json
-from gen3_validator.parsers.parse_xlsx import ParseXlsxMetadata
+import datetime
+import numpy as np
+import openpyxl
+from gen3_validator.parsers import parse_xlsx
+from gen3_validator.parsers.parse_xlsx import ParseXlsxMetadata, write_records
 from unittest.mock import patch, MagicMock
 
 
@@ -99,3 +103,211 @@ def test_format_pd_to_json(ParseXlsx):
 
 
 
+
+
+@pytest.fixture
+def xlsx_file(tmp_path):
+    workbook = openpyxl.Workbook()
+    subject = workbook.active
+    subject.title = "subject"
+    subject.append(["subject_uid", "project_uid", "age"])
+    subject.append(["description", "description", "description"])
+    subject.append(["subject_1", "project_1", 30])
+    subject.append(["subject_2", "project_1", None])
+    sample = workbook.create_sheet("sample")
+    sample.append(["sample_uid", "subject_uid", "volume"])
+    sample.append(["description", "description", "description"])
+    sample.append(["sample_1", "subject_1", 1.5])
+    path = tmp_path / "template.xlsx"
+    workbook.save(path)
+    return str(path)
+
+
+def test_parse_metadata_template_streaming(xlsx_file):
+    expected = ParseXlsxMetadata(xlsx_file, skip_rows=1).parse_metadata_template()
+    streaming = ParseXlsxMetadata(xlsx_file, skip_rows=1, streaming=True)
+    result = streaming.parse_metadata_template()
+    assert list(result) == ["subject", "sample"]
+    for sheet_name, df in expected.items():
+        pd.testing.assert_frame_equal(result[sheet_name], df, check_dtype=False)
+    assert streaming.format_pd_to_json(result, "subject") == \
+        ParseXlsxMetadata(xlsx_file).format_pd_to_json(expected, "subject")
+
+
+def test_streaming_selected_sheets(xlsx_file):
+    parser = ParseXlsxMetadata(xlsx_file, skip_rows=1, streaming=True, sheet_names=["sample"])
+    result = parser.parse_metadata_template()
+    assert list(result) == ["sample"]
+    assert result["sample"]["sample_uid"].tolist() == ["sample_1"]
+    assert list(parser.iter_sheet_rows("subject")) == [
+        {"subject_uid": "subject_1", "project_uid": "project_1", "age": 30},
+        {"subject_uid": "subject_2", "project_uid": "project_1", "age": None},
+    ]
+    assert list(ParseXlsxMetadata(xlsx_file, sheet_names=["sample"]).parse_metadata_template()) == ["sample"]
+
+
+def test_format_pd_to_json_nulls_and_types(ParseXlsx):
+    data = pd.DataFrame({
+        "sample_uid": ["sample_1", "sample_2"],
+        "subject_uid": ["subject_1", None],
+        "age": [30, 40],
+        "volume": [1.5, float("nan")],
+        "collected": pd.to_datetime(["2020-01-01", None]),
+    })
+    result = ParseXlsx.format_pd_to_json({"sample": data}, "sample")
+    assert result == [
+        {
+            "age": 30, "volume": 1.5, "collected": pd.Timestamp("2020-01-01"),
+            "type": "sample", "key_fk": "subject_1", "key_pk": "sample_1",
+            "subjects": {"submitter_id": "subject_1"}, "submitter_id": "sample_1",
+        },
+        {
+            "age": 40, "volume": None, "collected": None,
+            "type": "sample", "key_fk": None, "key_pk": "sample_2",
+            "subjects": {"submitter_id": None}, "submitter_id": "sample_2",
+        },
+    ]
+    assert type(result[0]["age"]) is int
+    assert list(result[0]) == [
+        "age", "volume", "collected", "type", "key_fk", "key_pk", "subjects", "submitter_id"
+    ]
+    # the input frame is not modified
+    assert list(data.columns) == ["sample_uid", "subject_uid", "age", "volume", "collected"]
+
+
+@pytest.fixture
+def sheets_dict():
+    subject = pd.DataFrame({
+        "subject_uid": ["subject_1", "subject_2"],
+        "project_uid": ["project_1", "project_1"],
+        "age": [30, None],
+    })
+    sample = pd.DataFrame({
+        "sample_uid": ["sample_1", "sample_2", "sample_3"],
+        "subject_uid": ["subject_1", "subject_1", "subject_2"],
+    })
+    return {"subject": subject, "sample": sample}
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_write_dict_to_json(tmp_path, sheets_dict, workers):
+    parser = ParseXlsxMetadata(None, workers=workers)
+    parser.write_dict_to_json(sheets_dict, str(tmp_path))
+    for sheet_name in sheets_dict:
+        with open(tmp_path / f"{sheet_name}.json") as f:
+            assert json.load(f) == parser.format_pd_to_json(sheets_dict, sheet_name)
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_write_dict_to_ndjson(tmp_path, sheets_dict, workers):
+    parser = ParseXlsxMetadata(None, workers=workers, ndjson=True)
+    parser.write_dict_to_json(sheets_dict, str(tmp_path))
+    with open(tmp_path / "sample.jsonl") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line) for line in lines] == parser.format_pd_to_json(sheets_dict, "sample")
+    assert not (tmp_path / "sample.json").exists()
+
+
+@pytest.fixture
+def records_to_encode():
+    return [{
+        "submitter_id": "subject_é", "age": np.int64(30), "bmi": np.float64(21.5),
+        "collected": pd.Timestamp("2020-01-01 12:30"), "born": datetime.date(1990, 5, 1),
+        "links": [{"submitter_id": "project_1"}], "note": None,
+    }]
+
+
+def test_write_records_without_orjson(tmp_path, records_to_encode):
+    with patch('gen3_validator.parsers.parse_xlsx._dumps', parse_xlsx._stdlib_dumps):
+        write_records(records_to_encode, str(tmp_path / "subject.json"))
+    assert json.loads((tmp_path / "subject.json").read_text(encoding="utf-8")) == [{
+        "submitter_id": "subject_é", "age": 30, "bmi": 21.5,
+        "collected": "2020-01-01T12:30:00", "born": "1990-05-01",
+        "links": [{"submitter_id": "project_1"}], "note": None,
+    }]
+
+
+def test_encoders_agree(records_to_encode):
+    assert parse_xlsx._orjson_dumps(records_to_encode) == parse_xlsx._stdlib_dumps(records_to_encode)
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_write_dict_to_json_coerces(tmp_path, sheets_dict, workers):
+    schema = {"subject.yaml": {"properties": {"age": {"type": "integer"}}}}
+    parser = ParseXlsxMetadata(None, workers=workers, resolved_schema=schema)
+    parser.write_dict_to_json(sheets_dict, str(tmp_path))
+    with open(tmp_path / "subject.json") as f:
+        assert [record["age"] for record in json.load(f)] == [30, None]
+    assert parser.coercer.transformations[("subject", "age", "number", "integer")] == 1
+
+
+@pytest.fixture
+def irregular_xlsx_file(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "subject"
+    sheet.append(["subject_uid", "project_uid", "age", None, "age.1", "age", "age"])
+    sheet.append(["description"] * 7)
+    sheet.append(["subject_1", "project_1", 30, None, 1, 2, 3])
+    sheet.append([None] * 7)
+    sheet.append(["subject_2", "project_1", 40, None, 4, 5, 6])
+    sheet.cell(row=8, column=2).number_format = "0.00"
+    path = tmp_path / "irregular.xlsx"
+    workbook.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("skip_rows", [0, 1])
+def test_streaming_matches_read_excel(irregular_xlsx_file, skip_rows):
+    expected = ParseXlsxMetadata(irregular_xlsx_file, skip_rows=skip_rows).parse_metadata_template()
+    result = ParseXlsxMetadata(
+        irregular_xlsx_file, skip_rows=skip_rows, streaming=True
+    ).parse_metadata_template()
+    assert list(result["subject"].columns) == [
+        "subject_uid", "project_uid", "age", "Unnamed: 3", "age.1", "age.2", "age.3"
+    ]
+    # the empty row between the two subjects is kept, so row positions match
+    assert len(result["subject"]) == 4 - skip_rows
+    # rows keep their index, as with slicing off the skipped rows after pd.read_excel
+    assert result["subject"].index.tolist() == list(range(skip_rows, 4))
+    pd.testing.assert_frame_equal(result["subject"], expected["subject"], check_dtype=False)
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 10])
+def test_streamed_chunks_keep_index(irregular_xlsx_file, chunksize):
+    parser = ParseXlsxMetadata(
+        irregular_xlsx_file, skip_rows=1, streaming=True, chunksize=chunksize
+    )
+    expected = ParseXlsxMetadata(irregular_xlsx_file, skip_rows=1).parse_metadata_template()
+    chunks = list(parser.iter_sheet_chunks("subject"))
+    assert all(len(chunk) <= chunksize for chunk in chunks)
+    assert [idx for chunk in chunks for idx in chunk.index] == [1, 2, 3]
+    records = list(parser.iter_sheet_records("subject"))
+    assert records == parser.format_pd_to_json(expected, "subject")
+    # cell values are kept as stored, whatever the chunk holds
+    assert [type(record["age"]) for record in records] == [int, type(None), int]
+
+
+@pytest.mark.parametrize("ndjson", [False, True])
+def test_stream_to_json(tmp_path, xlsx_file, ndjson):
+    expected_dir, streamed_dir = tmp_path / "expected", tmp_path / "streamed"
+    parser = ParseXlsxMetadata(xlsx_file, skip_rows=1, ndjson=ndjson)
+    parser.write_dict_to_json(parser.parse_metadata_template(), str(expected_dir))
+    streaming = ParseXlsxMetadata(
+        xlsx_file, skip_rows=1, ndjson=ndjson, streaming=True, chunksize=1
+    )
+    with patch.object(ParseXlsxMetadata, '_read_streaming') as mock_read:
+        streaming.stream_to_json(str(streamed_dir))
+        mock_read.assert_not_called()
+    extension = "jsonl" if ndjson else "json"
+    for sheet_name in ["subject", "sample"]:
+        assert (streamed_dir / f"{sheet_name}.{extension}").read_bytes() == \
+            (expected_dir / f"{sheet_name}.{extension}").read_bytes()
+
+
+def test_write_records_from_iterator(tmp_path, records_to_encode):
+    write_records(iter(records_to_encode * 2), str(tmp_path / "subject.json"))
+    write_records(records_to_encode * 2, str(tmp_path / "expected.json"))
+    assert (tmp_path / "subject.json").read_bytes() == (tmp_path / "expected.json").read_bytes()
+    assert write_records(iter([]), str(tmp_path / "empty.json")) == 0
+    assert json.loads((tmp_path / "empty.json").read_text()) == []
@@ -0,0 +1,106 @@
+import json
+import pytest
+import pandas as pd
+import openpyxl
+from unittest.mock import patch
+from gen3_validator.pipeline import XlsxValidationPipeline
+
+
+@pytest.fixture
+def xlsx_data_dict():
+    subject = pd.DataFrame({
+        "subject_uid": ["subject_1", "subject_2"],
+        "project_uid": ["project_1", "project_1"],
+        "age": [30, 40],
+    })
+    sample = pd.DataFrame({
+        "sample_uid": ["sample_1", "sample_2"],
+        "subject_uid": ["subject_1", "subject_3"],
+        "volume": [1.5, "high"],
+    })
+    return {"subject": subject, "sample": sample}
+
+
+@pytest.fixture
+def resolved_schema():
+    return {
+        "subject.yaml": {
+            "type": "object",
+            "properties": {
+                "submitter_id": {"type": "string"},
+                "age": {"type": "integer"},
+            },
+        },
+        "sample.yaml": {
+            "type": "object",
+            "properties": {
+                "submitter_id": {"type": "string"},
+                "volume": {"type": "number"},
+            },
+        },
+    }
+
+
+@pytest.fixture
+def pipeline(xlsx_data_dict, resolved_schema):
+    return XlsxValidationPipeline.from_dataframes(xlsx_data_dict, resolved_schema)
+
+
+def test_init_requires_schema(xlsx_data_dict):
+    with pytest.raises(ValueError):
+        XlsxValidationPipeline.from_dataframes(xlsx_data_dict, None)
+
+
+def test_build_data_map(pipeline, xlsx_data_dict):
+    data_map = pipeline.build_data_map()
+    assert list(data_map) == ["subject", "sample"]
+    assert data_map["sample"] == pipeline.parser.format_pd_to_json(xlsx_data_dict, "sample")
+    assert data_map["sample"][0]["subjects"] == {"submitter_id": "subject_1"}
+
+
+def test_run(pipeline):
+    result = pipeline.run()
+    sample_results = result["validation_result"]["sample"]
+    assert sample_results[0]["index_0"][0]["validation_result"] == "PASS"
+    assert sample_results[1]["index_1"][0]["invalid_key"] == "volume"
+    assert result["link_config"] == pipeline.link_config
+    assert result["link_validation_result"]["sample"] == ["subject_3"]
+
+
+def test_run_without_links(pipeline):
+    result = pipeline.run(check_links=False)
+    assert result["link_config"] is None
+    assert result["link_validation_result"] is None
+    assert pipeline.linkage is None
+
+
+def test_run_writes_json(pipeline, tmp_path):
+    pipeline.run(output_dir=str(tmp_path / "json"), check_links=False)
+    with open(tmp_path / "json" / "subject.json") as f:
+        assert json.load(f) == pipeline.data_map["subject"]
+
+
+def test_from_xlsx_parses_workbook(xlsx_data_dict, resolved_schema):
+    pipeline = XlsxValidationPipeline.from_xlsx("metadata.xlsx", resolved_schema)
+    with patch('pandas.read_excel', return_value=xlsx_data_dict) as mock_read_excel:
+        pipeline.build_data_map()
+        mock_read_excel.assert_called_once_with("metadata.xlsx", sheet_name=None)
+    assert list(pipeline.data_map) == ["subject", "sample"]
+
+
+def test_streaming_pipeline_formats_chunks(tmp_path, resolved_schema):
+    workbook = openpyxl.Workbook()
+    subject = workbook.active
+    subject.title = "subject"
+    subject.append(["subject_uid", "project_uid", "age"])
+    subject.append(["subject_1", "project_1", 30])
+    subject.append(["subject_2", "project_1", 40])
+    path = str(tmp_path / "metadata.xlsx")
+    workbook.save(path)
+
+    expected = XlsxValidationPipeline.from_xlsx(path, resolved_schema).build_data_map()
+    pipeline = XlsxValidationPipeline.from_xlsx(path, resolved_schema, streaming=True, chunksize=1)
+    with patch('pandas.read_excel') as mock_read_excel:
+        assert pipeline.build_data_map() == expected
+        mock_read_excel.assert_not_called()
+    assert pipeline.xlsx_data_dict is None
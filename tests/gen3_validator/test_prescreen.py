@@ -0,0 +1,89 @@
+import pytest
+import json
+from gen3_validator.prescreen import Prescreen
+
+
+@pytest.fixture
+def mock_resolved_schema():
+    with open('tests/schema/gen3_test_schema_resolved.json') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def mock_data_map_pass():
+    with open('tests/data/data_maps/pass_test_data_map.json') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def prescreen_fixture(mock_resolved_schema):
+    return Prescreen(resolved_schema=mock_resolved_schema)
+
+
+def test_init_Prescreen(prescreen_fixture):
+    assert prescreen_fixture.link_suffix == 's'
+    assert prescreen_fixture.prescreen_result is None
+    assert 'sample' in prescreen_fixture.key_sets
+
+
+def test_init_Prescreen_none_schema():
+    with pytest.raises(ValueError):
+        Prescreen(resolved_schema=None)
+
+
+def test_build_key_sets(prescreen_fixture):
+    sample_keys = prescreen_fixture.key_sets['sample']
+    assert isinstance(sample_keys['allowed'], frozenset)
+    assert 'freeze_thaw_cycles' in sample_keys['allowed']
+    # link alias added by ParseData is allowed
+    assert 'samples' in sample_keys['allowed']
+    assert sample_keys['required'] == frozenset(['type', 'submitter_id', 'subjects'])
+    assert sample_keys['open'] is False
+
+
+def test_prescreen_keys(prescreen_fixture):
+    result = prescreen_fixture.prescreen_keys(
+        'sample', ['type', 'submitter_id', 'freeze_thaw_cycle']
+    )
+    assert result == {
+        'unknown_properties': ['freeze_thaw_cycle'],
+        'missing_required': ['subjects'],
+    }
+
+
+def test_prescreen_keys_unknown_node(prescreen_fixture):
+    with pytest.raises(KeyError):
+        prescreen_fixture.prescreen_keys('not_a_node', ['type'])
+
+
+def test_prescreen_records(prescreen_fixture):
+    records = [
+        {'type': 'sample', 'submitter_id': 's1', 'subjects': {'submitter_id': 'x'}},
+        {'type': 'sample', 'submitter_id': 's2', 'subject': {'submitter_id': 'x'}},
+        {'type': 'sample', 'submitter_id': 's3', 'subject': {'submitter_id': 'x'}},
+    ]
+    result = prescreen_fixture.prescreen_records('sample', records)
+    expected_finding = {'unknown_properties': ['subject'], 'missing_required': ['subjects']}
+    assert result == [
+        {'index': 1, **expected_finding},
+        {'index': 2, **expected_finding},
+    ]
+
+
+def test_prescreen_columns(prescreen_fixture):
+    result = prescreen_fixture.prescreen_columns(
+        'subject', ['type', 'submitter_id', 'projects', 'patient_id', 'cohort_id']
+    )
+    assert result == {'unknown_properties': [], 'missing_required': []}
+
+
+def test_prescreen_data_map_pass(prescreen_fixture, mock_data_map_pass):
+    result = prescreen_fixture.prescreen_data_map(mock_data_map_pass)
+    assert set(result.keys()) == set(mock_data_map_pass.keys())
+    assert all(failures == [] for failures in result.values())
+    assert prescreen_fixture.prescreen_result == result
+
+
+def test_prescreen_data_map_skips_unknown_node(prescreen_fixture):
+    result = prescreen_fixture.prescreen_data_map({'not_a_node': [{'type': 'x'}]})
+    assert result == {}
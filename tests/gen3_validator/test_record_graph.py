@@ -0,0 +1,101 @@
+import pytest
+from gen3_validator.record_graph import RecordGraph
+
+
+@pytest.fixture
+def data_map():
+    return {
+        "subject": [
+            {"submitter_id": "subject_1"},
+            {"submitter_id": "subject_2"},
+        ],
+        "sample": [
+            {"submitter_id": "sample_1", "subjects": {"submitter_id": "subject_1"}},
+            {"submitter_id": "sample_2", "subjects": {"submitter_id": "subject_9"}},
+            {"submitter_id": "sample_3", "subjects": [{"submitter_id": "subject_2"}]},
+        ],
+        "aliquot": [
+            {"submitter_id": "aliquot_1", "samples": {"submitter_id": "sample_1"}},
+            {"submitter_id": "aliquot_2", "samples": {"submitter_id": "sample_2"}},
+        ],
+        "file": [
+            {"submitter_id": "file_1", "aliquots": {"submitter_id": "aliquot_2"}},
+        ],
+    }
+
+
+def test_find_orphans_reports_disconnected_subtree(data_map):
+    results = RecordGraph().build(data_map).find_orphans()
+    assert results["subject"] == {
+        "n_records": 2, "n_reachable": 2, "orphans": [], "depth": {0: 2}
+    }
+    assert results["sample"]["orphans"] == [{"index": 1, "key": "sample_2"}]
+    assert results["sample"]["depth"] == {1: 2}
+    # aliquot_2 and file_1 resolve their own links but hang off the orphaned sample_2
+    assert results["aliquot"]["orphans"] == [{"index": 1, "key": "aliquot_2"}]
+    assert results["file"]["n_reachable"] == 0
+    assert results["file"]["orphans"] == [{"index": 0, "key": "file_1"}]
+
+
+def test_depth_array(data_map):
+    graph = RecordGraph().build(data_map)
+    graph.find_orphans()
+    assert graph.depth.tolist() == [0, 0, 1, -1, 1, 2, -1, -1]
+    assert graph.orphan_results["aliquot"]["depth"] == {2: 1}
+
+
+def test_build_with_config_follows_foreign_key_only(data_map):
+    data_map["aliquot"][1]["extra"] = {"submitter_id": "sample_1"}
+    config = {
+        "subject": {"primary_key": "subject_id", "foreign_key": None},
+        "sample": {"primary_key": "samples", "foreign_key": "subjects"},
+        "aliquot": {"primary_key": "aliquots", "foreign_key": "samples"},
+        "file": {"primary_key": "files", "foreign_key": ["aliquots"]},
+    }
+    results = RecordGraph().build(data_map, config=config).find_orphans()
+    assert results["aliquot"]["orphans"] == [{"index": 1, "key": "aliquot_2"}]
+
+    results = RecordGraph().build(data_map).find_orphans()
+    assert results["aliquot"]["orphans"] == []
+    assert results["file"]["orphans"] == []
+
+
+def test_no_root_records():
+    results = RecordGraph(root_node=["project"]).build(
+        {"subject": [{"submitter_id": "subject_1"}]}
+    ).find_orphans()
+    assert results["subject"]["n_reachable"] == 0
+    assert results["subject"]["depth"] == {}
+
+
+def test_shared_keys_resolve_to_link_target():
+    data_map = {
+        "subject": [{"submitter_id": "shared"}],
+        "sample": [
+            {"submitter_id": "shared", "subjects": {"submitter_id": "shared"}},
+            {"submitter_id": "sample_2", "subjects": {"submitter_id": "sample_2"}},
+        ],
+        "aliquot": [
+            {"submitter_id": "aliquot_1", "samples": {"submitter_id": "shared"}},
+            {"submitter_id": "aliquot_2", "parent": {"submitter_id": "shared"}},
+        ],
+    }
+    graph = RecordGraph().build(data_map)
+    results = graph.find_orphans()
+    # sample_2 links to itself by key, but only subject records match a 'subjects' link
+    assert results["sample"]["orphans"] == [{"index": 1, "key": "sample_2"}]
+    assert results["aliquot"]["depth"] == {2: 1}
+    # 'parent' names no entity and 'shared' is a key of two entities: not followed
+    assert results["aliquot"]["orphans"] == [{"index": 1, "key": "aliquot_2"}]
+
+
+def test_unhashable_keys_are_skipped():
+    data_map = {
+        "subject": [{"submitter_id": ["subject_1"]}, {"submitter_id": "subject_2"}],
+        "sample": [
+            {"submitter_id": "sample_1", "subjects": {"submitter_id": ["subject_1"]}},
+            {"submitter_id": "sample_2", "subjects": {"submitter_id": "subject_2"}},
+        ],
+    }
+    results = RecordGraph().build(data_map).find_orphans()
+    assert results["sample"]["orphans"] == [{"index": 0, "key": "sample_1"}]
@@ -0,0 +1,61 @@
+import pytest
+import json
+from gen3_validator.unique_keys import UniqueKeyChecker
+
+
+@pytest.fixture
+def mock_resolved_schema():
+    with open('tests/schema/gen3_test_schema_resolved.json') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def checker_fixture(mock_resolved_schema):
+    return UniqueKeyChecker(resolved_schema=mock_resolved_schema)
+
+
+def test_init_UniqueKeyChecker(checker_fixture):
+    assert checker_fixture.unique_keys['sample'] == [('id',), ('project_id', 'submitter_id')]
+    assert checker_fixture.unique_keys['project'] == [('id',), ('code',)]
+
+
+def test_init_UniqueKeyChecker_none_schema():
+    with pytest.raises(ValueError):
+        UniqueKeyChecker(resolved_schema=None)
+
+
+def test_add_and_duplicates(checker_fixture):
+    records = [
+        {'submitter_id': 'sample_1', 'type': 'sample'},
+        {'submitter_id': 'sample_2', 'type': 'sample'},
+        {'submitter_id': 'sample_1', 'type': 'sample'},
+        {'submitter_id': 'sample_1', 'project_id': 'P1', 'type': 'sample'},
+    ]
+    for idx, record in enumerate(records):
+        checker_fixture.add('sample', idx, record)
+    assert checker_fixture.duplicates() == {
+        'sample': [{
+            'unique_key': ['project_id', 'submitter_id'],
+            'values': [None, 'sample_1'],
+            'indices': [0, 2],
+        }]
+    }
+
+
+def test_check_data_map(checker_fixture):
+    data_map = {
+        'subject': [
+            {'submitter_id': 'subject_1'},
+            {'submitter_id': 'subject_2'},
+        ],
+        'project': [
+            {'code': 'P1'},
+            {'code': 'P1'},
+            {'code': 'P1'},
+        ],
+        'not_a_node': [{'submitter_id': 'x'}, {'submitter_id': 'x'}],
+    }
+    result = checker_fixture.check_data_map(data_map)
+    assert result == {
+        'project': [{'unique_key': ['code'], 'values': ['P1'], 'indices': [0, 1, 2]}]
+    }
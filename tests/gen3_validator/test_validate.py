@@ -85,6 +85,7 @@ def test_init_Validate_pass(validator_pass_fixture, mock_data_map_pass, mock_res
     assert validate.resolved_schema == mock_resolved_schema
     assert validate.validation_result is None
     assert validate.key_map is None
+    assert validate.unique_key_result is None
 
 def test_init_Validate_fail(validator_fail_fixture, mock_data_map_fail, mock_resolved_schema):
     validate = validator_fail_fixture
@@ -102,6 +103,19 @@ def test_validate_object(validator_fail_fixture, index_0_validator_sample_fail_r
     assert validate_result == index_0_validator_sample_fail_result
 
 
+def test_validate_object_link_alias(validator_fail_fixture):
+    validate = validator_fail_fixture
+    validator = Draft4Validator(validate.resolved_schema['sample.yaml'])
+    obj = dict(validate.data_map['sample'][0])
+    with_alias = validate.validate_object(obj, 0, validator)
+    obj.pop('samples')
+    # without the alias, no error is dropped
+    assert validate.validate_object(obj, 0, validator) == with_alias
+    obj['unexpected_field'] = 'x'
+    results = validate.validate_object(obj, 0, validator)
+    assert [r['validator'] for r in results].count('additionalProperties') == 1
+
+
 def test_validate_schema_fail(validator_fail_fixture, mock_data_map_fail):
     validate = validator_fail_fixture
     validate_result = validate.validate_schema()
@@ -138,6 +152,32 @@ def test_validate_schema_pass(validator_pass_fixture, mock_data_map_pass):
     assert validate_result['sample'][0]['index_0'][0] == expected_error
 
 
+def test_validate_schema_check_unique_keys(mock_resolved_schema):
+    data_map = {
+        'subject': [
+            {'submitter_id': 'subject_1', 'type': 'subject', 'projects': {'code': 'P1'}, 'subjects': 'subject_1'},
+            {'submitter_id': 'subject_1', 'type': 'subject', 'projects': {'code': 'P1'}, 'subjects': 'subject_1'},
+        ]
+    }
+    validate = Validate(data_map=data_map, resolved_schema=mock_resolved_schema)
+    validate.validate_schema()
+    assert validate.unique_key_result is None
+
+    validate.validate_schema(check_unique_keys=True)
+    assert validate.unique_key_result == {
+        'subject': [{
+            'unique_key': ['project_id', 'submitter_id'],
+            'values': [None, 'subject_1'],
+            'indices': [0, 1],
+        }]
+    }
+
+
+def test_validate_schema_check_unique_keys_pass(validator_pass_fixture):
+    validator_pass_fixture.validate_schema(check_unique_keys=True)
+    assert validator_pass_fixture.unique_key_result == {}
+
+
 def test_list_entities(validator_fail_fixture):
     validate = validator_fail_fixture
     validate.validate_schema()